@@ -0,0 +1,2 @@
+"""Content app init."""
+default_app_config = 'apps.content.apps.ContentConfig'
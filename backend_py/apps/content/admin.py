@@ -0,0 +1,10 @@
+"""Content admin configuration."""
+
+from django.contrib import admin
+from .models import CounterShard
+
+
+@admin.register(CounterShard)
+class CounterShardAdmin(admin.ModelAdmin):
+    list_display = ['content_type', 'content_id', 'shard', 'view_count', 'like_count']
+    list_filter = ['content_type']
@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class ContentConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.content'
+    verbose_name = 'Content (shared posts/videos logic)'
+
+    def ready(self):
+        from . import signals
+        signals.connect()
@@ -0,0 +1,207 @@
+"""
+Category membership index for /api/v1/categories/{slug}/content.
+
+For every active category the index keeps its published posts and videos
+in two presorted lists, newest first and most engaged (views + likes from
+the stats row) first, for all types together and per type. A page is a list
+slice, so serving it is O(page) no matter how large the category is; only
+the page's ids are then hydrated from SQL.
+
+Updates are incremental: signals on posts, videos and their category links
+append the changed item to a change log in the shared cache (one key per
+sequence number, config.invalidation), so every worker sees it within about
+a second. Each worker replays new entries by re-indexing just those items.
+A gap in the log (evicted keys), a category edit (``invalidate()``) or
+CONTENT_CATEGORY_INDEX_REFRESH_SECONDS elapsing triggers a full rebuild;
+the periodic rebuild also refreshes engagement ordering.
+"""
+
+import logging
+import time
+from bisect import bisect_left, insort
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from apps.tags.models import ContentCategory
+from config.invalidation import VersionedIndex, shared_cache
+
+from .targets import TARGETS
+
+logger = logging.getLogger(__name__)
+
+CATEGORY_SORTS = ('newest', 'popular')
+SCOPES = ('all',) + tuple(TARGETS)
+
+
+class CategoryIndex(VersionedIndex):
+    """Presorted per-category content lists, kept current from a change log."""
+
+    VERSION_KEY = 'content:categories:reset'
+    SEQ_KEY = 'content:categories:seq'
+    CHANGE_KEY = 'content:categories:change:{}'
+    CHANGE_TTL = 3600
+    MAX_AGE_SETTING = 'CONTENT_CATEGORY_INDEX_REFRESH_SECONDS'
+    # More pending changes than this and a rebuild is cheaper than a replay.
+    MAX_REPLAY = 500
+    # Sequence numbers tried per change before falling back to a full rebuild.
+    MAX_CLAIMS = 5
+
+    _categories: Dict[str, Dict[str, Any]] = {}
+    # (category_id, scope, sort) -> sorted list of entry keys
+    _lists: Dict[Tuple[int, str, str], List[tuple]] = {}
+    # (type, id) -> (newest key, popular key, category ids)
+    _items: Dict[Tuple[str, int], Tuple[tuple, tuple, Set[int]]] = {}
+
+    # ============== CHANGE LOG ==============
+
+    @classmethod
+    def record_change(cls, content_type: str, content_id: int) -> None:
+        """Queue one post/video for re-indexing in every worker."""
+        shared = shared_cache()
+        shared.add(cls.SEQ_KEY, 0, None)
+        for _ in range(cls.MAX_CLAIMS):
+            try:
+                seq = shared.incr(cls.SEQ_KEY)
+            except ValueError:
+                break
+            # incr is a read-then-write on the database cache, so two writers
+            # can get the same number; add() lets only one of them keep it.
+            if shared.add(cls.CHANGE_KEY.format(seq), (content_type, content_id), cls.CHANGE_TTL):
+                return
+        cls.invalidate()
+
+    @classmethod
+    def current_version(cls) -> Tuple[Any, int]:
+        """(reset stamp, last sequence number) in one round trip."""
+        values = shared_cache().get_many([cls.VERSION_KEY, cls.SEQ_KEY])
+        return values.get(cls.VERSION_KEY), values.get(cls.SEQ_KEY) or 0
+
+    @classmethod
+    def refresh(cls, version: Tuple[Any, int]) -> None:
+        """Replay the changes since the last sync, or rebuild if that can't be done."""
+        reset, seq = version
+        current_reset, current_seq = cls._version
+        if reset != current_reset or seq < current_seq or seq - current_seq > cls.MAX_REPLAY:
+            cls.rebuild(version)
+            return
+        keys = [cls.CHANGE_KEY.format(n) for n in range(current_seq + 1, seq + 1)]
+        changes = shared_cache().get_many(keys)
+        if len(changes) < len(keys):
+            cls.rebuild(version)
+            return
+        cls._reindex(set(changes.values()))
+        cls._version = version
+
+    # ============== BUILDING ==============
+
+    @staticmethod
+    def _entry_keys(content_type: str, content_id: int, published_at, engagement: int):
+        ts = published_at.timestamp() if published_at else 0.0
+        return (-ts, -content_id, content_type), (-engagement, -ts, -content_id, content_type)
+
+    @classmethod
+    def _load(cls, content_type: str, content_ids: Optional[Iterable[int]] = None):
+        """Yield (key, newest, popular, category ids) for published items."""
+        target = TARGETS[content_type]
+        content_model, _, _ = target.models
+        category_model, _ = target.junction_models
+
+        links = category_model.objects.filter(
+            category_id__in=[c['id'] for c in cls._categories.values()],
+            **{f'{target.name}__status': 'published'}
+        )
+        if content_ids is not None:
+            links = links.filter(**{f'{target.id_column}__in': list(content_ids)})
+        memberships = {}
+        for content_id, category_id in links.values_list(target.id_column, 'category_id'):
+            memberships.setdefault(content_id, set()).add(category_id)
+        if not memberships:
+            return
+
+        for start in range(0, len(memberships), 1000):
+            chunk = list(memberships)[start:start + 1000]
+            for content_id, published_at, views, likes in content_model.objects.filter(
+                pk__in=chunk, status='published'
+            ).values_list('pk', 'published_at', 'stats__view_count', 'stats__like_count'):
+                newest, popular = cls._entry_keys(content_type, content_id, published_at, (views or 0) + (likes or 0))
+                yield (content_type, content_id), newest, popular, memberships[content_id]
+
+    @classmethod
+    def build(cls) -> None:
+        started = time.perf_counter()
+        cls._categories = {
+            slug: {'id': category_id, 'name': name, 'slug': slug}
+            for category_id, name, slug in ContentCategory.objects.filter(is_active=True)
+            .values_list('category_id', 'name', 'slug')
+        }
+        lists = {}
+        items = {}
+        for content_type in TARGETS:
+            for key, newest, popular, category_ids in cls._load(content_type):
+                items[key] = (newest, popular, category_ids)
+                for category_id in category_ids:
+                    for scope in ('all', content_type):
+                        lists.setdefault((category_id, scope, 'newest'), []).append(newest)
+                        lists.setdefault((category_id, scope, 'popular'), []).append(popular)
+        for entries in lists.values():
+            entries.sort()
+
+        cls._lists, cls._items = lists, items
+        logger.info(
+            f"Built category index: {len(cls._categories)} categories, {len(items)} items "
+            f"in {(time.perf_counter() - started) * 1000:.1f} ms"
+        )
+
+    @classmethod
+    def _reindex(cls, changed: Set[Tuple[str, int]]) -> None:
+        """Drop and re-add just the changed items."""
+        for key in changed:
+            cls._remove(key)
+        by_type = {}
+        for content_type, content_id in changed:
+            if content_type in TARGETS:
+                by_type.setdefault(content_type, []).append(content_id)
+        for content_type, content_ids in by_type.items():
+            for key, newest, popular, category_ids in cls._load(content_type, content_ids):
+                cls._items[key] = (newest, popular, category_ids)
+                for category_id in category_ids:
+                    for scope in ('all', content_type):
+                        insort(cls._lists.setdefault((category_id, scope, 'newest'), []), newest)
+                        insort(cls._lists.setdefault((category_id, scope, 'popular'), []), popular)
+
+    @classmethod
+    def _remove(cls, key: Tuple[str, int]) -> None:
+        existing = cls._items.pop(key, None)
+        if existing is None:
+            return
+        newest, popular, category_ids = existing
+        for category_id in category_ids:
+            for scope in ('all', key[0]):
+                for sort, entry in (('newest', newest), ('popular', popular)):
+                    entries = cls._lists.get((category_id, scope, sort), [])
+                    i = bisect_left(entries, entry)
+                    if i < len(entries) and entries[i] == entry:
+                        del entries[i]
+
+    # ============== READS ==============
+
+    @classmethod
+    def page(
+        cls,
+        slug: str,
+        sort: str = 'newest',
+        scope: str = 'all',
+        offset: int = 0,
+        limit: int = 10
+    ) -> Optional[Tuple[Dict[str, Any], int, List[Tuple[str, int]]]]:
+        """
+        Return (category, total, [(type, id), ...]) for one page, or None if
+        the slug is not an active category.
+        """
+        cls.ensure_fresh()
+        with cls._lock:
+            category = cls._categories.get(slug)
+            if category is None:
+                return None
+            entries = cls._lists.get((category['id'], scope, sort), [])
+            page = entries[offset:offset + limit]
+            return category, len(entries), [(entry[-1], -entry[-2]) for entry in page]
@@ -0,0 +1,264 @@
+"""
+Sharded view/like counters for posts and videos.
+
+Every view used to run ``UPDATE PostStats SET view_count = view_count + 1``
+against the item's single stats row, so a trending item turned that row into
+a lock hotspot. Writers now add to one of ``CONTENT_COUNTER_SHARDS`` sub-rows
+in ContentCounterShards picked at random, readers add the shard sums to the
+stats row, and ``compact()`` (run by ``manage.py compact_counters``)
+periodically folds the shards back into PostStats/VideoStats.
+
+List endpoints keep reading the stats row only, so their counts lag by at
+most one compaction interval. Detail and like responses read exact sums.
+Setting CONTENT_COUNTER_SHARDS=0 restores direct stats-row updates.
+
+``increment_async`` records a view off the request thread, for responses
+that do not show the new count (304s and body-only detail).
+"""
+
+import logging
+import random
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.db import IntegrityError, connections, transaction
+from django.db.models import F, Sum, Case, When, Value, BigIntegerField
+
+from .models import CounterShard
+from .targets import ContentTarget, TARGETS
+
+logger = logging.getLogger(__name__)
+
+FIELDS = ('view_count', 'like_count')
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='counter-writes')
+
+
+class CounterService:
+    """Increment, read and compact sharded content counters."""
+
+    COMPACT_CHUNK_SIZE = 500
+
+    @staticmethod
+    def shard_count() -> int:
+        return max(0, int(getattr(settings, 'CONTENT_COUNTER_SHARDS', 8)))
+
+    @classmethod
+    def pick_shard(cls) -> Optional[int]:
+        """Random shard for a writer, or None when sharding is disabled."""
+        shards = cls.shard_count()
+        return random.randrange(shards) if shards else None
+
+    # ============== WRITES ==============
+
+    @classmethod
+    def increment(cls, target: ContentTarget, content_id: int, field: str, amount: int = 1) -> None:
+        """Add ``amount`` to ``field`` ('view_count' or 'like_count') of an item."""
+        if field not in FIELDS:
+            raise ValueError(f"Unknown counter field: {field}")
+        if not amount:
+            return
+
+        shard = cls.pick_shard()
+        if shard is None:
+            _, stats_model, _ = target.models
+            stats_model.objects.filter(**{target.id_column: content_id}).update(
+                **{field: F(field) + amount},
+                updated_at=datetime.utcnow()
+            )
+            return
+
+        lookup = {'content_type': target.name, 'content_id': content_id, 'shard': shard}
+        if CounterShard.objects.filter(**lookup).update(**{field: F(field) + amount}):
+            return
+
+        # First write to this shard: create it, or lose the race to another
+        # writer and fall back to updating the row it just created.
+        try:
+            with transaction.atomic():
+                CounterShard.objects.create(**lookup, **{field: amount})
+        except IntegrityError:
+            CounterShard.objects.filter(**lookup).update(**{field: F(field) + amount})
+
+    @classmethod
+    def increment_many(cls, target: ContentTarget, field: str, deltas: Dict[int, int]) -> None:
+        """
+        ``increment`` for several items at once: {content_id: amount}.
+
+        Costs one aggregated UPDATE plus one bulk insert for shard rows that
+        do not exist yet, all on the same randomly picked shard. With sharding
+        disabled the items' stats rows must exist.
+        """
+        if field not in FIELDS:
+            raise ValueError(f"Unknown counter field: {field}")
+        deltas = {cid: amount for cid, amount in deltas.items() if amount}
+        if not deltas:
+            return
+
+        shard = cls.pick_shard()
+        if shard is None:
+            _, stats_model, _ = target.models
+            stats_model.objects.filter(**{f'{target.id_column}__in': list(deltas)}).update(
+                **{field: F(field) + cls._amount_case(target.id_column, deltas)},
+                updated_at=datetime.utcnow()
+            )
+            return
+
+        rows = CounterShard.objects.filter(content_type=target.name, shard=shard, content_id__in=list(deltas))
+        existing = set(rows.values_list('content_id', flat=True))
+        if existing:
+            rows.filter(content_id__in=existing).update(
+                **{field: F(field) + cls._amount_case('content_id', {cid: deltas[cid] for cid in existing})}
+            )
+        new = [cid for cid in deltas if cid not in existing]
+        if not new:
+            return
+        try:
+            with transaction.atomic():
+                CounterShard.objects.bulk_create([
+                    CounterShard(content_type=target.name, content_id=cid, shard=shard, **{field: deltas[cid]})
+                    for cid in new
+                ])
+        except IntegrityError:
+            # Another writer created some of these rows first.
+            for cid in new:
+                cls.increment(target, cid, field, deltas[cid])
+
+    @staticmethod
+    def _amount_case(column: str, amounts: Dict[int, int]):
+        return Case(
+            *[When(**{column: cid}, then=Value(amount)) for cid, amount in amounts.items()],
+            default=Value(0),
+            output_field=BigIntegerField(),
+        )
+
+    @classmethod
+    def increment_async(cls, target: ContentTarget, content_id: int, field: str, amount: int = 1) -> None:
+        """``increment`` on a background thread; failures are logged, not raised."""
+        if field not in FIELDS:
+            raise ValueError(f"Unknown counter field: {field}")
+
+        def write():
+            try:
+                cls.increment(target, content_id, field, amount)
+            except Exception:
+                logger.exception(f"Background {field} increment failed for {target.name} {content_id}")
+            finally:
+                connections.close_all()
+
+        _executor.submit(write)
+
+    # ============== READS ==============
+
+    @classmethod
+    def get_counts(cls, target: ContentTarget, content_ids: Iterable[int]) -> Dict[int, Tuple[int, int]]:
+        """Return {content_id: (view_count, like_count)} including unmerged shards."""
+        content_ids = list(content_ids)
+        if not content_ids:
+            return {}
+
+        _, stats_model, _ = target.models
+        counts = {i: [0, 0] for i in content_ids}
+        for cid, views, likes in stats_model.objects.filter(
+            **{f'{target.id_column}__in': content_ids}
+        ).values_list(target.id_column, 'view_count', 'like_count'):
+            counts[cid] = [views or 0, likes or 0]
+
+        if cls.shard_count():
+            for cid, views, likes in (
+                CounterShard.objects
+                .filter(content_type=target.name, content_id__in=content_ids)
+                .values('content_id')
+                .annotate(views=Sum('view_count'), likes=Sum('like_count'))
+                .values_list('content_id', 'views', 'likes')
+            ):
+                counts[cid][0] += views or 0
+                counts[cid][1] += likes or 0
+
+        return {cid: (max(0, v), max(0, l)) for cid, (v, l) in counts.items()}
+
+    @classmethod
+    def get_count(cls, target: ContentTarget, content_id: int) -> Tuple[int, int]:
+        return cls.get_counts(target, [content_id])[content_id]
+
+    # ============== COMPACTION ==============
+
+    @classmethod
+    def compact(cls, target: Optional[ContentTarget] = None) -> int:
+        """
+        Fold shard rows into the stats rows. Returns the number of items merged.
+
+        Shard rows are locked, added to their stats row with one aggregated
+        UPDATE per chunk, then zeroed (not deleted) so hot items keep their
+        shard rows and writers do not pay for re-inserting them.
+        """
+        merged = 0
+        for t in ([target] if target else TARGETS.values()):
+            merged += cls._compact_target(t)
+        return merged
+
+    @classmethod
+    def _compact_target(cls, target: ContentTarget) -> int:
+        _, stats_model, _ = target.models
+        id_in = f'{target.id_column}__in'
+        merged = 0
+
+        with transaction.atomic():
+            shard_rows = list(
+                CounterShard.objects.select_for_update()
+                .filter(content_type=target.name)
+                .exclude(view_count=0, like_count=0)
+                .values_list('id', 'content_id', 'view_count', 'like_count')
+            )
+            if not shard_rows:
+                return 0
+
+            totals = {}
+            for _, cid, views, likes in shard_rows:
+                t = totals.setdefault(cid, [0, 0])
+                t[0] += views
+                t[1] += likes
+
+            existing = set(
+                stats_model.objects.filter(**{id_in: list(totals)})
+                .values_list(target.id_column, flat=True)
+            )
+            now = datetime.utcnow()
+            missing = [cid for cid in totals if cid not in existing]
+            if missing:
+                stats_model.objects.bulk_create([
+                    stats_model(
+                        view_count=max(0, totals[cid][0]),
+                        like_count=max(0, totals[cid][1]),
+                        updated_at=now,
+                        **{target.id_column: cid}
+                    )
+                    for cid in missing
+                ])
+
+            ids = [cid for cid in totals if cid in existing]
+            for start in range(0, len(ids), cls.COMPACT_CHUNK_SIZE):
+                chunk = ids[start:start + cls.COMPACT_CHUNK_SIZE]
+                stats_model.objects.filter(**{id_in: chunk}).update(
+                    view_count=F('view_count') + cls._delta_case(target, chunk, totals, 0),
+                    like_count=F('like_count') + cls._delta_case(target, chunk, totals, 1),
+                    updated_at=now
+                )
+
+            CounterShard.objects.filter(id__in=[row[0] for row in shard_rows]).update(
+                view_count=0, like_count=0
+            )
+            merged = len(totals)
+
+        logger.info(f"Compacted {len(shard_rows)} {target.name} counter shards into {merged} stats rows")
+        return merged
+
+    @staticmethod
+    def _delta_case(target: ContentTarget, ids, totals, index: int):
+        return Case(
+            *[When(**{target.id_column: cid}, then=Value(totals[cid][index])) for cid in ids],
+            default=Value(0),
+            output_field=BigIntegerField(),
+        )
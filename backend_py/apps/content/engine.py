@@ -0,0 +1,575 @@
+"""
+Content engine - list, detail, related and mixed-feed queries for any
+content target (see targets.py).
+
+PostService and VideoService used to carry near-identical copies of this
+logic; they now delegate here so an optimization only has to be made once.
+The mixed feed runs posts and videos as a single UNION ALL query with
+unified sort keys instead of two queries merged in Python.
+"""
+
+import hashlib
+import logging
+import random
+from typing import Optional, Dict, Any, Iterable, List
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import (
+    F, Q, Value, Exists, OuterRef, CharField, IntegerField, BooleanField
+)
+from django.db.models.functions import Coalesce
+
+from .categories import CATEGORY_SORTS, CategoryIndex
+from .counters import CounterService
+from .tagindex import TagBitmapIndex, ids_expression, normalize_tag_mode, parse_tag_names
+from .targets import ContentTarget, TARGETS
+from .totals import CountCache
+
+logger = logging.getLogger(__name__)
+
+VALID_SORTS = ('TRENDING', 'NEWEST', 'MOST_VIEWED', 'MOST_LIKED')
+
+# Sort keys shared by the per-type lists and the mixed feed. Every key ends
+# with published_at so equal scores keep a stable, recent-first order.
+SORT_KEYS = {
+    'TRENDING': ('-sort_score', '-sort_published'),
+    'NEWEST': ('-sort_published',),
+    'MOST_VIEWED': ('-sort_views', '-sort_published'),
+    'MOST_LIKED': ('-sort_likes', '-sort_published'),
+}
+
+# Columns of a feed row, in UNION order.
+FEED_COLUMNS = (
+    'content_type', 'content_id', 'item_title', 'item_thumbnail_url',
+    'sort_views', 'sort_likes', 'sort_score', 'sort_published', 'item_is_premium',
+    'item_expert_id', 'expert_name', 'expert_specialization',
+    'item_video_url', 'item_duration_seconds', 'item_is_short',
+    'viewer_liked',
+)
+
+# Named field sets for the list endpoints' ``fields=`` parameter; None is every field.
+FIELD_PRESETS = {
+    'card': ('id', 'title', 'thumbnailUrl', 'viewCount', 'likeCount'),
+    'full': None,
+}
+
+
+def normalize_sort(sort: Optional[str]) -> str:
+    """Upper-case a sort option, defaulting to TRENDING. Raises ValueError."""
+    sort_key = (sort or 'TRENDING').upper()
+    if sort_key not in VALID_SORTS:
+        raise ValueError(f"Invalid sort: {sort}. Valid values: {', '.join(VALID_SORTS)}")
+    return sort_key
+
+
+def list_field_columns(target: ContentTarget) -> Dict[str, tuple]:
+    """Each list item field -> the ContentEngine.list_columns it is built from."""
+    fields = {
+        'id': (),
+        'viewCount': ('sort_views', 'sort_likes'),
+        'likeCount': ('sort_views', 'sort_likes'),
+        'expert': ('expert_id', 'expert__full_name', 'expert__specialization'),
+        'viewerState': (),
+    }
+    for column in target.list_fields:
+        head, *rest = column.split('_')
+        fields[head + ''.join(word.title() for word in rest)] = (column,)
+    return fields
+
+
+def normalize_fields(target: ContentTarget, fields: Optional[str]) -> Optional[frozenset]:
+    """
+    Parse a ``fields=`` value: comma-separated field names and presets.
+    Returns the selected names (``id`` always included), or None for every
+    field. Raises ValueError.
+    """
+    if not fields:
+        return None
+    valid = list_field_columns(target)
+    selected = {'id'}
+    for name in (part.strip() for part in fields.split(',')):
+        if not name:
+            continue
+        if name in FIELD_PRESETS:
+            if FIELD_PRESETS[name] is None:
+                return None
+            selected.update(FIELD_PRESETS[name])
+        elif name in valid:
+            selected.add(name)
+        else:
+            raise ValueError(f"Invalid field: {name}. Valid values: {', '.join([*FIELD_PRESETS, *valid])}")
+    return frozenset(selected)
+
+
+def clamp_paging(page: int, page_size: int, max_page_size: int = 50):
+    return max(1, page), max(1, min(max_page_size, page_size))
+
+
+class ContentRow:
+    """
+    Lightweight stand-in for a model instance on list pages.
+
+    Carries only the projected columns under the model's attribute names,
+    with ``expert`` and ``stats`` as nested rows, so the list serializers
+    work on it unchanged.
+    """
+
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
+
+    def __repr__(self):
+        return f"ContentRow({self.__dict__!r})"
+
+
+class ContentEngine:
+    """Generic content queries parameterized by a ContentTarget."""
+
+    # ============== QUERY BUILDING ==============
+
+    @staticmethod
+    def filtered_queryset(
+        target: ContentTarget,
+        q: Optional[str] = None,
+        premium: Optional[bool] = None,
+        tag_name: Optional[str] = None,
+        tag_mode: Optional[str] = None,
+        **filters
+    ):
+        """
+        Published content of one type with the common list filters applied.
+
+        ``tag_name`` may list several comma-separated tags, matched per
+        ``tag_mode`` ('all' or 'any') through the in-memory TagBitmapIndex.
+        """
+        content_model, _, _ = target.models
+        queryset = content_model.objects.filter(status='published')
+
+        if q:
+            search_term = q.strip().lower()
+            condition = Q()
+            for field in target.search_fields:
+                condition |= Q(**{f'{field}__icontains': search_term})
+            queryset = queryset.filter(condition)
+
+        if premium is not None:
+            queryset = queryset.filter(is_premium=premium)
+
+        tag_names = parse_tag_names(tag_name)
+        if tag_names:
+            bitmap = TagBitmapIndex.match(target, tag_names, normalize_tag_mode(tag_mode))
+            if not bitmap:
+                return queryset.none()
+            queryset = queryset.filter(pk__in=ids_expression(bitmap))
+
+        for field, value in filters.items():
+            if value is not None:
+                queryset = queryset.filter(**{field: value})
+
+        return queryset
+
+    @staticmethod
+    def with_sort_keys(queryset):
+        """Annotate the unified sort keys (sort_views, sort_likes, sort_score, sort_published)."""
+        views = Coalesce(F('stats__view_count'), Value(0), output_field=IntegerField())
+        likes = Coalesce(F('stats__like_count'), Value(0), output_field=IntegerField())
+        return queryset.annotate(
+            sort_views=views,
+            sort_likes=likes,
+            sort_score=views + likes,
+            sort_published=F('published_at'),
+        )
+
+    # ============== VIEWER STATE ==============
+
+    @staticmethod
+    def liked_ids(target: ContentTarget, user_id: Optional[int], content_ids: Iterable[int]) -> set:
+        """IDs among ``content_ids`` the user has liked, in one query."""
+        content_ids = list(content_ids)
+        if not user_id or not content_ids:
+            return set()
+        _, _, like_model = target.models
+        return set(
+            like_model.objects.filter(
+                user_id=user_id, **{f'{target.id_column}__in': content_ids}
+            ).values_list(target.id_column, flat=True)
+        )
+
+    @staticmethod
+    def viewer_liked_expression(target: ContentTarget, user_id: Optional[int]):
+        """Per-row "liked by this viewer" flag, evaluated inside the main query."""
+        if not user_id:
+            return Value(False, output_field=BooleanField())
+        _, _, like_model = target.models
+        return Exists(like_model.objects.filter(
+            user_id=user_id, **{target.id_column: OuterRef('pk')}
+        ))
+
+    # ============== LIST / DETAIL ==============
+
+    @classmethod
+    def get_list(
+        cls,
+        target: ContentTarget,
+        q: Optional[str] = None,
+        sort: Optional[str] = None,
+        page: int = 1,
+        page_size: int = 10,
+        premium: Optional[bool] = None,
+        tag_name: Optional[str] = None,
+        user_id: Optional[int] = None,
+        tag_mode: Optional[str] = None,
+        fields: Optional[str] = None,
+        **filters
+    ) -> Dict[str, Any]:
+        """
+        Paginated list of one content type, items as ContentRow objects.
+
+        ``fields`` (see normalize_fields) limits the columns selected, the
+        joins made and the viewer-state lookup to what the named fields
+        need. The parsed set comes back as ``fields`` for the encoder.
+        """
+        page, page_size = clamp_paging(page, page_size)
+        sort_key = normalize_sort(sort)
+        fields = normalize_fields(target, fields)
+        tag_names = parse_tag_names(tag_name)
+        tag_mode = normalize_tag_mode(tag_mode)
+
+        queryset = cls.filtered_queryset(target, q, premium, tag_name, tag_mode, **filters)
+        only_tags = bool(tag_names) and not q and premium is None and all(v is None for v in filters.values())
+        if only_tags:
+            # The bitmap already is the exact set of matching published items.
+            total = len(TagBitmapIndex.match(target, tag_names, tag_mode))
+            total_is_estimate = False
+        else:
+            total, total_is_estimate = CountCache.get_total(
+                target.name,
+                {'q': q, 'premium': premium, 'tag': ','.join(sorted(tag_names)), 'tagMode': tag_mode, **filters},
+                queryset,
+                table=target.content_table
+            )
+
+        columns = cls.list_columns(target, fields)
+        if sort_key == 'NEWEST' and 'sort_views' not in columns:
+            # Nothing reads the stats, so skip their join.
+            queryset = queryset.annotate(sort_published=F('published_at'))
+        else:
+            queryset = cls.with_sort_keys(queryset)
+        queryset = queryset.order_by(*SORT_KEYS[sort_key], '-pk')
+
+        offset = (page - 1) * page_size
+        items = cls.list_rows(target, queryset[offset:offset + page_size], fields)
+
+        if fields is None or 'viewerState' in fields:
+            liked = cls.liked_ids(target, user_id, (getattr(item, target.id_column) for item in items))
+            for item in items:
+                item._viewer_liked = getattr(item, target.id_column) in liked
+
+        return {
+            'page': page,
+            'pageSize': page_size,
+            'total': total,
+            'totalIsEstimate': total_is_estimate,
+            'items': items,
+            'fields': fields,
+        }
+
+    @staticmethod
+    def list_columns(target: ContentTarget, fields: Optional[frozenset] = None) -> tuple:
+        """Columns fetched for list pages, expert and stats flattened; only those ``fields`` need."""
+        columns = (
+            target.list_fields
+            + ('expert_id', 'expert__full_name', 'expert__specialization', 'sort_views', 'sort_likes')
+        )
+        if fields is not None:
+            field_columns = list_field_columns(target)
+            needed = {column for name in fields for column in field_columns[name]}
+            columns = tuple(column for column in columns if column in needed)
+        return (target.id_column,) + columns
+
+    @classmethod
+    def list_rows(cls, target: ContentTarget, queryset, fields: Optional[frozenset] = None) -> List[ContentRow]:
+        """
+        Fetch only the columns list serializers emit and wrap them as rows.
+
+        Large columns such as Post.content, Post.summary and
+        Video.description are never selected, and the expert columns come
+        back flattened from the same join. With ``fields``, rows carry only
+        what those fields read.
+        """
+        columns = cls.list_columns(target, fields)
+        rows = []
+        for values in queryset.values_list(*columns):
+            row = dict(zip(columns, values))
+            if 'expert_id' in row:
+                expert_id = row.pop('expert_id')
+                row['expert'] = None
+                if expert_id is not None:
+                    row['expert'] = ContentRow(
+                        expert_id=expert_id,
+                        full_name=row.pop('expert__full_name'),
+                        specialization=row.pop('expert__specialization'),
+                    )
+            if 'sort_views' in row:
+                row['stats'] = ContentRow(view_count=row.pop('sort_views'), like_count=row.pop('sort_likes'))
+            rows.append(ContentRow(**row))
+        return rows
+
+    @classmethod
+    def get_detail(cls, target: ContentTarget, content_id: int, user_id: Optional[int] = None):
+        """Published item with categories, record a view and attach live counts."""
+        item = cls.get_body(target, content_id)
+        if item is None:
+            return None
+
+        # View count increment on a random counter shard
+        CounterService.increment(target, content_id, 'view_count')
+
+        # Stats row plus unmerged shards
+        item._view_count, item._like_count = CounterService.get_count(target, content_id)
+
+        item._viewer_liked = content_id in cls.liked_ids(target, user_id, [content_id])
+        return item
+
+    @staticmethod
+    def get_body(target: ContentTarget, content_id: int):
+        """Published item with expert and categories, without counters."""
+        content_model, _, _ = target.models
+        return content_model.objects.select_related('expert').prefetch_related(
+            f'{target.category_relation}__category'
+        ).filter(pk=content_id, status='published').first()
+
+    @classmethod
+    def get_stats(cls, target: ContentTarget, content_id: int, user_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Exact counters and viewer state of a published item, without recording a view."""
+        content_model, _, _ = target.models
+        if not content_model.objects.filter(pk=content_id, status='published').exists():
+            return None
+        view_count, like_count = CounterService.get_count(target, content_id)
+        return {
+            'id': content_id,
+            'viewCount': view_count,
+            'likeCount': like_count,
+            'viewerState': {'liked': content_id in cls.liked_ids(target, user_id, [content_id])},
+        }
+
+    # ============== RELATED ==============
+
+    @classmethod
+    def get_related(
+        cls,
+        target: ContentTarget,
+        content_id: int,
+        page: int = 1,
+        page_size: int = 6
+    ) -> Dict[str, Any]:
+        """Posts and videos sharing a category with the given item, shuffled."""
+        page, page_size = clamp_paging(page, page_size, max_page_size=20)
+        category_model, _ = target.junction_models
+
+        category_ids = list(
+            category_model.objects.filter(**{target.id_column: content_id})
+            .values_list('category_id', flat=True)
+        )
+
+        items = []
+        if category_ids:
+            # The item's own type first, then the others.
+            ordered = [target] + [t for t in TARGETS.values() if t is not target]
+            for t in ordered:
+                content_model, _, _ = t.models
+                queryset = content_model.objects.filter(
+                    status='published',
+                    **{f'{t.category_relation}__category_id__in': category_ids}
+                )
+                if t is target:
+                    queryset = queryset.exclude(pk=content_id)
+                for row in (
+                    queryset.order_by('-published_at')
+                    .values(t.id_column, 'title', 'thumbnail_url', 'published_at')
+                    .distinct()
+                ):
+                    items.append({
+                        'id': row[t.id_column],
+                        'type': t.name,
+                        'title': row['title'],
+                        'thumbnailUrl': row['thumbnail_url']
+                    })
+
+        # Shuffle and paginate
+        random.shuffle(items)
+        total = len(items)
+        offset = (page - 1) * page_size
+
+        return {
+            'page': page,
+            'pageSize': page_size,
+            'total': total,
+            'items': items[offset:offset + page_size]
+        }
+
+    # ============== MIXED FEED ==============
+
+    @classmethod
+    def feed_queryset(
+        cls,
+        target: ContentTarget,
+        user_id: Optional[int] = None,
+        q: Optional[str] = None,
+        premium: Optional[bool] = None,
+        tag_name: Optional[str] = None,
+        tag_mode: Optional[str] = None
+    ):
+        """One side of the feed UNION: every FEED_COLUMNS column, same order."""
+        queryset = cls.with_sort_keys(cls.filtered_queryset(target, q, premium, tag_name, tag_mode))
+        is_video = target.name == 'video'
+
+        def video_column(field, output_field):
+            return F(field) if is_video else Value(None, output_field=output_field)
+
+        return queryset.annotate(
+            content_type=Value(target.name, output_field=CharField()),
+            content_id=F('pk'),
+            item_title=F('title'),
+            item_thumbnail_url=F('thumbnail_url'),
+            item_is_premium=F('is_premium'),
+            item_expert_id=F('expert_id'),
+            expert_name=F('expert__full_name'),
+            expert_specialization=F('expert__specialization'),
+            item_video_url=video_column('video_url', CharField()),
+            item_duration_seconds=video_column('duration_seconds', IntegerField()),
+            item_is_short=video_column('is_short', BooleanField()),
+            viewer_liked=cls.viewer_liked_expression(target, user_id),
+        ).values(*FEED_COLUMNS)
+
+    @classmethod
+    def get_feed(
+        cls,
+        sort: Optional[str] = None,
+        page: int = 1,
+        page_size: int = 10,
+        types: Optional[List[str]] = None,
+        q: Optional[str] = None,
+        premium: Optional[bool] = None,
+        tag_name: Optional[str] = None,
+        user_id: Optional[int] = None,
+        tag_mode: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Interleaved posts and videos in one UNION ALL query.
+
+        Viewer state is computed inside the query, and one extra row is
+        fetched instead of a COUNT to tell whether another page exists.
+        Anonymous pages are cached for CONTENT_FEED_CACHE_SECONDS.
+        """
+        page, page_size = clamp_paging(page, page_size)
+        sort_key = normalize_sort(sort)
+        names = sorted(set(types or TARGETS) & set(TARGETS))
+        if not names:
+            raise ValueError(f"Invalid types. Valid values: {', '.join(sorted(TARGETS))}")
+        tag_mode = normalize_tag_mode(tag_mode)
+
+        cache_key = None
+        ttl = getattr(settings, 'CONTENT_FEED_CACHE_SECONDS', 30)
+        if not user_id and ttl:
+            raw = repr((sort_key, page, page_size, names, q, premium, parse_tag_names(tag_name), tag_mode))
+            cache_key = 'content:feed:' + hashlib.md5(raw.encode()).hexdigest()
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        querysets = [
+            cls.feed_queryset(TARGETS[name], user_id, q, premium, tag_name, tag_mode).order_by()
+            for name in names
+        ]
+        union = querysets[0]
+        if len(querysets) > 1:
+            union = union.union(*querysets[1:], all=True)
+
+        union = union.order_by(*SORT_KEYS[sort_key], 'content_type', '-content_id')
+        offset = (page - 1) * page_size
+        rows = list(union[offset:offset + page_size + 1])
+
+        result = {
+            'page': page,
+            'pageSize': page_size,
+            'hasMore': len(rows) > page_size,
+            'items': [cls.feed_item(row) for row in rows[:page_size]]
+        }
+        if cache_key:
+            cache.set(cache_key, result, ttl)
+        return result
+
+    @staticmethod
+    def feed_item(row: Dict[str, Any]) -> Dict[str, Any]:
+        """Shape one UNION row like the post/video list items, plus ``type``."""
+        item = {
+            'id': row['content_id'],
+            'type': row['content_type'],
+            'title': row['item_title'],
+            'thumbnailUrl': row['item_thumbnail_url'],
+            'viewCount': row['sort_views'],
+            'likeCount': row['sort_likes'],
+            'publishedAt': row['sort_published'],
+            'isPremium': bool(row['item_is_premium']),
+            'expert': None,
+            'viewerState': {'liked': bool(row['viewer_liked'])},
+        }
+        if row['item_expert_id'] is not None:
+            item['expert'] = {
+                'expertId': row['item_expert_id'],
+                'fullName': row['expert_name'],
+                'specialization': row['expert_specialization'],
+            }
+        if row['content_type'] == 'video':
+            item['videoUrl'] = row['item_video_url']
+            item['durationSeconds'] = row['item_duration_seconds']
+            item['isShort'] = bool(row['item_is_short'])
+        return item
+
+    # ============== CATEGORY BROWSING ==============
+
+    @classmethod
+    def get_category_content(
+        cls,
+        slug: str,
+        sort: Optional[str] = None,
+        page: int = 1,
+        page_size: int = 10,
+        types: Optional[List[str]] = None,
+        user_id: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        A page of one category's published posts and videos, shaped like
+        feed items. ``sort`` is newest (default) or popular (views + likes).
+
+        The page's ids come from the in-memory CategoryIndex; only those
+        rows are read from SQL. Returns None for an unknown or inactive slug.
+        """
+        page, page_size = clamp_paging(page, page_size)
+        sort = (sort or 'newest').lower()
+        if sort not in CATEGORY_SORTS:
+            raise ValueError(f"Invalid sort: {sort}. Valid values: {', '.join(CATEGORY_SORTS)}")
+        names = sorted(set(types or TARGETS) & set(TARGETS))
+        if not names:
+            raise ValueError(f"Invalid types. Valid values: {', '.join(sorted(TARGETS))}")
+        scope = names[0] if len(names) == 1 else 'all'
+
+        found = CategoryIndex.page(slug, sort, scope, (page - 1) * page_size, page_size)
+        if found is None:
+            return None
+        category, total, keys = found
+
+        rows = {}
+        for name in {content_type for content_type, _ in keys}:
+            ids = [content_id for content_type, content_id in keys if content_type == name]
+            for row in cls.feed_queryset(TARGETS[name], user_id).filter(pk__in=ids):
+                rows[(name, row['content_id'])] = row
+
+        return {
+            'category': category,
+            'page': page,
+            'pageSize': page_size,
+            'total': total,
+            'items': [cls.feed_item(rows[key]) for key in keys if key in rows]
+        }
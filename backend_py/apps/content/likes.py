@@ -0,0 +1,294 @@
+"""
+Like toggling shared by posts and videos.
+
+On SQL Server the whole toggle (existence check, like insert/delete, stats
+adjustment and read-back) runs as a single T-SQL batch inside one
+transaction, so it costs one round trip and concurrent double-taps cannot
+skew ``like_count``. Other backends use an equivalent ORM fallback wrapped
+in ``transaction.atomic()``.
+"""
+
+import logging
+from datetime import datetime
+from typing import Optional, Dict, Any, List
+
+from django.db import connection, transaction
+
+from .counters import CounterService
+from .targets import ContentTarget, TARGETS
+
+logger = logging.getLogger(__name__)
+
+
+# Single-batch toggle. @desired NULL means "flip the current state"; 0/1 sets
+# it explicitly so client retries are idempotent. The like row is read with
+# UPDLOCK/HOLDLOCK so two concurrent toggles for the same (user, item)
+# serialize instead of both inserting or both decrementing. {apply_delta} is
+# one of the two fragments below, depending on whether counters are sharded.
+_TOGGLE_SQL = """
+SET NOCOUNT ON;
+SET XACT_ABORT ON;
+DECLARE @user_id INT = %s, @content_id INT = %s, @desired BIT = %s;
+DECLARE @has BIT, @delta INT = 0, @like_count BIGINT;
+
+IF NOT EXISTS (SELECT 1 FROM {content_table} WHERE {id_column} = @content_id)
+BEGIN
+    SELECT CAST(NULL AS BIT), CAST(NULL AS BIGINT);
+    RETURN;
+END
+
+BEGIN TRAN;
+
+SET @has = CASE WHEN EXISTS (
+    SELECT 1 FROM {likes_table} WITH (UPDLOCK, HOLDLOCK)
+    WHERE user_id = @user_id AND {id_column} = @content_id
+) THEN 1 ELSE 0 END;
+
+IF @desired IS NULL
+    SET @desired = CASE WHEN @has = 1 THEN 0 ELSE 1 END;
+
+IF @desired = 1 AND @has = 0
+BEGIN
+    INSERT INTO {likes_table} (user_id, {id_column}, created_at)
+    VALUES (@user_id, @content_id, SYSUTCDATETIME());
+    SET @delta = 1;
+END
+ELSE IF @desired = 0 AND @has = 1
+BEGIN
+    DELETE FROM {likes_table}
+    WHERE user_id = @user_id AND {id_column} = @content_id;
+    SET @delta = -1;
+END
+
+{apply_delta}
+COMMIT;
+
+SELECT @desired, @like_count;
+"""
+
+# Apply @delta to the item's stats row directly.
+_STATS_DELTA_SQL = """
+UPDATE {stats_table}
+SET @like_count = like_count = CASE WHEN like_count + @delta < 0 THEN 0 ELSE like_count + @delta END,
+    updated_at = CASE WHEN @delta = 0 THEN updated_at ELSE SYSUTCDATETIME() END
+WHERE {id_column} = @content_id;
+
+IF @@ROWCOUNT = 0
+BEGIN
+    SET @like_count = CASE WHEN @desired = 1 THEN 1 ELSE 0 END;
+    INSERT INTO {stats_table} ({id_column}, view_count, like_count, updated_at)
+    VALUES (@content_id, 0, @like_count, SYSUTCDATETIME());
+END
+"""
+
+# Apply @delta to one counter shard (see counters.py) and read back the sum.
+_SHARD_DELTA_SQL = """
+DECLARE @content_type VARCHAR(10) = %s, @shard SMALLINT = %s;
+
+IF @delta <> 0
+BEGIN
+    UPDATE ContentCounterShards WITH (UPDLOCK, SERIALIZABLE)
+    SET like_count = like_count + @delta
+    WHERE content_type = @content_type AND content_id = @content_id AND shard = @shard;
+
+    IF @@ROWCOUNT = 0
+        INSERT INTO ContentCounterShards (content_type, content_id, shard, view_count, like_count)
+        VALUES (@content_type, @content_id, @shard, 0, @delta);
+END
+
+SET @like_count =
+    ISNULL((SELECT like_count FROM {stats_table} WHERE {id_column} = @content_id), 0)
+    + ISNULL((SELECT SUM(like_count) FROM ContentCounterShards
+              WHERE content_type = @content_type AND content_id = @content_id), 0);
+"""
+
+
+class LikeService:
+    """Atomic like/unlike for posts and videos."""
+
+    @classmethod
+    def toggle(
+        cls,
+        target: ContentTarget,
+        content_id: int,
+        user_id: int,
+        liked: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """
+        Toggle (``liked=None``) or set (``liked=True/False``) a like.
+
+        Raises ValueError if the content does not exist.
+        Returns {'liked': bool, 'likeCount': int}.
+        """
+        if connection.vendor == 'microsoft':
+            result = cls._toggle_mssql(target, content_id, user_id, liked)
+        else:
+            result = cls._toggle_orm(target, content_id, user_id, liked)
+
+        if result is None:
+            raise ValueError(f"{target.name.capitalize()} with id {content_id} not found")
+
+        new_liked, like_count = result
+        return {
+            'liked': bool(new_liked),
+            'likeCount': max(0, int(like_count or 0))
+        }
+
+    @staticmethod
+    def _toggle_mssql(target: ContentTarget, content_id: int, user_id: int, liked: Optional[bool]):
+        params = [user_id, content_id, liked]
+        shard = CounterService.pick_shard()
+        if shard is None:
+            apply_delta = _STATS_DELTA_SQL
+        else:
+            apply_delta = _SHARD_DELTA_SQL
+            params += [target.name, shard]
+
+        names = dict(
+            content_table=target.content_table,
+            likes_table=target.likes_table,
+            stats_table=target.stats_table,
+            id_column=target.id_column,
+        )
+        sql = _TOGGLE_SQL.format(apply_delta=apply_delta.format(**names), **names)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            row = cursor.fetchone()
+
+        if row is None or row[0] is None:
+            return None
+        return row[0], row[1]
+
+    @staticmethod
+    def _toggle_orm(target: ContentTarget, content_id: int, user_id: int, liked: Optional[bool]):
+        content_model, stats_model, like_model = target.models
+        fk = {target.id_column: content_id}
+        now = datetime.utcnow()
+
+        with transaction.atomic():
+            if not content_model.objects.filter(pk=content_id).exists():
+                return None
+
+            # Filter on both columns: the models declare user_id as the pk,
+            # so deleting an instance would remove all of the user's likes.
+            likes = like_model.objects.select_for_update().filter(user_id=user_id, **fk)
+            has = likes.exists()
+            desired = (not has) if liked is None else bool(liked)
+
+            delta = 0
+            if desired and not has:
+                like_model.objects.create(user_id=user_id, created_at=now, **fk)
+                delta = 1
+            elif not desired and has:
+                likes.delete()
+                delta = -1
+
+            if not stats_model.objects.filter(**fk).exists():
+                stats_model.objects.create(view_count=0, like_count=0, updated_at=now, **fk)
+            CounterService.increment(target, content_id, 'like_count', delta)
+            _, like_count = CounterService.get_count(target, content_id)
+
+        return desired, like_count
+
+    # ============== BULK SYNC ==============
+
+    @staticmethod
+    def dedupe_operations(operations: List[Dict[str, Any]]) -> Dict[tuple, bool]:
+        """
+        Collapse queued operations to one final state per (contentType, id).
+
+        The latest clientTimestamp wins. When either of two operations has
+        no timestamp, or both have the same one, the later one in the batch
+        wins.
+        """
+        final = {}
+        for op in operations:
+            key = (op['contentType'], op['id'])
+            ts = op.get('clientTimestamp')
+            previous = final.get(key)
+            if previous is None or previous[0] is None or ts is None or ts >= previous[0]:
+                final[key] = (ts, bool(op['liked']))
+        return {key: liked for key, (_, liked) in final.items()}
+
+    @classmethod
+    def sync(cls, user_id: int, operations: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Apply a batch of offline like/unlike operations for one user.
+
+        Per content type this issues one existence query, one read of the
+        user's current likes, one bulk insert, one bulk delete, one
+        aggregated counter UPDATE (CounterService.increment_many) and one
+        read-back of the counts including unmerged shards.
+        """
+        final = cls.dedupe_operations(operations)
+
+        by_type = {}
+        for (content_type, content_id), liked in final.items():
+            by_type.setdefault(content_type, {})[content_id] = liked
+
+        items = []
+        not_found = []
+        with transaction.atomic():
+            for content_type, desired in by_type.items():
+                applied, missing = cls._sync_target(TARGETS[content_type], user_id, desired)
+                items.extend(applied)
+                not_found.extend({'contentType': content_type, 'id': i} for i in missing)
+
+        return {'items': items, 'notFound': not_found}
+
+    @staticmethod
+    def _sync_target(target: ContentTarget, user_id: int, desired: Dict[int, bool]):
+        content_model, stats_model, like_model = target.models
+        id_in = f'{target.id_column}__in'
+        now = datetime.utcnow()
+
+        existing = set(
+            content_model.objects.filter(pk__in=list(desired)).values_list('pk', flat=True)
+        )
+        missing = sorted(i for i in desired if i not in existing)
+        desired = {i: liked for i, liked in desired.items() if i in existing}
+        if not desired:
+            return [], missing
+
+        # Lock the stats rows up front so concurrent syncs/toggles serialize,
+        # creating any that are missing so the delta UPDATE below finds them.
+        with_stats = set(
+            stats_model.objects.select_for_update().filter(**{id_in: list(desired)})
+            .values_list(target.id_column, flat=True)
+        )
+        stats_model.objects.bulk_create([
+            stats_model(view_count=0, like_count=0, updated_at=now, **{target.id_column: i})
+            for i in desired if i not in with_stats
+        ])
+
+        currently_liked = set(
+            like_model.objects.filter(user_id=user_id, **{id_in: list(desired)})
+            .values_list(target.id_column, flat=True)
+        )
+        to_like = [i for i, liked in desired.items() if liked and i not in currently_liked]
+        to_unlike = [i for i, liked in desired.items() if not liked and i in currently_liked]
+
+        if to_like:
+            like_model.objects.bulk_create([
+                like_model(user_id=user_id, created_at=now, **{target.id_column: i})
+                for i in to_like
+            ])
+        if to_unlike:
+            like_model.objects.filter(user_id=user_id, **{id_in: to_unlike}).delete()
+
+        deltas = {i: 1 for i in to_like}
+        deltas.update({i: -1 for i in to_unlike})
+        CounterService.increment_many(target, 'like_count', deltas)
+
+        # Stats rows plus unmerged shards, as the toggle and detail endpoints report.
+        counts = CounterService.get_counts(target, desired)
+        applied = [
+            {
+                'contentType': target.name,
+                'id': i,
+                'liked': liked,
+                'likeCount': counts[i][1],
+            }
+            for i, liked in desired.items()
+        ]
+        return applied, missing
@@ -0,0 +1,30 @@
+"""
+Create every table the API and services need in the SQLite stand-in
+(DB_ENGINE=sqlite): Django's migrations, the database cache table and the
+tables of the unmanaged SQL Server models, with the hot-path indexes. Safe to run again; existing
+tables are left alone.
+Usage: DB_ENGINE=sqlite python manage.py bootstrap_sqlite
+"""
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from config.db.sqlite.schema import create_schema
+
+
+class Command(BaseCommand):
+    help = 'Create the SQLite stand-in schema'
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError(
+                f'The default database is {connection.vendor}; set DB_ENGINE=sqlite to bootstrap the stand-in.'
+            )
+        call_command('migrate', interactive=False, verbosity=options['verbosity'])
+        call_command('createcachetable', verbosity=options['verbosity'])
+        created = create_schema()
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {len(created)} tables in {connection.settings_dict['NAME']}"
+            + (f": {', '.join(created)}" if created else '')
+        ))
@@ -0,0 +1,31 @@
+"""
+Fold sharded view/like counters back into PostStats/VideoStats.
+Usage: python manage.py compact_counters [--type post|video] [--loop SECONDS]
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from apps.content.counters import CounterService
+from apps.content.targets import TARGETS
+
+
+class Command(BaseCommand):
+    help = 'Compact sharded content counters into the stats tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--type', choices=sorted(TARGETS), help='Only compact this content type')
+        parser.add_argument(
+            '--loop', type=int, default=0,
+            help='Keep running, compacting every N seconds (0 = run once)'
+        )
+
+    def handle(self, *args, **options):
+        target = TARGETS[options['type']] if options['type'] else None
+
+        while True:
+            merged = CounterService.compact(target)
+            self.stdout.write(self.style.SUCCESS(f'Compacted counters for {merged} items.'))
+            if not options['loop']:
+                break
+            time.sleep(options['loop'])
@@ -0,0 +1,43 @@
+"""
+Copy the SQLite stand-in's primary file into each DB_REPLICAS file, which
+is how the stand-in "replicates" when trying out read-replica routing.
+Between runs the replicas fall behind, and the heartbeat lag shows it.
+Usage: DB_ENGINE=sqlite DB_REPLICAS=/tmp/replica.sqlite3 python manage.py sync_sqlite_replica
+"""
+
+import sqlite3
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from apps.content.models import ReplicaHeartbeat
+from config.db.replicas import replica_aliases
+
+
+class Command(BaseCommand):
+    help = 'Copy the SQLite primary into its replica files'
+
+    def handle(self, *args, **options):
+        primary = connections['default']
+        if primary.vendor != 'sqlite':
+            raise CommandError('sync_sqlite_replica is for the SQLite stand-in (DB_ENGINE=sqlite).')
+        aliases = replica_aliases()
+        if not aliases:
+            raise CommandError('No replicas configured; set DB_REPLICAS.')
+
+        # Stamp first so the copies start out current.
+        ReplicaHeartbeat.objects.using('default').filter(pk=1).update(beat=time.time())
+        source = sqlite3.connect(primary.settings_dict['NAME'])
+        try:
+            for alias in aliases:
+                path = connections[alias].settings_dict['NAME']
+                connections[alias].close()
+                target = sqlite3.connect(path)
+                try:
+                    source.backup(target)
+                finally:
+                    target.close()
+                self.stdout.write(f"{alias}: copied to {path}")
+        finally:
+            source.close()
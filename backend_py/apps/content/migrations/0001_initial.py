@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CounterShard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_type', models.CharField(max_length=10)),
+                ('content_id', models.IntegerField()),
+                ('shard', models.SmallIntegerField()),
+                ('view_count', models.BigIntegerField(default=0)),
+                ('like_count', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'ContentCounterShards',
+                'unique_together': {('content_type', 'content_id', 'shard')},
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+from django.db import migrations, models
+
+
+def create_heartbeat(apps, schema_editor):
+    # The one row the heartbeat stamps; writers only ever UPDATE it.
+    apps.get_model('content', 'ReplicaHeartbeat').objects.using(schema_editor.connection.alias).create(id=1, beat=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReplicaHeartbeat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('beat', models.FloatField(help_text='time.time() of the last stamp')),
+            ],
+            options={
+                'db_table': 'ReplicaHeartbeat',
+            },
+        ),
+        migrations.RunPython(create_heartbeat, migrations.RunPython.noop),
+    ]
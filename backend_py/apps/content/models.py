@@ -0,0 +1,46 @@
+"""
+Content models - Tables owned by the shared content app.
+
+Unlike the Posts/Videos tables these ARE managed by Django migrations.
+"""
+
+from django.db import models
+
+
+class CounterShard(models.Model):
+    """
+    One sub-row of a sharded view/like counter.
+
+    Hot items spread their increments over several shard rows instead of
+    contending on the single PostStats/VideoStats row. The real count is the
+    stats row plus the sum of its shards; compaction folds shards back in.
+    """
+    content_type = models.CharField(max_length=10)
+    content_id = models.IntegerField()
+    shard = models.SmallIntegerField()
+    view_count = models.BigIntegerField(default=0)
+    like_count = models.BigIntegerField(default=0)
+
+    class Meta:
+        db_table = 'ContentCounterShards'
+        unique_together = [['content_type', 'content_id', 'shard']]
+
+    def __str__(self):
+        return f"{self.content_type} #{self.content_id} shard {self.shard}"
+
+
+class ReplicaHeartbeat(models.Model):
+    """
+    Single row (id=1) the API and services stamp on the primary.
+
+    Read back on a replica it shows how far that replica is behind, since
+    it carries the time of the last stamp it has replayed
+    (config.db.replicas, services.db).
+    """
+    beat = models.FloatField(help_text='time.time() of the last stamp')
+
+    class Meta:
+        db_table = 'ReplicaHeartbeat'
+
+    def __str__(self):
+        return f"heartbeat {self.beat}"
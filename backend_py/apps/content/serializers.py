@@ -0,0 +1,92 @@
+"""Content serializers shared by posts and videos."""
+
+from rest_framework import serializers
+from apps.experts.serializers import ExpertSerializer
+
+from .targets import TARGETS
+
+
+class LikeSyncOperationSerializer(serializers.Serializer):
+    """One queued like/unlike operation from an offline client."""
+    contentType = serializers.ChoiceField(choices=sorted(TARGETS))
+    id = serializers.IntegerField(min_value=1)
+    liked = serializers.BooleanField()
+    clientTimestamp = serializers.DateTimeField(required=False, allow_null=True)
+
+
+class LikeSyncRequestSerializer(serializers.Serializer):
+    """Bulk like sync request."""
+    operations = LikeSyncOperationSerializer(many=True, allow_empty=False, max_length=500)
+
+
+class LikeSyncItemSerializer(serializers.Serializer):
+    """Resulting like state for one item."""
+    contentType = serializers.CharField()
+    id = serializers.IntegerField()
+    liked = serializers.BooleanField()
+    likeCount = serializers.IntegerField()
+
+
+class ViewerStateSerializer(serializers.Serializer):
+    """The requesting user's state for one item."""
+    liked = serializers.BooleanField()
+
+
+class ContentStatsSerializer(serializers.Serializer):
+    """Volatile counters of a post or video, served apart from its body."""
+    id = serializers.IntegerField()
+    viewCount = serializers.IntegerField()
+    likeCount = serializers.IntegerField()
+    viewerState = ViewerStateSerializer()
+
+
+class ContentRefSerializer(serializers.Serializer):
+    """Reference to a post or video."""
+    contentType = serializers.CharField()
+    id = serializers.IntegerField()
+
+
+class LikeSyncResponseSerializer(serializers.Serializer):
+    """Bulk like sync response."""
+    items = LikeSyncItemSerializer(many=True)
+    notFound = ContentRefSerializer(many=True)
+
+
+class FeedItemSerializer(serializers.Serializer):
+    """Mixed feed item. Video-only fields are present for videos only."""
+    id = serializers.IntegerField()
+    type = serializers.CharField()
+    title = serializers.CharField()
+    thumbnailUrl = serializers.CharField(allow_null=True)
+    viewCount = serializers.IntegerField()
+    likeCount = serializers.IntegerField()
+    publishedAt = serializers.DateTimeField()
+    isPremium = serializers.BooleanField()
+    expert = ExpertSerializer(allow_null=True)
+    viewerState = serializers.DictField()
+    videoUrl = serializers.CharField(required=False)
+    durationSeconds = serializers.IntegerField(required=False)
+    isShort = serializers.BooleanField(required=False)
+
+
+class FeedResponseSerializer(serializers.Serializer):
+    """Mixed feed page."""
+    page = serializers.IntegerField()
+    pageSize = serializers.IntegerField()
+    hasMore = serializers.BooleanField()
+    items = FeedItemSerializer(many=True)
+
+
+class CategoryRefSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    slug = serializers.CharField()
+
+
+class CategoryContentResponseSerializer(serializers.Serializer):
+    """One page of a category's content."""
+    category = CategoryRefSerializer()
+    page = serializers.IntegerField()
+    pageSize = serializers.IntegerField()
+    total = serializers.IntegerField()
+    items = FeedItemSerializer(many=True)
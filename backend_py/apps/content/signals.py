@@ -0,0 +1,113 @@
+"""
+Invalidate cached list totals (apps.content.totals) and the tag bitmap index
+(apps.content.tagindex) when content changes, and feed the category index
+(apps.content.categories) its change log.
+
+Any save of a post/video may change its status, so every save or delete
+drops the type's totals and the tag index, as do tag changes; expert and
+review writes drop their totals. Post/video and category link writes queue
+just that item for re-indexing; category edits force a full rebuild.
+
+Other workers act on these as soon as they see them, re-reading the rows,
+so they are issued with transaction.on_commit: a worker must never rebuild
+from a write that is not visible yet (or is later rolled back).
+
+Category link writes, category edits and expert edits also stamp the
+affected items' updated_at, which their detail ETags are derived from
+(apps.content.versions). The stamp is written on commit too, so a GET can't
+pair the new ETag with the old body.
+"""
+
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_delete
+
+from apps.experts.models import Expert, ExpertReview
+from apps.posts.models import Post, PostCategory, PostTag
+from apps.tags.models import ContentCategory, Tag
+from apps.videos.models import Video, VideoCategory, VideoTag
+
+from .categories import CategoryIndex
+from .tagindex import TagBitmapIndex
+from .targets import TARGETS
+from .totals import CountCache
+from .versions import ContentVersions
+
+SCOPES = {
+    Post: 'post',
+    PostTag: 'post',
+    Video: 'video',
+    VideoTag: 'video',
+    Expert: 'expert',
+    ExpertReview: 'expert_review',
+}
+
+TAG_INDEX_SENDERS = (Tag, PostTag, VideoTag, Post, Video)
+
+# sender -> (content type, attribute holding the content id)
+CATEGORY_INDEX_SENDERS = {
+    Post: ('post', 'pk'),
+    Video: ('video', 'pk'),
+    PostCategory: ('post', 'post_id'),
+    VideoCategory: ('video', 'video_id'),
+}
+
+
+def invalidate_totals(sender, using=None, **kwargs):
+    scope = SCOPES[sender]
+    transaction.on_commit(lambda: CountCache.invalidate(scope), using=using)
+
+
+def invalidate_tag_index(sender, using=None, **kwargs):
+    transaction.on_commit(TagBitmapIndex.invalidate, using=using)
+
+
+def record_category_change(sender, instance, using=None, **kwargs):
+    content_type, attribute = CATEGORY_INDEX_SENDERS[sender]
+    content_id = getattr(instance, attribute)
+    transaction.on_commit(lambda: CategoryIndex.record_change(content_type, content_id), using=using)
+
+
+def reset_category_index(sender, using=None, **kwargs):
+    transaction.on_commit(CategoryIndex.invalidate, using=using)
+
+
+def touch_category_link(sender, instance, using=None, **kwargs):
+    content_type, attribute = CATEGORY_INDEX_SENDERS[sender]
+    content_ids = [getattr(instance, attribute)]
+    transaction.on_commit(partial(ContentVersions.touch, TARGETS[content_type], content_ids), using=using)
+
+
+def touch_category(sender, instance, using=None, **kwargs):
+    transaction.on_commit(partial(ContentVersions.touch_category, instance.pk), using=using)
+
+
+def touch_deleted_category(sender, instance, using=None, **kwargs):
+    # The links are gone once the delete commits, so collect the items now.
+    items = ContentVersions.category_items(instance.pk)
+    transaction.on_commit(partial(ContentVersions.touch_items, items), using=using)
+
+
+def touch_expert(sender, instance, using=None, **kwargs):
+    transaction.on_commit(partial(ContentVersions.touch_expert, instance.pk), using=using)
+
+
+def connect():
+    for model in SCOPES:
+        post_save.connect(invalidate_totals, sender=model, dispatch_uid=f'totals-save-{model.__name__}')
+        post_delete.connect(invalidate_totals, sender=model, dispatch_uid=f'totals-delete-{model.__name__}')
+    for model in TAG_INDEX_SENDERS:
+        post_save.connect(invalidate_tag_index, sender=model, dispatch_uid=f'tagindex-save-{model.__name__}')
+        post_delete.connect(invalidate_tag_index, sender=model, dispatch_uid=f'tagindex-delete-{model.__name__}')
+    for model in CATEGORY_INDEX_SENDERS:
+        post_save.connect(record_category_change, sender=model, dispatch_uid=f'categories-save-{model.__name__}')
+        post_delete.connect(record_category_change, sender=model, dispatch_uid=f'categories-delete-{model.__name__}')
+    for model in (PostCategory, VideoCategory):
+        post_save.connect(touch_category_link, sender=model, dispatch_uid=f'versions-save-{model.__name__}')
+        post_delete.connect(touch_category_link, sender=model, dispatch_uid=f'versions-delete-{model.__name__}')
+    post_save.connect(touch_category, sender=ContentCategory, dispatch_uid='versions-save-ContentCategory')
+    pre_delete.connect(touch_deleted_category, sender=ContentCategory, dispatch_uid='versions-delete-ContentCategory')
+    post_save.connect(touch_expert, sender=Expert, dispatch_uid='versions-save-Expert')
+    post_save.connect(reset_category_index, sender=ContentCategory, dispatch_uid='categories-save-ContentCategory')
+    post_delete.connect(reset_category_index, sender=ContentCategory, dispatch_uid='categories-delete-ContentCategory')
@@ -0,0 +1,250 @@
+"""
+Tag -> content bitmap index for multi-tag filtering.
+
+For each content type the index maps tag_id to a compressed bitmap of the
+published content ids carrying it, built from PostTags/VideoTags in one
+query per type. ``tag=a,b&tagMode=all|any`` is resolved entirely in memory,
+and SQL only receives the surviving ids as a single parameter to pick the
+sorted page from.
+
+Bitmaps are roaring-style (TagBitmap): ids are split into 2^16-id chunks by
+their high bits, and each chunk holds its low 16 bits either as a sorted
+array (up to ARRAY_MAX ids) or as an 8 KiB bitmap when denser. A tag on a
+handful of items costs a few bytes however large the ids are, a popular
+tag at most 8 KiB per chunk, and AND/OR only touch chunks both sides have.
+Match results and their serialized id lists are memoized per build, so a
+repeated filter neither recombines bitmaps nor re-joins the ids.
+
+Rebuilt lazily after ``invalidate()`` (apps.content.signals, on tag and
+tagged-content changes) in any worker, or once older than
+CONTENT_TAG_INDEX_REFRESH_SECONDS (config.invalidation).
+"""
+
+import logging
+import time
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from django.db import connection
+from django.db.models.expressions import RawSQL
+
+from apps.tags.models import Tag
+from config.invalidation import VersionedIndex
+
+from .targets import ContentTarget, TARGETS
+
+logger = logging.getLogger(__name__)
+
+TAG_MODES = ('all', 'any')
+
+CHUNK_BITS = 16
+CHUNK_BYTES = (1 << CHUNK_BITS) // 8
+# Chunks with more ids than this are stored as bitmaps, which are then smaller.
+ARRAY_MAX = 4096
+# Distinct tag filters memoized per build.
+MATCH_CACHE_SIZE = 1024
+
+# A chunk's low 16 bits: sorted array('H') when sparse, int bitmap when dense.
+Container = Union[array, int]
+
+# Set bit positions of every byte value, for walking a bitmap bytewise.
+_BYTE_BITS = [tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256)]
+
+
+def parse_tag_names(value: Optional[str]) -> List[str]:
+    """'a, B,,c' -> ['a', 'b', 'c'] (lowercased, de-duplicated, in order)."""
+    if not value:
+        return []
+    names = []
+    for name in value.split(','):
+        name = name.strip().lower()
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def normalize_tag_mode(mode: Optional[str]) -> str:
+    mode = (mode or 'all').lower()
+    if mode not in TAG_MODES:
+        raise ValueError(f"Invalid tagMode: {mode}. Valid values: {', '.join(TAG_MODES)}")
+    return mode
+
+
+def _bits(bitmap: int) -> Iterator[int]:
+    """Ascending positions of the set bits."""
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, 'little')
+    for offset, byte in enumerate(data):
+        if byte:
+            base = offset * 8
+            for bit in _BYTE_BITS[byte]:
+                yield base + bit
+
+
+def _container(lows: List[int]) -> Container:
+    """Sorted, distinct low bits -> the smaller container for them."""
+    if len(lows) <= ARRAY_MAX:
+        return array('H', lows)
+    data = bytearray(CHUNK_BYTES)
+    for low in lows:
+        data[low >> 3] |= 1 << (low & 7)
+    return int.from_bytes(data, 'little')
+
+
+def _and(a: Container, b: Container) -> Container:
+    if isinstance(a, int) and isinstance(b, int):
+        both = a & b
+        return array('H', _bits(both)) if both.bit_count() <= ARRAY_MAX else both
+    if isinstance(a, int):
+        a, b = b, a
+    if isinstance(b, int):
+        data = b.to_bytes(CHUNK_BYTES, 'little')
+        return array('H', [low for low in a if data[low >> 3] >> (low & 7) & 1])
+    if len(a) > len(b):
+        a, b = b, a
+    members = set(b)
+    return array('H', [low for low in a if low in members])
+
+
+def _or(a: Container, b: Container) -> Container:
+    if isinstance(a, int) and isinstance(b, int):
+        return a | b
+    if isinstance(a, int):
+        a, b = b, a
+    if isinstance(b, int):
+        data = bytearray(b.to_bytes(CHUNK_BYTES, 'little'))
+        for low in a:
+            data[low >> 3] |= 1 << (low & 7)
+        return int.from_bytes(data, 'little')
+    return _container(sorted(set(a).union(b)))
+
+
+def _size(container: Container) -> int:
+    return container.bit_count() if isinstance(container, int) else len(container)
+
+
+class TagBitmap:
+    """Compressed set of content ids: {high 16 bits: container}, in key order."""
+
+    __slots__ = ('chunks', '_csv')
+
+    def __init__(self, chunks: Optional[Dict[int, Container]] = None):
+        self.chunks = chunks or {}
+        self._csv = None
+
+    @classmethod
+    def from_ids(cls, ids: Iterable[int]) -> 'TagBitmap':
+        lows_by_high = {}
+        for content_id in sorted(set(ids)):
+            lows_by_high.setdefault(content_id >> CHUNK_BITS, []).append(content_id & 0xFFFF)
+        return cls({high: _container(lows) for high, lows in lows_by_high.items()})
+
+    def __and__(self, other: 'TagBitmap') -> 'TagBitmap':
+        chunks = {}
+        for high in sorted(self.chunks.keys() & other.chunks.keys()):
+            both = _and(self.chunks[high], other.chunks[high])
+            if _size(both):
+                chunks[high] = both
+        return TagBitmap(chunks)
+
+    def __or__(self, other: 'TagBitmap') -> 'TagBitmap':
+        chunks = {}
+        for high in sorted(self.chunks.keys() | other.chunks.keys()):
+            mine, theirs = self.chunks.get(high), other.chunks.get(high)
+            chunks[high] = mine if theirs is None else theirs if mine is None else _or(mine, theirs)
+        return TagBitmap(chunks)
+
+    def __len__(self) -> int:
+        return sum(_size(container) for container in self.chunks.values())
+
+    def __bool__(self) -> bool:
+        return bool(self.chunks)
+
+    def __iter__(self) -> Iterator[int]:
+        """Ascending ids."""
+        for high, container in self.chunks.items():
+            base = high << CHUNK_BITS
+            for low in (_bits(container) if isinstance(container, int) else container):
+                yield base + low
+
+    def csv(self) -> str:
+        """'1,2,3', joined once per bitmap."""
+        if self._csv is None:
+            self._csv = ','.join(map(str, self))
+        return self._csv
+
+
+EMPTY = TagBitmap()
+
+
+def ids_expression(bitmap: TagBitmap):
+    """Right-hand side for ``pk__in`` passing all ids as one SQL parameter."""
+    if connection.vendor == 'microsoft':
+        return RawSQL("SELECT CAST(value AS INT) FROM STRING_SPLIT(%s, ',')", [bitmap.csv()])
+    if connection.vendor == 'sqlite':
+        return RawSQL("SELECT value FROM json_each(%s)", [f'[{bitmap.csv()}]'])
+    return list(bitmap)
+
+
+class TagBitmapIndex(VersionedIndex):
+    """Per content type {tag_id: TagBitmap} plus a tag name lookup."""
+
+    VERSION_KEY = 'content:tagindex:version'
+    MAX_AGE_SETTING = 'CONTENT_TAG_INDEX_REFRESH_SECONDS'
+
+    # ({lowercased tag name: [tag_id, ...]}, {content type: {tag_id: bitmap}}, memoized matches)
+    _index: Tuple[Dict[str, List[int]], Dict[str, Dict[int, TagBitmap]], Dict[tuple, TagBitmap]] = ({}, {}, {})
+
+    @classmethod
+    def build(cls) -> None:
+        started = time.perf_counter()
+        names = {}
+        for tag_id, name in Tag.objects.values_list('tag_id', 'name'):
+            # Names differing only in case/whitespace all match, as in SQL Server's collation.
+            names.setdefault(name.strip().lower(), []).append(tag_id)
+
+        bitmaps = {}
+        for target in TARGETS.values():
+            _, tag_model = target.junction_models
+            ids_by_tag = {}
+            for tag_id, content_id in tag_model.objects.filter(
+                **{f'{target.name}__status': 'published'}
+            ).values_list('tag_id', target.id_column):
+                ids_by_tag.setdefault(tag_id, []).append(content_id)
+            bitmaps[target.name] = {tag_id: TagBitmap.from_ids(ids) for tag_id, ids in ids_by_tag.items()}
+
+        cls._index = (names, bitmaps, {})
+        logger.info(f"Built tag bitmap index: {len(names)} tags in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    @classmethod
+    def match(cls, target: ContentTarget, tag_names: List[str], mode: str = 'all') -> TagBitmap:
+        """Bitmap of published ``target`` ids having all/any of ``tag_names``."""
+        cls.ensure_fresh()
+        names, bitmaps, matches = cls._index
+        key = (target.name, mode, frozenset(tag_names))
+        result = matches.get(key)
+        if result is not None:
+            return result
+
+        by_tag = bitmaps.get(target.name, {})
+        sets = [cls._union(by_tag, names.get(name, ())) for name in tag_names]
+        result = sets[0] if sets else EMPTY
+        for bitmap in sets[1:]:
+            if mode == 'all':
+                result &= bitmap
+                if not result:
+                    break
+            else:
+                result |= bitmap
+
+        if len(matches) >= MATCH_CACHE_SIZE:
+            matches.clear()
+        matches[key] = result
+        return result
+
+    @staticmethod
+    def _union(by_tag: Dict[int, TagBitmap], tag_ids: Iterable[int]) -> TagBitmap:
+        """Items carrying any of the tags sharing one folded name."""
+        result = EMPTY
+        for tag_id in tag_ids:
+            result |= by_tag.get(tag_id, EMPTY)
+        return result
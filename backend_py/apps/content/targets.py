@@ -0,0 +1,69 @@
+"""
+Content targets - Table and model names for each kind of content.
+
+Posts and videos share the same shape (content table, stats table, likes
+table keyed by ``<type>_id``); shared services take a target instead of
+being written twice.
+"""
+
+
+class ContentTarget:
+    """Tables and models for one kind of content."""
+
+    def __init__(
+        self,
+        name,
+        content_table,
+        likes_table,
+        stats_table,
+        id_column,
+        models_loader,
+        search_fields=('title',),
+        list_fields=(),
+    ):
+        self.name = name
+        self.content_table = content_table
+        self.likes_table = likes_table
+        self.stats_table = stats_table
+        self.id_column = id_column
+        self.search_fields = search_fields
+        # Own columns list endpoints need, besides the pk, expert and stats.
+        self.list_fields = ('title', 'thumbnail_url', 'published_at', 'is_premium') + tuple(list_fields)
+        self._models_loader = models_loader
+
+    @property
+    def models(self):
+        """Return (content_model, stats_model, like_model), imported lazily."""
+        return self._models_loader()[:3]
+
+    @property
+    def junction_models(self):
+        """Return (category_model, tag_model) junction tables, imported lazily."""
+        return self._models_loader()[3:]
+
+    @property
+    def category_relation(self):
+        """Reverse accessor from content to its category junction rows."""
+        return f'{self.name}_categories'
+
+
+def _post_models():
+    from apps.posts.models import Post, PostStats, PostLike, PostCategory, PostTag
+    return Post, PostStats, PostLike, PostCategory, PostTag
+
+
+def _video_models():
+    from apps.videos.models import Video, VideoStats, VideoLike, VideoCategory, VideoTag
+    return Video, VideoStats, VideoLike, VideoCategory, VideoTag
+
+
+POST = ContentTarget(
+    'post', 'Posts', 'PostLikes', 'PostStats', 'post_id', _post_models,
+    search_fields=('title', 'summary'),
+)
+VIDEO = ContentTarget(
+    'video', 'Videos', 'VideoLikes', 'VideoStats', 'video_id', _video_models,
+    list_fields=('video_url', 'duration_seconds', 'is_short'),
+)
+
+TARGETS = {t.name: t for t in (POST, VIDEO)}
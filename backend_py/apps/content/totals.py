@@ -0,0 +1,165 @@
+"""
+Cached totals for paginated list endpoints.
+
+With a tag semi-join or an icontains search, ``queryset.count()`` costs as
+much as the page query itself. ``CountCache.get_total`` caches the total per
+scope ('post', 'video', 'expert', 'expert_review') and normalized filter
+set:
+
+- a fresh entry (younger than CONTENT_COUNT_CACHE_SECONDS) is returned as is;
+- a stale entry is returned while a background thread recounts;
+- a miss counts synchronously, or, for unfiltered lists on SQL Server with
+  CONTENT_COUNT_ESTIMATES enabled, returns the table's row count (all
+  statuses) from sys.dm_db_partition_stats flagged as an estimate and
+  recounts in the background.
+
+``invalidate(scope)`` bumps the scope's version so every cached filter
+combination is dropped at once; apps.content.signals calls it when content
+is published/unpublished/retagged or a review is added. Totals are cached
+per worker, but the versions live in the shared cache (config.invalidation):
+other workers drop their totals within CHECK_INTERVAL (1 s) of a write.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, connections
+
+from config.invalidation import SharedVersion
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='count-refresh')
+_pending = set()
+_pending_lock = threading.Lock()
+_versions: Dict[str, SharedVersion] = {}
+
+
+class CountCache:
+    """Total-count cache keyed by scope and normalized filters."""
+
+    KEY_PREFIX = 'count'
+
+    @staticmethod
+    def ttl() -> int:
+        return max(0, int(getattr(settings, 'CONTENT_COUNT_CACHE_SECONDS', 300)))
+
+    @staticmethod
+    def normalize_filters(filters: Dict[str, Any]) -> Dict[str, Any]:
+        """Drop unset filters and case/whitespace-fold strings."""
+        normalized = {}
+        for name, value in filters.items():
+            if isinstance(value, str):
+                value = value.strip().lower()
+            if value is None or value == '':
+                continue
+            normalized[name] = value
+        return normalized
+
+    @classmethod
+    def _version(cls, scope: str) -> SharedVersion:
+        version = _versions.get(scope)
+        if version is None:
+            version = _versions.setdefault(scope, SharedVersion(f'{cls.KEY_PREFIX}:{scope}:version'))
+        return version
+
+    @classmethod
+    def _key(cls, scope: str, filters: Dict[str, Any]) -> str:
+        digest = hashlib.md5(
+            json.dumps(filters, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        return f'{cls.KEY_PREFIX}:{scope}:{cls._version(scope).get()}:{digest}'
+
+    # ============== READS ==============
+
+    @classmethod
+    def get_total(
+        cls,
+        scope: str,
+        filters: Dict[str, Any],
+        queryset,
+        table: Optional[str] = None
+    ) -> Tuple[int, bool]:
+        """
+        Return (total, is_estimate) for ``queryset``.
+
+        ``filters`` must identify the queryset within its scope. ``table``
+        enables the partition-statistics estimate for unfiltered lists.
+        """
+        ttl = cls.ttl()
+        if not ttl:
+            return queryset.count(), False
+
+        filters = cls.normalize_filters(filters)
+        key = cls._key(scope, filters)
+        entry = cache.get(key)
+        if entry is not None:
+            total, counted_at = entry
+            if time.time() - counted_at > ttl:
+                cls._refresh_async(key, queryset, ttl)
+            return total, False
+
+        if table and not filters and getattr(settings, 'CONTENT_COUNT_ESTIMATES', False):
+            estimate = cls._estimate_rows(table)
+            if estimate is not None:
+                cls._refresh_async(key, queryset, ttl)
+                return estimate, True
+
+        return cls._store(key, queryset.count(), ttl), False
+
+    @classmethod
+    def _store(cls, key: str, total: int, ttl: int) -> int:
+        # Stale entries stay usable for a while so a refresh never blocks a page.
+        cache.set(key, (total, time.time()), ttl * 10)
+        return total
+
+    @classmethod
+    def _refresh_async(cls, key: str, queryset, ttl: int) -> None:
+        with _pending_lock:
+            if key in _pending:
+                return
+            _pending.add(key)
+
+        def refresh():
+            try:
+                cls._store(key, queryset.count(), ttl)
+            except Exception:
+                logger.exception(f"Background count refresh failed for {key}")
+            finally:
+                with _pending_lock:
+                    _pending.discard(key)
+                connections.close_all()
+
+        _executor.submit(refresh)
+
+    @staticmethod
+    def _estimate_rows(table: str) -> Optional[int]:
+        """Row count of ``table`` from SQL Server partition statistics."""
+        if connection.vendor != 'microsoft':
+            return None
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT SUM(row_count) FROM sys.dm_db_partition_stats "
+                    "WHERE object_id = OBJECT_ID(%s) AND index_id IN (0, 1)",
+                    [table]
+                )
+                row = cursor.fetchone()
+        except Exception as e:
+            logger.warning(f"Row count estimate unavailable for {table}: {e}")
+            return None
+        return int(row[0]) if row and row[0] is not None else None
+
+    # ============== INVALIDATION ==============
+
+    @classmethod
+    def invalidate(cls, scope: str) -> None:
+        """Drop every cached total of a scope, in every worker."""
+        cls._version(scope).bump()
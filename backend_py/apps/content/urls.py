@@ -0,0 +1,10 @@
+"""Content URL configuration."""
+
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('feed', views.feed, name='content-feed'),
+    path('categories/<slug:slug>/content', views.category_content, name='category-content'),
+    path('likes/sync', views.sync_likes, name='likes-sync'),
+]
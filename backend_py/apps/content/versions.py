@@ -0,0 +1,175 @@
+"""
+Version stamps and conditional GET for post/video detail.
+
+A detail response is a large, rarely edited body (title, content, expert,
+categories) plus counters that move on every view. One validator for both
+would never match, so they are versioned separately:
+
+- the body version is derived from the item's updated_at and the embedded
+  expert fields. Category link changes, category edits and expert edits
+  stamp the affected items' updated_at (apps.content.signals), which also
+  moves Last-Modified. It is read with one narrow query, so a revalidation
+  ending in 304 never loads the body, categories or expert;
+- the stats version is derived from the exact view/like counts and the
+  viewer's like, i.e. what ``/<id>/stats`` returns.
+
+ETags are weak (W/"..."), as the representation is JSON that compression
+re-encodes anyway (compression.django), and compared weakly.
+"""
+
+import hashlib
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+
+from .counters import CounterService
+from .encoders import encoder_for, json_response
+from .engine import ContentEngine
+from .targets import ContentTarget, TARGETS
+
+# (etag, last_modified as a unix timestamp)
+Version = Tuple[str, Optional[int]]
+
+# Detail fields that move with every view or like; served by /<id>/stats instead.
+COUNTER_FIELDS = frozenset({'viewCount', 'likeCount', 'viewerState'})
+
+
+class ContentVersions:
+    """Body and stats version stamps for content items."""
+
+    @staticmethod
+    def body_version(target: ContentTarget, content_id: int) -> Optional[Version]:
+        """Version of a published item's body, or None if it is not published."""
+        content_model, _, _ = target.models
+        row = (
+            content_model.objects.filter(pk=content_id, status='published')
+            .values_list('updated_at', 'expert__full_name', 'expert__specialization')
+            .first()
+        )
+        if row is None:
+            return None
+        updated_at, *expert = row
+        last_modified = int(updated_at.timestamp()) if updated_at else None
+        digest = hashlib.md5(
+            f"{content_id}:{updated_at.isoformat() if updated_at else ''}:{expert}".encode()
+        ).hexdigest()[:16]
+        return f'W/"{target.name}-{content_id}-{digest}"', last_modified
+
+    @staticmethod
+    def stats_version(target: ContentTarget, stats: Dict[str, Any]) -> str:
+        """ETag of a ContentEngine.get_stats result."""
+        liked = int(stats['viewerState']['liked'])
+        return f'W/"{target.name}-{stats["id"]}-s{stats["viewCount"]}.{stats["likeCount"]}.{liked}"'
+
+    # ============== INVALIDATION ==============
+
+    @staticmethod
+    def touch(target: ContentTarget, content_ids: Iterable[int]) -> None:
+        """Move the body version of items whose categories changed."""
+        content_model, _, _ = target.models
+        content_model.objects.filter(pk__in=list(content_ids)).update(updated_at=timezone.now())
+
+    @staticmethod
+    def touch_expert(expert_id: int) -> None:
+        """Move the body version of every item by an expert."""
+        for target in TARGETS.values():
+            content_model, _, _ = target.models
+            content_model.objects.filter(expert_id=expert_id).update(updated_at=timezone.now())
+
+    @staticmethod
+    def category_items(category_id: int) -> Dict[str, List[int]]:
+        """{content type: ids} of the items linked to a category."""
+        return {
+            name: list(target.junction_models[0].objects.filter(category_id=category_id)
+                       .values_list(target.id_column, flat=True))
+            for name, target in TARGETS.items()
+        }
+
+    @staticmethod
+    def touch_items(items: Dict[str, List[int]]) -> None:
+        """``touch`` for a category_items result."""
+        for name, content_ids in items.items():
+            if content_ids:
+                ContentVersions.touch(TARGETS[name], content_ids)
+
+    @staticmethod
+    def touch_category(category_id: int) -> None:
+        """Move the body version of every item linked to a category."""
+        for target in TARGETS.values():
+            content_model, _, _ = target.models
+            content_model.objects.filter(
+                **{f'{target.category_relation}__category_id': category_id}
+            ).update(updated_at=timezone.now())
+
+
+# ============== HTTP ==============
+
+def not_modified(request, etag: str, last_modified: Optional[int] = None) -> bool:
+    """
+    True when the client's cached copy is current (RFC 9110 13.1.2, 13.1.3).
+
+    If-None-Match is compared weakly and takes precedence; If-Modified-Since
+    is only consulted when it is absent.
+    """
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match:
+        if if_none_match.strip() == '*':
+            return True
+        bare = etag[2:] if etag.startswith('W/') else etag
+        return bare in (tag[2:] if tag.startswith('W/') else tag for tag in parse_etags(if_none_match))
+    if last_modified is not None:
+        since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+        return since is not None and last_modified <= since
+    return False
+
+
+def set_validators(response, etag: str, last_modified: Optional[int] = None, cache_control: str = 'no-cache'):
+    """Attach ETag/Last-Modified and make caches revalidate before reuse."""
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = cache_control
+    return response
+
+
+# ============== RESPONSES ==============
+
+@lru_cache(maxsize=None)
+def body_fields(serializer_class) -> frozenset:
+    return frozenset(serializer_class().fields) - COUNTER_FIELDS
+
+
+def detail_body_response(request, target: ContentTarget, content_id: int, serializer_class):
+    """
+    Detail without counters, with ETag/Last-Modified. The view is recorded in
+    the background, on 304s too. None if the item is not published.
+    """
+    version = ContentVersions.body_version(target, content_id)
+    if version is None:
+        return None
+    etag, last_modified = version
+    if not_modified(request, etag, last_modified):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        item = ContentEngine.get_body(target, content_id)
+        if item is None:
+            return None
+        response = json_response(request, encoder_for(serializer_class, body_fields(serializer_class))(item))
+    CounterService.increment_async(target, content_id, 'view_count')
+    return set_validators(response, etag, last_modified)
+
+
+def stats_response(request, target: ContentTarget, stats: Dict[str, Any]):
+    """Counters with a per-viewer ETag; private, since viewerState is."""
+    etag = ContentVersions.stats_version(target, stats)
+    if not_modified(request, etag):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = json_response(request, stats)
+    patch_vary_headers(response, ('X-User-Id',))
+    return set_validators(response, etag, cache_control='private, no-cache')
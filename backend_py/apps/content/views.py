@@ -0,0 +1,149 @@
+"""
+Content views - API endpoints shared by posts and videos.
+"""
+
+from rest_framework import status, serializers
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+
+from apps.posts.views import get_user_id_from_header
+from config.profiling import query_budget
+from .encoders import json_response
+from .engine import ContentEngine
+from .likes import LikeService
+from .serializers import (
+    LikeSyncRequestSerializer,
+    LikeSyncResponseSerializer,
+    FeedResponseSerializer,
+    CategoryContentResponseSerializer
+)
+
+_published_at_field = serializers.DateTimeField()
+
+
+def parse_bool_param(value):
+    """Parse an optional true/false query parameter."""
+    if value is None or value == '':
+        return None
+    lowered = value.lower()
+    if lowered in ('true', '1'):
+        return True
+    if lowered in ('false', '0'):
+        return False
+    raise ValueError(f"Invalid boolean value: {value}")
+
+
+@extend_schema(
+    request=LikeSyncRequestSerializer,
+    responses={200: LikeSyncResponseSerializer, 400: dict, 401: dict},
+    description=(
+        "Replay queued like/unlike operations from an offline client in one request. "
+        "Operations are collapsed to a final state per item (latest clientTimestamp wins). "
+        "Requires X-User-Id header."
+    )
+)
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def sync_likes(request):
+    """Apply a batch of like/unlike operations for posts and videos."""
+    user_id = get_user_id_from_header(request)
+
+    if not user_id:
+        return Response(
+            {'error': 'X-User-Id header is required'},
+            status=status.HTTP_401_UNAUTHORIZED
+        )
+
+    serializer = LikeSyncRequestSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(
+            {'error': 'Invalid request payload', 'details': serializer.errors},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    result = LikeService.sync(user_id, serializer.validated_data['operations'])
+    return Response(result)
+
+
+@query_budget(5)
+@extend_schema(
+    parameters=[
+        OpenApiParameter(name='sort', type=str, description='Sort by: TRENDING, NEWEST, MOST_VIEWED, MOST_LIKED'),
+        OpenApiParameter(name='page', type=int, description='Page number', default=1),
+        OpenApiParameter(name='pageSize', type=int, description='Page size', default=10),
+        OpenApiParameter(name='types', type=str, description='Comma-separated content types (post,video)'),
+        OpenApiParameter(name='q', type=str, description='Search query'),
+        OpenApiParameter(name='premium', type=bool, description='Filter by premium status'),
+        OpenApiParameter(name='tag', type=str, description='Filter by tag name(s), comma-separated'),
+        OpenApiParameter(name='tagMode', type=str, description='With several tags: all (default) or any'),
+    ],
+    responses={200: FeedResponseSerializer, 400: dict},
+    description="Interleaved posts and videos in one query, with unified sort keys"
+)
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def feed(request):
+    """Mixed feed of posts and videos."""
+    try:
+        types = request.query_params.get('types')
+        result = ContentEngine.get_feed(
+            sort=request.query_params.get('sort'),
+            page=int(request.query_params.get('page', 1)),
+            page_size=int(request.query_params.get('pageSize', 10)),
+            types=[t.strip().lower() for t in types.split(',')] if types else None,
+            q=request.query_params.get('q'),
+            premium=parse_bool_param(request.query_params.get('premium')),
+            tag_name=request.query_params.get('tag'),
+            tag_mode=request.query_params.get('tagMode'),
+            user_id=get_user_id_from_header(request)
+        )
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    return json_response(request, {**result, 'items': _format_items(result['items'])})
+
+
+def _format_items(items):
+    return [
+        {**item, 'publishedAt': _published_at_field.to_representation(item['publishedAt'])}
+        if item['publishedAt'] else item
+        for item in items
+    ]
+
+
+@query_budget(8)
+@extend_schema(
+    parameters=[
+        OpenApiParameter(name='sort', type=str, description='Sort by: newest (default) or popular'),
+        OpenApiParameter(name='page', type=int, description='Page number', default=1),
+        OpenApiParameter(name='pageSize', type=int, description='Page size', default=10),
+        OpenApiParameter(name='types', type=str, description='Comma-separated content types (post,video)'),
+    ],
+    responses={200: CategoryContentResponseSerializer, 400: dict, 404: dict},
+    description="Published posts and videos in a category, from a presorted in-memory membership index"
+)
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def category_content(request, slug: str):
+    """Browse one category's content."""
+    try:
+        types = request.query_params.get('types')
+        result = ContentEngine.get_category_content(
+            slug,
+            sort=request.query_params.get('sort'),
+            page=int(request.query_params.get('page', 1)),
+            page_size=int(request.query_params.get('pageSize', 10)),
+            types=[t.strip().lower() for t in types.split(',')] if types else None,
+            user_id=get_user_id_from_header(request)
+        )
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    if result is None:
+        return Response(
+            {'error': f'Category {slug} not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    return json_response(request, {**result, 'items': _format_items(result['items'])})
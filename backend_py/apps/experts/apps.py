@@ -5,3 +5,7 @@ class ExpertsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.experts'
     verbose_name = 'Experts'
+
+    def ready(self):
+        from . import signals
+        signals.connect()
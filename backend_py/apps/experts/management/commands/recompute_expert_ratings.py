@@ -0,0 +1,24 @@
+"""
+Rebuild expert rating histograms and cached Experts.rating / rating_count
+from ExpertReviews.
+Usage: python manage.py recompute_expert_ratings [--expert-id ID ...]
+"""
+
+from django.core.management.base import BaseCommand
+from apps.experts.search import ExpertSearchIndex
+from apps.experts.services import ExpertRatingService
+
+
+class Command(BaseCommand):
+    help = 'Recompute expert rating aggregates from reviews'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--expert-id', type=int, action='append', dest='expert_ids',
+            help='Only recompute this expert (repeatable)'
+        )
+
+    def handle(self, *args, **options):
+        count = ExpertRatingService.recompute(options['expert_ids'])
+        ExpertSearchIndex.invalidate()
+        self.stdout.write(self.style.SUCCESS(f'Recomputed rating aggregates for {count} experts.'))
@@ -65,3 +65,38 @@ class ExpertReview(models.Model):
 
     def __str__(self):
         return f"Review #{self.review_id} for Expert #{self.expert_id}"
+
+
+class ExpertRatingStats(models.Model):
+    """
+    Star histogram per expert, maintained from ExpertReviews.
+
+    Experts.rating and Experts.rating_count are derived from these counts
+    (see ExpertRatingService). Table created by sql/001_expert_rating_aggregates.sql.
+    """
+
+    expert = models.OneToOneField(
+        Expert,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        db_column='expert_id',
+        related_name='rating_stats',
+    )
+    stars_1 = models.IntegerField(default=0, db_column='stars_1')
+    stars_2 = models.IntegerField(default=0, db_column='stars_2')
+    stars_3 = models.IntegerField(default=0, db_column='stars_3')
+    stars_4 = models.IntegerField(default=0, db_column='stars_4')
+    stars_5 = models.IntegerField(default=0, db_column='stars_5')
+    updated_at = models.DateTimeField(null=True, blank=True, db_column='updated_at')
+
+    class Meta:
+        db_table = 'ExpertRatingStats'
+        managed = False
+
+    def __str__(self):
+        return f"Rating stats for Expert #{self.expert_id}"
+
+    @property
+    def histogram(self):
+        """{1: count, ..., 5: count}"""
+        return {star: getattr(self, f'stars_{star}') for star in range(1, 6)}
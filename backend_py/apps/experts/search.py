@@ -0,0 +1,106 @@
+"""
+In-memory prefix index for expert typeahead.
+
+Every token of an expert's name, title and specialization is folded
+(lowercased, Vietnamese diacritics stripped, đ -> d) and kept in one sorted
+array, so a prefix lookup is two bisects instead of a LIKE '%q%' scan per
+keystroke. Multi-word queries must prefix-match one token each; matches are
+ranked like the expert directory (rating, consultations, id).
+
+The index is rebuilt lazily after ``invalidate()`` (called from
+apps.experts.signals on expert and review changes) or once it is older than
+EXPERT_SUGGEST_REBUILD_SECONDS, which also picks up out-of-band SQL edits.
+The invalidation version lives in the shared cache (config.invalidation), so
+an edit handled by one worker reaches the others within about a second.
+"""
+
+import logging
+import re
+import time
+import unicodedata
+from bisect import bisect_left
+from typing import Any, Dict, List
+
+from config.invalidation import VersionedIndex
+
+from .models import Expert
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r'\w+')
+
+
+def fold(text: str) -> str:
+    """Lowercase and strip diacritics ('Đặng Thị' -> 'dang thi')."""
+    text = text.lower().replace('đ', 'd')
+    return ''.join(c for c in unicodedata.normalize('NFD', text) if not unicodedata.combining(c))
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(fold(text)) if text else []
+
+
+class ExpertSearchIndex(VersionedIndex):
+    """Sorted token array over experts, rebuilt on change."""
+
+    VERSION_KEY = 'experts:search:version'
+    MAX_AGE_SETTING = 'EXPERT_SUGGEST_REBUILD_SECONDS'
+    DEFAULT_MAX_AGE = 600
+
+    # (sorted tokens, owning expert_id per token, {expert_id: item}, {expert_id: rank})
+    _index = ([], [], {}, {})
+
+    @classmethod
+    def build(cls) -> None:
+        """Load experts and swap in a freshly built index."""
+        started = time.perf_counter()
+        pairs = []
+        experts = {}
+        rows = Expert.objects.order_by('-rating', '-consultation_count', '-expert_id').values_list(
+            'expert_id', 'full_name', 'title', 'specialization', 'avatar_url', 'rating', 'is_verified'
+        )
+        rank = {}
+        for position, row in enumerate(rows):
+            expert_id, full_name, title, specialization, avatar_url, rating, is_verified = row
+            rank[expert_id] = position
+            experts[expert_id] = {
+                'id': expert_id,
+                'name': full_name,
+                'title': title,
+                'avatarUrl': avatar_url,
+                'rating': str(rating if rating is not None else '0.0'),
+                'isVerified': bool(is_verified),
+            }
+            for token in set(tokenize(full_name) + tokenize(title) + tokenize(specialization)):
+                pairs.append((token, expert_id))
+        pairs.sort()
+
+        cls._index = ([token for token, _ in pairs], [expert_id for _, expert_id in pairs], experts, rank)
+        logger.info(
+            f"Built expert search index: {len(experts)} experts, {len(pairs)} tokens "
+            f"in {(time.perf_counter() - started) * 1000:.1f} ms"
+        )
+
+    @classmethod
+    def _prefix_owners(cls, tokens: List[str], owners: List[int], prefix: str) -> set:
+        start = bisect_left(tokens, prefix)
+        end = bisect_left(tokens, prefix + '\U0010ffff', start)
+        return set(owners[start:end])
+
+    @classmethod
+    def suggest(cls, q: str, limit: int = 8) -> List[Dict[str, Any]]:
+        """Top ``limit`` experts whose tokens start with every word of ``q``."""
+        words = tokenize(q or '')
+        if not words:
+            return []
+        cls.ensure_fresh()
+
+        tokens, owners, experts, rank = cls._index
+        matches = None
+        for word in sorted(set(words), key=len, reverse=True):
+            found = cls._prefix_owners(tokens, owners, word)
+            matches = found if matches is None else matches & found
+            if not matches:
+                return []
+        best = sorted(matches, key=rank.__getitem__)[:limit]
+        return [experts[expert_id] for expert_id in best]
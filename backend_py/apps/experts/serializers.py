@@ -39,6 +39,23 @@ class ExpertListSerializer(serializers.ModelSerializer):
         ]
 
 
+class ExpertSuggestionSerializer(serializers.Serializer):
+    """Typeahead suggestion (served from the in-memory index)."""
+
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    title = serializers.CharField(allow_null=True)
+    avatarUrl = serializers.CharField(allow_null=True)
+    rating = serializers.DecimalField(max_digits=3, decimal_places=1)
+    isVerified = serializers.BooleanField()
+
+
+class ExpertSuggestResponseSerializer(serializers.Serializer):
+    """Typeahead response."""
+
+    items = ExpertSuggestionSerializer(many=True)
+
+
 # Backward-compatible serializer used by posts, videos, faq serializers.
 # Returns the OLD field names (expertId, fullName, specialization).
 class ExpertSerializer(serializers.ModelSerializer):
@@ -2,11 +2,23 @@
 Expert service - Business logic for expert operations.
 """
 
+import base64
+import binascii
+import json
 import logging
-from typing import Optional
-from django.db import connection
+from datetime import datetime
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, Iterable, Optional
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction, IntegrityError
+from django.db.models import Count, F, Q
 
-from .models import Expert, ExpertReview
+from apps.content.engine import clamp_paging
+from apps.content.totals import CountCache
+from config.invalidation import SharedVersion
+from .models import Expert, ExpertReview, ExpertRatingStats
+from .search import ExpertSearchIndex
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +26,17 @@ logger = logging.getLogger(__name__)
 class ExpertService:
     """Service for expert-related operations."""
 
+    # Matches IX_Experts_Ranking (sql/001_expert_rating_aggregates.sql).
+    RANKING = ('-rating', '-consultation_count', '-expert_id')
+    # expert_id -> SharedVersion of the cached first review page
+    _review_versions = {}
+    LIST_FIELDS = (
+        'expert_id', 'full_name', 'title', 'avatar_url', 'rating', 'rating_count',
+        'is_verified', 'experience_years', 'price_per_session', 'currency',
+        'consultation_count',
+    )
+    SUGGEST_MAX_LIMIT = 20
+
     @classmethod
     def get_experts(
         cls,
@@ -22,12 +45,15 @@ class ExpertService:
         page_size: int = 10,
     ):
         """Get paginated list of experts with optional search."""
-        queryset = Expert.objects.all().order_by('-rating', '-consultation_count')
+        page, page_size = clamp_paging(page, page_size)
+        queryset = Expert.objects.only(*cls.LIST_FIELDS).order_by(*cls.RANKING)
 
         if q:
             queryset = queryset.filter(full_name__icontains=q)
 
-        total = queryset.count()
+        total, total_is_estimate = CountCache.get_total(
+            'expert', {'q': q}, queryset, table=Expert._meta.db_table
+        )
         offset = (page - 1) * page_size
         items = list(queryset[offset:offset + page_size])
 
@@ -35,9 +61,15 @@ class ExpertService:
             'page': page,
             'pageSize': page_size,
             'total': total,
+            'totalIsEstimate': total_is_estimate,
             'items': items,
         }
 
+    @classmethod
+    def suggest_experts(cls, q: Optional[str], limit: int = 8):
+        """Typeahead suggestions from the in-memory prefix index."""
+        return ExpertSearchIndex.suggest(q or '', max(1, min(cls.SUGGEST_MAX_LIMIT, limit)))
+
     @classmethod
     def get_expert_detail(cls, expert_id: int):
         """Get single expert by ID."""
@@ -46,27 +78,234 @@ class ExpertService:
         except Expert.DoesNotExist:
             return None
 
+    # Newest first; review_id breaks ties so the keyset cursor is exact.
+    # Matches IX_ExpertReviews_Keyset (sql/002_expert_review_keyset.sql).
+    REVIEW_ORDER = (F('created_at').desc(nulls_last=True), F('review_id').desc())
+
+    @staticmethod
+    def encode_review_cursor(review: ExpertReview) -> str:
+        """Opaque cursor pointing just past ``review``."""
+        created_at = review.created_at.isoformat() if review.created_at else None
+        raw = json.dumps([created_at, review.review_id], separators=(',', ':'))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+    @staticmethod
+    def decode_review_cursor(cursor: str):
+        """Return (created_at or None, review_id); raises ValueError if malformed."""
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            created_at, review_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            return (datetime.fromisoformat(created_at) if created_at else None), int(review_id)
+        except (TypeError, ValueError, binascii.Error):
+            raise ValueError("Invalid cursor")
+
+    @staticmethod
+    def _after_cursor(created_at, review_id: int) -> Q:
+        if created_at is None:
+            return Q(created_at__isnull=True, review_id__lt=review_id)
+        return (
+            Q(created_at__lt=created_at)
+            | Q(created_at=created_at, review_id__lt=review_id)
+            | Q(created_at__isnull=True)
+        )
+
+    @classmethod
+    def _reviews_version(cls, expert_id: int) -> SharedVersion:
+        version = cls._review_versions.get(expert_id)
+        if version is None:
+            version = cls._review_versions.setdefault(
+                expert_id, SharedVersion(f'experts:reviews:{expert_id}:version')
+            )
+        return version
+
+    @classmethod
+    def invalidate_reviews(cls, expert_id: int) -> None:
+        """Drop the cached first review page and summary of an expert, in every worker."""
+        cls._reviews_version(expert_id).bump()
+
     @classmethod
     def get_expert_reviews(
         cls,
         expert_id: int,
         page: int = 1,
         page_size: int = 10,
+        cursor: Optional[str] = None,
     ):
-        """Get paginated reviews for an expert."""
-        queryset = (
-            ExpertReview.objects
-            .filter(expert_id=expert_id)
-            .order_by('-created_at')
+        """
+        Get a page of reviews for an expert, newest first.
+
+        Pass ``cursor`` (a previous response's nextCursor) for keyset paging
+        that stays fast on deep pages; ``page`` still works for OFFSET
+        paging. The first page also carries the expert's rating summary and
+        is cached with it until a review of that expert is written.
+        """
+        page, page_size = clamp_paging(page, page_size)
+        first_page = cursor is None and page == 1
+        if first_page:
+            cache_key = f'experts:reviews:{expert_id}:{cls._reviews_version(expert_id).get()}:{page_size}'
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        queryset = ExpertReview.objects.filter(expert_id=expert_id).order_by(*cls.REVIEW_ORDER)
+        total, total_is_estimate = CountCache.get_total(
+            'expert_review', {'expert_id': expert_id}, queryset
         )
 
-        total = queryset.count()
-        offset = (page - 1) * page_size
-        items = list(queryset[offset:offset + page_size])
+        if cursor is not None:
+            page = None
+            rows = list(queryset.filter(cls._after_cursor(*cls.decode_review_cursor(cursor)))[:page_size + 1])
+        else:
+            offset = (page - 1) * page_size
+            rows = list(queryset[offset:offset + page_size + 1])
+        items = rows[:page_size]
 
-        return {
+        result = {
             'page': page,
             'pageSize': page_size,
             'total': total,
+            'totalIsEstimate': total_is_estimate,
+            'nextCursor': cls.encode_review_cursor(items[-1]) if len(rows) > page_size else None,
             'items': items,
         }
+        if first_page:
+            rating_stats = Expert.objects.filter(expert_id=expert_id).values_list('rating', 'rating_count').first()
+            if rating_stats is not None:
+                rating, rating_count = rating_stats
+                result['ratingSummary'] = {
+                    'rating': str(rating),
+                    'ratingCount': rating_count,
+                    'histogram': ExpertRatingService.get_histogram(expert_id),
+                }
+            cache.set(cache_key, result, int(getattr(settings, 'EXPERT_REVIEWS_CACHE_SECONDS', 300)))
+        return result
+
+
+class ExpertRatingService:
+    """
+    Keep Experts.rating / rating_count and the star histogram in step with reviews.
+
+    Each review insert, delete or rating change adjusts the expert's
+    ExpertRatingStats row under a row lock and rewrites the two cached
+    columns on Experts from it, so list_experts can rank on plain columns.
+    """
+
+    CHUNK_SIZE = 500
+
+    @staticmethod
+    def summarize(histogram: Dict[int, int]):
+        """(rating, rating_count) for a {star: count} histogram."""
+        count = sum(histogram.values())
+        if not count:
+            return Decimal('0.0'), 0
+        average = Decimal(sum(star * n for star, n in histogram.items())) / count
+        return average.quantize(Decimal('0.1'), rounding=ROUND_HALF_UP), count
+
+    @classmethod
+    def apply_change(cls, expert_id: int, added: Optional[int] = None, removed: Optional[int] = None) -> None:
+        """Count one review with rating ``added`` in and/or one with ``removed`` out."""
+        with transaction.atomic():
+            stats, rebuilt = cls._locked_stats(expert_id)
+            if stats is None:
+                return
+            if not rebuilt:
+                if removed:
+                    field = f'stars_{removed}'
+                    setattr(stats, field, max(0, getattr(stats, field) - 1))
+                if added:
+                    field = f'stars_{added}'
+                    setattr(stats, field, getattr(stats, field) + 1)
+                stats.updated_at = datetime.utcnow()
+                stats.save()
+            cls._write_expert(expert_id, stats.histogram)
+
+    @classmethod
+    def _locked_stats(cls, expert_id: int):
+        """
+        Lock and return (stats, rebuilt). A missing row is rebuilt from the
+        reviews table, which already reflects the change being applied; so
+        is a row another writer created concurrently.
+        """
+        queryset = ExpertRatingStats.objects.select_for_update().filter(expert_id=expert_id)
+        stats = queryset.first()
+        if stats is not None:
+            return stats, False
+        if not Expert.objects.filter(expert_id=expert_id).exists():
+            return None, False
+
+        histogram = cls._histograms([expert_id]).get(expert_id, {})
+        try:
+            with transaction.atomic():
+                stats = ExpertRatingStats.objects.create(
+                    expert_id=expert_id,
+                    updated_at=datetime.utcnow(),
+                    **{f'stars_{star}': n for star, n in histogram.items()}
+                )
+        except IntegrityError:
+            # Another writer created it first. Its rebuild may or may not
+            # have counted our review (that depends on commit order), so
+            # recount from the reviews table while holding the row lock.
+            stats = queryset.get()
+            histogram = cls._histograms([expert_id]).get(expert_id, {})
+            for star in range(1, 6):
+                setattr(stats, f'stars_{star}', histogram.get(star, 0))
+            stats.updated_at = datetime.utcnow()
+            stats.save()
+        return stats, True
+
+    @staticmethod
+    def _histograms(expert_ids: Optional[Iterable[int]] = None) -> Dict[int, Dict[int, int]]:
+        queryset = ExpertReview.objects.all()
+        if expert_ids is not None:
+            queryset = queryset.filter(expert_id__in=list(expert_ids))
+        histograms = {}
+        for expert_id, rating, n in (
+            queryset.values('expert_id', 'rating').annotate(n=Count('review_id'))
+            .values_list('expert_id', 'rating', 'n')
+        ):
+            if 1 <= rating <= 5:
+                histograms.setdefault(expert_id, {})[rating] = n
+        return histograms
+
+    @classmethod
+    def _write_expert(cls, expert_id: int, histogram: Dict[int, int]) -> None:
+        rating, rating_count = cls.summarize(histogram)
+        Expert.objects.filter(expert_id=expert_id).update(rating=rating, rating_count=rating_count)
+
+    @classmethod
+    def get_histogram(cls, expert_id: int) -> Dict[int, int]:
+        stats = ExpertRatingStats.objects.filter(expert_id=expert_id).first()
+        if stats is None:
+            histogram = cls._histograms([expert_id]).get(expert_id, {})
+            return {star: histogram.get(star, 0) for star in range(1, 6)}
+        return stats.histogram
+
+    @classmethod
+    def recompute(cls, expert_ids: Optional[Iterable[int]] = None) -> int:
+        """
+        Rebuild histograms and cached ratings from ExpertReviews.
+
+        Covers every expert (or just ``expert_ids``); experts without reviews
+        end up at rating 0 / rating_count 0. Returns the number of experts.
+        """
+        ids = list(expert_ids) if expert_ids is not None else list(
+            Expert.objects.values_list('expert_id', flat=True)
+        )
+        now = datetime.utcnow()
+        for start in range(0, len(ids), cls.CHUNK_SIZE):
+            chunk = ids[start:start + cls.CHUNK_SIZE]
+            with transaction.atomic():
+                histograms = cls._histograms(chunk)
+                ExpertRatingStats.objects.filter(expert_id__in=chunk).delete()
+                ExpertRatingStats.objects.bulk_create([
+                    ExpertRatingStats(
+                        expert_id=expert_id,
+                        updated_at=now,
+                        **{f'stars_{star}': n for star, n in histograms.get(expert_id, {}).items()}
+                    )
+                    for expert_id in chunk
+                ])
+                for expert_id in chunk:
+                    cls._write_expert(expert_id, histograms.get(expert_id, {}))
+        logger.info(f"Recomputed rating aggregates for {len(ids)} experts")
+        return len(ids)
@@ -0,0 +1,65 @@
+"""
+Keep expert rating aggregates, cached review pages and the typeahead index
+in step with writes.
+
+Covers reviews created through the API or the admin, rating edits and
+deletes, and expert edits. Bulk SQL outside the ORM is not seen; run
+``manage.py recompute_expert_ratings`` after such imports.
+
+Aggregates are updated inside the write's transaction; cache and index
+invalidations are deferred with transaction.on_commit, so no worker
+re-reads rows that are not committed yet.
+"""
+
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+
+from .models import Expert, ExpertReview
+from .search import ExpertSearchIndex
+from .services import ExpertRatingService, ExpertService
+
+
+def remember_previous_rating(sender, instance, **kwargs):
+    instance._previous = None
+    if instance.pk:
+        instance._previous = (
+            ExpertReview.objects.filter(pk=instance.pk).values_list('expert_id', 'rating').first()
+        )
+
+
+def review_saved(sender, instance, created, using=None, **kwargs):
+    previous = getattr(instance, '_previous', None)
+    expert_ids = {instance.expert_id}
+    if created or previous is None:
+        ExpertRatingService.apply_change(instance.expert_id, added=instance.rating)
+    elif previous != (instance.expert_id, instance.rating):
+        old_expert_id, old_rating = previous
+        if old_expert_id == instance.expert_id:
+            ExpertRatingService.apply_change(instance.expert_id, added=instance.rating, removed=old_rating)
+        else:
+            ExpertRatingService.apply_change(old_expert_id, removed=old_rating)
+            ExpertRatingService.apply_change(instance.expert_id, added=instance.rating)
+            expert_ids.add(old_expert_id)
+    for expert_id in expert_ids:
+        transaction.on_commit(partial(ExpertService.invalidate_reviews, expert_id), using=using)
+    transaction.on_commit(ExpertSearchIndex.invalidate, using=using)
+
+
+def review_deleted(sender, instance, using=None, **kwargs):
+    ExpertRatingService.apply_change(instance.expert_id, removed=instance.rating)
+    transaction.on_commit(partial(ExpertService.invalidate_reviews, instance.expert_id), using=using)
+    transaction.on_commit(ExpertSearchIndex.invalidate, using=using)
+
+
+def expert_changed(sender, using=None, **kwargs):
+    transaction.on_commit(ExpertSearchIndex.invalidate, using=using)
+
+
+def connect():
+    pre_save.connect(remember_previous_rating, sender=ExpertReview, dispatch_uid='expert-rating-pre-save')
+    post_save.connect(review_saved, sender=ExpertReview, dispatch_uid='expert-rating-save')
+    post_delete.connect(review_deleted, sender=ExpertReview, dispatch_uid='expert-rating-delete')
+    post_save.connect(expert_changed, sender=Expert, dispatch_uid='expert-search-save')
+    post_delete.connect(expert_changed, sender=Expert, dispatch_uid='expert-search-delete')
@@ -5,6 +5,7 @@ from . import views
 
 urlpatterns = [
     path('', views.list_experts, name='experts-list'),
+    path('suggest', views.suggest_experts, name='experts-suggest'),
     path('<int:expert_id>/', views.get_expert_detail, name='experts-detail'),
     path('<int:expert_id>/reviews/', views.get_expert_reviews, name='experts-reviews'),
 ]
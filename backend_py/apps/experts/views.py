@@ -8,10 +8,17 @@ from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 
+from config.profiling import query_budget
 from .services import ExpertService
-from .serializers import ExpertListSerializer, ExpertDetailSerializer, ExpertReviewSerializer
+from .serializers import (
+    ExpertListSerializer,
+    ExpertDetailSerializer,
+    ExpertReviewSerializer,
+    ExpertSuggestResponseSerializer,
+)
 
 
+@query_budget(3)
 @extend_schema(
     parameters=[
         OpenApiParameter(name='q', type=str, description='Search by name'),
@@ -33,16 +40,43 @@ def list_experts(request):
         )
 
         serializer = ExpertListSerializer(result['items'], many=True)
-        return Response({
+        response_data = {
             'page': result['page'],
             'pageSize': result['pageSize'],
             'total': result['total'],
             'items': serializer.data,
-        })
+        }
+        if result['totalIsEstimate']:
+            response_data['totalIsEstimate'] = True
+        return Response(response_data)
     except ValueError as e:
         return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
+@query_budget(3)
+@extend_schema(
+    parameters=[
+        OpenApiParameter(name='q', type=str, description='Name, title or specialization prefix'),
+        OpenApiParameter(name='limit', type=int, description='Max suggestions (1-20)', default=8),
+    ],
+    responses={200: ExpertSuggestResponseSerializer, 400: dict},
+    description="Typeahead suggestions for the expert search box, ranked by rating",
+)
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def suggest_experts(request):
+    """Expert typeahead from the in-memory prefix index."""
+    try:
+        items = ExpertService.suggest_experts(
+            q=request.query_params.get('q'),
+            limit=int(request.query_params.get('limit', 8)),
+        )
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({'items': items})
+
+
+@query_budget(2)
 @extend_schema(
     responses={200: ExpertDetailSerializer, 404: dict},
     description="Get expert detail by ID",
@@ -63,13 +97,18 @@ def get_expert_detail(request, expert_id: int):
     return Response(serializer.data)
 
 
+@query_budget(6)
 @extend_schema(
     parameters=[
         OpenApiParameter(name='page', type=int, description='Page number', default=1),
         OpenApiParameter(name='pageSize', type=int, description='Page size', default=10),
+        OpenApiParameter(name='cursor', type=str, description='nextCursor from the previous page (keyset paging)'),
     ],
-    responses={200: dict},
-    description="Get paginated reviews for an expert",
+    responses={200: dict, 400: dict},
+    description=(
+        "Get reviews for an expert, newest first. Follow nextCursor for deep pages; "
+        "the first page also includes ratingSummary (rating, count, 1-5 star histogram)."
+    ),
 )
 @api_view(['GET'])
 @permission_classes([AllowAny])
@@ -80,14 +119,19 @@ def get_expert_reviews(request, expert_id: int):
             expert_id=expert_id,
             page=int(request.query_params.get('page', 1)),
             page_size=int(request.query_params.get('pageSize', 10)),
+            cursor=request.query_params.get('cursor') or None,
         )
 
         serializer = ExpertReviewSerializer(result['items'], many=True)
-        return Response({
+        response_data = {
             'page': result['page'],
             'pageSize': result['pageSize'],
             'total': result['total'],
+            'nextCursor': result['nextCursor'],
             'items': serializer.data,
-        })
+        }
+        if 'ratingSummary' in result:
+            response_data['ratingSummary'] = result['ratingSummary']
+        return Response(response_data)
     except ValueError as e:
         return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -42,6 +42,9 @@ class FAQItemSerializer(serializers.Serializer):
 
     def get_relatedVideos(self, obj):
         """Find videos that share tags with this FAQ."""
+        related = self.context.get('related_videos')
+        if related is not None:
+            return FAQRelatedVideoSerializer(related.get(obj.faq_id, []), many=True).data
         tag_ids = obj.tags.values_list('tag_id', flat=True)
         if not tag_ids:
             return []
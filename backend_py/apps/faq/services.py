@@ -0,0 +1,52 @@
+"""
+FAQ service - related videos for FAQ lists.
+"""
+
+from typing import Dict, Iterable, List
+
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from apps.videos.models import Video, VideoTag
+
+
+class FAQService:
+    """Service for FAQ-related operations."""
+
+    RELATED_VIDEOS = 3
+
+    @classmethod
+    def related_videos(cls, faqs: Iterable) -> Dict[int, List[Video]]:
+        """
+        {faq_id: up to RELATED_VIDEOS videos sharing a tag with it}, lowest
+        video id first, in two queries for the whole list.
+
+        ``faqs`` must have their tags prefetched. Any video among an FAQ's
+        first few is among the first few of one of its tags, so only that
+        many video ids per tag are read (a ROW_NUMBER window per tag).
+        """
+        tags_by_faq = {faq.faq_id: {tag.tag_id for tag in faq.tags.all()} for faq in faqs}
+        tag_ids = set().union(*tags_by_faq.values())
+        if not tag_ids:
+            return {faq_id: [] for faq_id in tags_by_faq}
+
+        ids_by_tag = {}
+        for tag_id, video_id in (
+            VideoTag.objects.filter(tag_id__in=tag_ids)
+            .annotate(position=Window(RowNumber(), partition_by=F('tag_id'), order_by=F('video_id').asc()))
+            .filter(position__lte=cls.RELATED_VIDEOS)
+            .values_list('tag_id', 'video_id')
+        ):
+            ids_by_tag.setdefault(tag_id, set()).add(video_id)
+
+        related_ids = {
+            faq_id: sorted(set().union(*(ids_by_tag.get(tag_id, ()) for tag_id in faq_tags)))[:cls.RELATED_VIDEOS]
+            for faq_id, faq_tags in tags_by_faq.items()
+        }
+        videos = Video.objects.only('video_id', 'title', 'thumbnail_url').in_bulk(
+            set().union(*related_ids.values())
+        )
+        return {
+            faq_id: [videos[video_id] for video_id in video_ids if video_id in videos]
+            for faq_id, video_ids in related_ids.items()
+        }
@@ -6,8 +6,10 @@ from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 
+from config.profiling import query_budget
 from .models import FAQ
 from .serializers import FAQItemSerializer, FAQListResponseSerializer
+from .services import FAQService
 
 
 CATEGORY_MAP = {
@@ -17,6 +19,7 @@ CATEGORY_MAP = {
 }
 
 
+@query_budget(4)
 @extend_schema(
     parameters=[
         OpenApiParameter(
@@ -41,9 +44,11 @@ def list_faqs(request):
     if category and category in CATEGORY_MAP:
         qs = qs.filter(category=category)
 
-    qs = qs.order_by('faq_id')
+    faqs = list(qs.order_by('faq_id'))
 
-    serializer = FAQItemSerializer(qs, many=True)
+    serializer = FAQItemSerializer(
+        faqs, many=True, context={'related_videos': FAQService.related_videos(faqs)}
+    )
     return Response({
         'category': category or 'all',
         'items': serializer.data,
@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('otp', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='otprequest',
+            name='OTPRequests_user_id_33f01c_idx',
+        ),
+        migrations.AddIndex(
+            model_name='otprequest',
+            index=models.Index(fields=['user_id', 'verified', '-created_at'], name='OTPRequests_user_latest_idx'),
+        ),
+    ]
@@ -47,7 +47,8 @@ class OTPRequest(models.Model):
         db_table = 'OTPRequests'
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['user_id', 'verified']),
+            # Latest pending OTP per user: seek, no sort
+            models.Index(fields=['user_id', 'verified', '-created_at'], name='OTPRequests_user_latest_idx'),
         ]
     
     def __str__(self):
@@ -2,15 +2,36 @@
 OTP Service - Business logic for OTP generation, hashing, verification, and delivery.
 """
 
+import functools
 import hashlib
 import secrets
 import logging
+import time
 from typing import Tuple, Optional
 from django.utils import timezone
+
+from metrics import histogram
 from .models import OTPRequest
 
 logger = logging.getLogger(__name__)
 
+OTP_SEND_SECONDS = histogram('otp_send_seconds', 'OTP delivery latency', ('channel', 'result'))
+
+
+def timed_send(channel: str):
+    """Observe a sender's latency, labelled ok/failed from its (success, message) result."""
+    def decorator(send):
+        @functools.wraps(send)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            success, message = send(*args, **kwargs)
+            OTP_SEND_SECONDS.observe(
+                time.perf_counter() - started, channel=channel, result='ok' if success else 'failed'
+            )
+            return success, message
+        return wrapper
+    return decorator
+
 
 class OTPService:
     """Service for OTP operations."""
@@ -150,6 +171,7 @@ class EmailOTPSender:
     """
     
     @staticmethod
+    @timed_send('email')
     def send(email: str, otp: str, username: str = '') -> Tuple[bool, str]:
         """
         Send OTP to email address via Brevo SMTP.
@@ -275,6 +297,7 @@ class SMSOTPSender:
     """
     
     @staticmethod
+    @timed_send('sms')
     def send(phone: str, otp: str) -> Tuple[bool, str]:
         """
         Send OTP to phone number.
@@ -1,5 +1,7 @@
 """Post serializers for API endpoints."""
 
+from operator import attrgetter
+
 from rest_framework import serializers
 from apps.experts.serializers import ExpertSerializer
 from .models import Post, PostStats
@@ -22,6 +24,12 @@ class PostListItemSerializer(serializers.Serializer):
     expert = ExpertSerializer(allow_null=True)
     viewerState = serializers.SerializerMethodField()
 
+    # Used by apps.content.encoders: list rows from ContentEngine always carry stats.
+    encoder_overrides = {
+        'viewCount': attrgetter('stats.view_count'),
+        'likeCount': attrgetter('stats.like_count'),
+    }
+
     def get_viewCount(self, obj):
         try:
             return obj.stats.view_count if hasattr(obj, 'stats') and obj.stats else 0
@@ -87,6 +95,11 @@ class PostListResponseSerializer(serializers.Serializer):
     items = PostListItemSerializer(many=True)
 
 
+class LikeToggleRequestSerializer(serializers.Serializer):
+    """Optional like toggle body. Omit ``liked`` to flip the current state."""
+    liked = serializers.BooleanField(required=False, allow_null=True, default=None)
+
+
 class LikeToggleResponseSerializer(serializers.Serializer):
     """Like toggle response."""
     liked = serializers.BooleanField()
@@ -5,3 +5,7 @@ class TagsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.tags'
     verbose_name = 'Tags & Categories'
+
+    def ready(self):
+        from . import signals
+        signals.connect()
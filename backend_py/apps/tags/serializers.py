@@ -20,3 +20,20 @@ class CategorySerializer(serializers.ModelSerializer):
     class Meta:
         model = ContentCategory
         fields = ['id', 'name', 'slug']
+
+
+class TagCloudItemSerializer(serializers.Serializer):
+    """Tag with content counts and a 1-5 display weight."""
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    slug = serializers.CharField()
+    postCount = serializers.IntegerField()
+    videoCount = serializers.IntegerField()
+    faqCount = serializers.IntegerField()
+    total = serializers.IntegerField()
+    weight = serializers.IntegerField()
+
+
+class TagCloudResponseSerializer(serializers.Serializer):
+    """Tag cloud response."""
+    items = TagCloudItemSerializer(many=True)
@@ -0,0 +1,99 @@
+"""
+Tag catalog service - in-memory snapshot of tags with content counts.
+
+The snapshot holds every tag (in the database's name order) with the number
+of published posts, published videos and FAQs carrying it, built with one
+grouped query per junction table. Its version is a hash of the content, so
+every worker process computes the same ETag for the same catalog and
+clients can revalidate with If-None-Match.
+
+The snapshot is rebuilt lazily after ``invalidate()`` (called from
+apps.tags.signals when tags, tag links or content change) in any worker,
+or once it is older than TAG_CATALOG_REFRESH_SECONDS (config.invalidation).
+"""
+
+import hashlib
+import json
+import logging
+import math
+import time
+from typing import Any, Dict, List, Tuple
+
+from django.db.models import Count
+
+from apps.faq.models import FAQTag
+from apps.posts.models import PostTag
+from apps.videos.models import VideoTag
+from config.invalidation import VersionedIndex
+from .models import Tag
+
+logger = logging.getLogger(__name__)
+
+
+class TagCatalogService(VersionedIndex):
+    """Versioned tag snapshot with post/video/FAQ counts."""
+
+    VERSION_KEY = 'tags:catalog:version'
+    MAX_AGE_SETTING = 'TAG_CATALOG_REFRESH_SECONDS'
+    CLOUD_WEIGHTS = 5
+
+    # (etag, [tag dicts])
+    _snapshot: Tuple[str, List[Dict[str, Any]]] = ('', [])
+
+    @classmethod
+    def snapshot(cls) -> Tuple[str, List[Dict[str, Any]]]:
+        """Return (etag, tags), rebuilding first if the catalog changed."""
+        cls.ensure_fresh()
+        return cls._snapshot
+
+    @classmethod
+    def build(cls) -> None:
+        started = time.perf_counter()
+        counts = {
+            'postCount': cls._counts(PostTag.objects.filter(post__status='published')),
+            'videoCount': cls._counts(VideoTag.objects.filter(video__status='published')),
+            'faqCount': cls._counts(FAQTag.objects.all()),
+        }
+        tags = []
+        for tag_id, name, slug in Tag.objects.order_by('name').values_list('tag_id', 'name', 'slug'):
+            item = {'id': tag_id, 'name': name, 'slug': slug}
+            for field, by_tag in counts.items():
+                item[field] = by_tag.get(tag_id, 0)
+            tags.append(item)
+
+        digest = hashlib.md5(json.dumps(tags, separators=(',', ':')).encode()).hexdigest()
+        cls._snapshot = (f'"tags-{digest}"', tags)
+        logger.info(f"Built tag catalog: {len(tags)} tags in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    @staticmethod
+    def _counts(queryset) -> Dict[int, int]:
+        return dict(queryset.values('tag_id').annotate(n=Count('tag_id')).values_list('tag_id', 'n'))
+
+    @classmethod
+    def get_tags(cls) -> Tuple[str, List[Dict[str, Any]]]:
+        """(etag, [{id, name, slug}]) in name order."""
+        etag, tags = cls.snapshot()
+        return etag, [{'id': t['id'], 'name': t['name'], 'slug': t['slug']} for t in tags]
+
+    @classmethod
+    def get_cloud(cls, limit: int = 100) -> Tuple[str, List[Dict[str, Any]]]:
+        """
+        (etag, tags with any content), most used first, each with a total and
+        a 1..CLOUD_WEIGHTS weight on a log scale for font sizing.
+        """
+        etag, tags = cls.snapshot()
+        used = []
+        for tag in tags:
+            total = tag['postCount'] + tag['videoCount'] + tag['faqCount']
+            if total:
+                used.append({**tag, 'total': total})
+        used.sort(key=lambda t: (-t['total'], t['name']))
+        used = used[:limit]
+
+        if used:
+            low, high = math.log(used[-1]['total']), math.log(used[0]['total'])
+            span = high - low
+            for tag in used:
+                ratio = (math.log(tag['total']) - low) / span if span else 1.0
+                tag['weight'] = 1 + round(ratio * (cls.CLOUD_WEIGHTS - 1))
+        return etag, used
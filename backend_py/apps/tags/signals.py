@@ -0,0 +1,27 @@
+"""
+Invalidate the tag catalog snapshot (apps.tags.services) when tags, tag
+links or tagged content change. The version is bumped on commit, so no
+worker rebuilds (and hands out an ETag for) uncommitted rows.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+
+from apps.faq.models import FAQ, FAQTag
+from apps.posts.models import Post, PostTag
+from apps.videos.models import Video, VideoTag
+
+from .models import Tag
+from .services import TagCatalogService
+
+SENDERS = (Tag, PostTag, VideoTag, FAQTag, Post, Video, FAQ)
+
+
+def invalidate_catalog(sender, using=None, **kwargs):
+    transaction.on_commit(TagCatalogService.invalidate, using=using)
+
+
+def connect():
+    for model in SENDERS:
+        post_save.connect(invalidate_catalog, sender=model, dispatch_uid=f'tag-catalog-save-{model.__name__}')
+        post_delete.connect(invalidate_catalog, sender=model, dispatch_uid=f'tag-catalog-delete-{model.__name__}')
@@ -5,4 +5,5 @@ from . import views
 
 urlpatterns = [
     path('', views.list_tags, name='tags-list'),
+    path('cloud', views.tag_cloud, name='tags-cloud'),
 ]
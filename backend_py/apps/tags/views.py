@@ -4,20 +4,56 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.utils import extend_schema, OpenApiParameter
 
-from .models import Tag
-from .serializers import TagSerializer
+from apps.content.versions import not_modified
+from config.profiling import query_budget
+from .serializers import TagSerializer, TagCloudResponseSerializer
+from .services import TagCatalogService
 
 
+def conditional_response(request, etag: str, data):
+    """304 if the client's If-None-Match already has ``etag``, else the data."""
+    # Weak comparison: compression sends the ETag back as W/"..." (compression.django).
+    if not_modified(request, etag):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = Response(data)
+    response['ETag'] = etag
+    return response
+
+
+@query_budget(5)
 @extend_schema(
-    responses={200: TagSerializer(many=True)},
-    description="Get all tags"
+    responses={200: TagSerializer(many=True), 304: None},
+    description="Get all tags. Send If-None-Match with the last ETag to get 304 when unchanged."
 )
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def list_tags(request):
     """Get all available tags."""
-    tags = Tag.objects.all().order_by('name')
-    serializer = TagSerializer(tags, many=True)
-    return Response(serializer.data)
+    etag, tags = TagCatalogService.get_tags()
+    return conditional_response(request, etag, tags)
+
+
+@query_budget(5)
+@extend_schema(
+    parameters=[
+        OpenApiParameter(name='limit', type=int, description='Max tags (1-500)', default=100),
+    ],
+    responses={200: TagCloudResponseSerializer, 304: None, 400: dict},
+    description=(
+        "Tags that have content, most used first, with post/video/FAQ counts and a 1-5 weight. "
+        "Supports If-None-Match."
+    )
+)
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def tag_cloud(request):
+    """Tag cloud with content counts, served from the in-memory catalog."""
+    try:
+        limit = max(1, min(500, int(request.query_params.get('limit', 100))))
+    except ValueError:
+        return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+    etag, tags = TagCatalogService.get_cloud(limit)
+    return conditional_response(request, etag, {'items': tags})
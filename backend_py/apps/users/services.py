@@ -8,10 +8,16 @@ from datetime import datetime, timedelta
 from typing import Optional, Tuple
 from django.conf import settings
 from rest_framework_simplejwt.tokens import RefreshToken
+
+from metrics import gauge, histogram, track
 from .models import User
 
 logger = logging.getLogger(__name__)
 
+# Same series as the FastAPI auth service (services/auth/services.py).
+BCRYPT_IN_FLIGHT = gauge('auth_bcrypt_in_flight', 'bcrypt hash/check calls running', ('op',))
+BCRYPT_SECONDS = histogram('auth_bcrypt_seconds', 'bcrypt hash/check duration', ('op',))
+
 
 class AuthService:
     """Authentication service with JWT and BCrypt."""
@@ -39,10 +45,11 @@ class AuthService:
     def verify_password(plain_password: str, hashed_password: str) -> bool:
         """Verify password against BCrypt hash."""
         try:
-            return bcrypt.checkpw(
-                plain_password.encode('utf-8'),
-                hashed_password.encode('utf-8')
-            )
+            with track(BCRYPT_IN_FLIGHT, BCRYPT_SECONDS, op='check'):
+                return bcrypt.checkpw(
+                    plain_password.encode('utf-8'),
+                    hashed_password.encode('utf-8')
+                )
         except Exception as e:
             logger.error(f"BCrypt verification error: {e}")
             return False
@@ -51,7 +58,8 @@ class AuthService:
     def hash_password(password: str) -> str:
         """Hash password using BCrypt."""
         salt = bcrypt.gensalt(rounds=12)
-        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+        with track(BCRYPT_IN_FLIGHT, BCRYPT_SECONDS, op='hash'):
+            return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
 
     @classmethod
     def login(cls, email_or_username: str, password: str) -> Tuple[Optional[dict], Optional[str], int]:
@@ -1,5 +1,7 @@
 """Video serializers for API endpoints."""
 
+from operator import attrgetter
+
 from rest_framework import serializers
 from apps.experts.serializers import ExpertSerializer
 from .models import Video, VideoStats
@@ -25,6 +27,12 @@ class VideoListItemSerializer(serializers.Serializer):
     expert = ExpertSerializer(allow_null=True)
     viewerState = serializers.SerializerMethodField()
 
+    # Used by apps.content.encoders: list rows from ContentEngine always carry stats.
+    encoder_overrides = {
+        'viewCount': attrgetter('stats.view_count'),
+        'likeCount': attrgetter('stats.like_count'),
+    }
+
     def get_viewCount(self, obj):
         try:
             return obj.stats.view_count if hasattr(obj, 'stats') and obj.stats else 0
@@ -81,6 +89,11 @@ class VideoListResponseSerializer(serializers.Serializer):
     items = VideoListItemSerializer(many=True)
 
 
+class LikeToggleRequestSerializer(serializers.Serializer):
+    """Optional like toggle body. Omit ``liked`` to flip the current state."""
+    liked = serializers.BooleanField(required=False, allow_null=True, default=None)
+
+
 class LikeToggleResponseSerializer(serializers.Serializer):
     """Like toggle response."""
     liked = serializers.BooleanField()
@@ -8,10 +8,16 @@ from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 
+from apps.content import targets
+from apps.content.encoders import encode_many, encoder_for, json_response
+from apps.content.serializers import ContentStatsSerializer
+from apps.content.versions import detail_body_response, stats_response
+from config.profiling import query_budget
 from .services import VideoService
 from .serializers import (
     VideoListResponseSerializer,
     VideoDetailSerializer,
+    LikeToggleRequestSerializer,
     LikeToggleResponseSerializer,
     RelatedContentResponseSerializer,
     VideoListItemSerializer
@@ -29,6 +35,7 @@ def get_user_id_from_header(request):
     return None
 
 
+@query_budget(6)
 @extend_schema(
     parameters=[
         OpenApiParameter(name='q', type=str, description='Search query'),
@@ -37,7 +44,12 @@ def get_user_id_from_header(request):
         OpenApiParameter(name='pageSize', type=int, description='Page size', default=10),
         OpenApiParameter(name='premium', type=bool, description='Filter by premium status'),
         OpenApiParameter(name='isShort', type=bool, description='Filter by short video status'),
-        OpenApiParameter(name='tag', type=str, description='Filter by tag name'),
+        OpenApiParameter(name='tag', type=str, description='Filter by tag name(s), comma-separated'),
+        OpenApiParameter(name='tagMode', type=str, description='With several tags: all (default) or any'),
+        OpenApiParameter(
+            name='fields', type=str,
+            description='Item fields to return, comma-separated; presets: card (id, title, thumbnail, counts), full'
+        ),
     ],
     responses={200: VideoListResponseSerializer},
     description="List videos with search, sort, and pagination"
@@ -63,47 +75,88 @@ def list_videos(request):
             premium=request.query_params.get('premium'),
             is_short=is_short,
             tag_name=request.query_params.get('tag'),
-            user_id=user_id
+            tag_mode=request.query_params.get('tagMode'),
+            user_id=user_id,
+            fields=request.query_params.get('fields')
         )
         
         # Serialize items
-        items_serializer = VideoListItemSerializer(result['items'], many=True)
         response_data = {
             'page': result['page'],
             'pageSize': result['pageSize'],
             'total': result['total'],
-            'items': items_serializer.data
+            'items': encode_many(VideoListItemSerializer, result['items'], result['fields'])
         }
+        if result['totalIsEstimate']:
+            response_data['totalIsEstimate'] = True
         
-        return Response(response_data)
+        return json_response(request, response_data)
     except ValueError as e:
         return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
+@query_budget(12)
 @extend_schema(
-    responses={200: VideoDetailSerializer, 404: dict},
-    description="Get video detail with atomic view count increment"
+    parameters=[
+        OpenApiParameter(
+            name='counters', type=bool, default=True,
+            description=(
+                'false: omit viewCount/likeCount/viewerState and send ETag/Last-Modified, so '
+                'If-None-Match/If-Modified-Since revalidate the body (304). Fetch counters from /stats.'
+            )
+        ),
+    ],
+    responses={200: VideoDetailSerializer, 304: None, 404: dict},
+    description="Get video detail with atomic view count increment (also on 304)"
 )
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def get_video_detail(request, video_id: int):
     """Get Video Detail with atomic view count increment."""
-    user_id = get_user_id_from_header(request)
-    video = VideoService.get_video_detail(video_id, user_id)
+    if request.query_params.get('counters', '').lower() in ('false', '0'):
+        response = detail_body_response(request, targets.VIDEO, video_id, VideoDetailSerializer)
+    else:
+        user_id = get_user_id_from_header(request)
+        video = VideoService.get_video_detail(video_id, user_id)
+        response = json_response(request, encoder_for(VideoDetailSerializer)(video)) if video else None
     
-    if not video:
+    if response is None:
         return Response(
             {'error': f'Video with id {video_id} not found'},
             status=status.HTTP_404_NOT_FOUND
         )
     
-    serializer = VideoDetailSerializer(video)
-    return Response(serializer.data)
+    return response
 
 
+@query_budget(4)
 @extend_schema(
-    responses={200: LikeToggleResponseSerializer, 401: dict, 404: dict},
-    description="Toggle like on a video (like/unlike). Requires X-User-Id header."
+    responses={200: ContentStatsSerializer, 304: None, 404: dict},
+    description=(
+        "Exact view/like counts and viewer state of a video, without recording a view. "
+        "Pair with the body from ?counters=false; send If-None-Match to get 304 when unchanged."
+    )
+)
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def get_video_stats(request, video_id: int):
+    """Get Video counters, split from the cacheable body."""
+    stats = VideoService.get_video_stats(video_id, get_user_id_from_header(request))
+    if not stats:
+        return Response(
+            {'error': f'Video with id {video_id} not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    return stats_response(request, targets.VIDEO, stats)
+
+
+@extend_schema(
+    request=LikeToggleRequestSerializer,
+    responses={200: LikeToggleResponseSerializer, 400: dict, 401: dict, 404: dict},
+    description=(
+        "Toggle like on a video (like/unlike). Requires X-User-Id header. "
+        "Send {\"liked\": true|false} to set the state explicitly so retries are idempotent."
+    )
 )
 @api_view(['POST'])
 @permission_classes([AllowAny])
@@ -117,13 +170,21 @@ def toggle_like(request, video_id: int):
             status=status.HTTP_401_UNAUTHORIZED
         )
     
+    body = LikeToggleRequestSerializer(data=request.data)
+    if not body.is_valid():
+        return Response(
+            {'error': 'liked must be a boolean'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
     try:
-        result = VideoService.toggle_like(video_id, user_id)
+        result = VideoService.toggle_like(video_id, user_id, liked=body.validated_data.get('liked'))
         return Response(result)
     except ValueError as e:
         return Response({'error': str(e)}, status=status.HTTP_404_NOT_FOUND)
 
 
+@query_budget(6)
 @extend_schema(
     parameters=[
         OpenApiParameter(name='page', type=int, description='Page number', default=1),
@@ -0,0 +1 @@
+"""Benchmarks for the Floria backend. Run from backend_py/ with python -m benchmarks.<name>."""
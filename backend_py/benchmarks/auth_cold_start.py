@@ -0,0 +1,86 @@
+"""
+Time cold start of the FastAPI auth service and enforce a budget.
+
+Each run imports services.auth.main (which runs django.setup()) in a fresh
+interpreter and reports the median wall time and the number of loaded
+modules, for the auth-only settings profile (config.settings_auth) and, for
+comparison, the full config.settings. Exits non-zero when the auth profile's
+median exceeds --budget-ms, so CI catches cold-start regressions.
+
+Usage:
+    python -m benchmarks.auth_cold_start --runs 7 --budget-ms 1500
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = (
+    "import json, sys, time\n"
+    "started = time.perf_counter()\n"
+    "import services.auth.main\n"
+    "elapsed = (time.perf_counter() - started) * 1000\n"
+    "from django.apps import apps\n"
+    "print(json.dumps({'ms': elapsed, 'modules': len(sys.modules), 'apps': len(apps.get_app_configs())}))\n"
+)
+
+
+def cold_start(settings_module: str, runs: int):
+    """
+    Median import ms, module count and installed app count over ``runs``
+    processes; raises RuntimeError with the last stderr line on failure.
+    """
+    env = {**os.environ, 'AUTH_DJANGO_SETTINGS_MODULE': settings_module}
+    samples = []
+    for _ in range(runs):
+        process = subprocess.run(
+            [sys.executable, '-c', PROBE], cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+        )
+        if process.returncode:
+            lines = [line for line in process.stderr.splitlines() if line and not line[0].isspace()]
+            raise RuntimeError(lines[-1] if lines else 'unknown error')
+        samples.append(json.loads(process.stdout.strip().splitlines()[-1]))
+    return (
+        statistics.median(s['ms'] for s in samples),
+        samples[-1]['modules'],
+        samples[-1]['apps'],
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=7)
+    parser.add_argument('--budget-ms', type=float, default=float(os.getenv('AUTH_COLD_START_BUDGET_MS', 1500)))
+    parser.add_argument('--skip-baseline', action='store_true', help='Only time the auth profile')
+    args = parser.parse_args()
+
+    profiles = ['config.settings_auth'] if args.skip_baseline else ['config.settings', 'config.settings_auth']
+    print(f"{'settings':<22} {'median ms':>10} {'modules':>8} {'apps':>5}")
+    results = {}
+    for settings_module in profiles:
+        try:
+            results[settings_module] = cold_start(settings_module, args.runs)
+        except RuntimeError as e:
+            print(f"{settings_module:<22} failed: {e}")
+            continue
+        ms, modules, app_count = results[settings_module]
+        print(f"{settings_module:<22} {ms:>10.1f} {modules:>8} {app_count:>5}")
+
+    if 'config.settings_auth' not in results:
+        print("FAIL: the auth service does not start with config.settings_auth")
+        sys.exit(1)
+
+    auth_ms = results['config.settings_auth'][0]
+    if auth_ms > args.budget_ms:
+        print(f"FAIL: auth cold start {auth_ms:.1f} ms exceeds budget {args.budget_ms:.0f} ms")
+        sys.exit(1)
+    print(f"ok: auth cold start within {args.budget_ms:.0f} ms budget")
+
+
+if __name__ == '__main__':
+    main()
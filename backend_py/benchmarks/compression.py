@@ -0,0 +1,150 @@
+"""
+Bytes on the wire and CPU cost of response compression, per size class.
+
+Fetches real response bodies in-process: the hot Django endpoints, plus the
+services' search and analytics when FastAPI is installed. Each body is then
+compressed at several gzip levels and brotli qualities. For every size class
+(<1k, 1k-10k, 10k-100k, 100k+) the report gives the wire bytes as a share
+of the raw bytes and the median CPU time per response. The last column is
+the compress() call both middlewares make, at the configured settings, with the
+compressed-body cache cold and then warm. Detail pages record views, so run
+it against the SQLite stand-in or a scratch database.
+
+Usage:
+    python -m benchmarks.compression --repeat 20
+"""
+
+import argparse
+import gzip
+import os
+import statistics
+import sys
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+django.setup()
+
+from django.test import Client  # noqa: E402
+
+from compression import core  # noqa: E402
+
+CODECS = [(f'gzip-{level}', lambda body, level=level: gzip.compress(body, level, mtime=0)) for level in (1, 6, 9)]
+if core.brotli:
+    CODECS += [
+        (f'br-{quality}', lambda body, quality=quality: core.brotli.compress(body, quality=quality))
+        for quality in (1, 5, 8, 11)
+    ]
+
+
+def django_paths():
+    from apps.experts.models import Expert
+    from apps.posts.models import Post
+    from apps.videos.models import Video
+
+    post = Post.objects.filter(status='published').values_list('pk', flat=True).first()
+    video = Video.objects.filter(status='published').values_list('pk', flat=True).first()
+    expert = Expert.objects.values_list('pk', flat=True).first()
+    paths = [
+        '/api/v1/posts/', '/api/v1/posts/?pageSize=50', '/api/v1/videos/?pageSize=50',
+        '/api/v1/feed', '/api/v1/faqs/', '/api/tags/', '/api/tags/cloud?limit=500', '/api/v1/experts/',
+        '/health/',
+    ]
+    if post:
+        paths += [f'/api/v1/posts/{post}', f'/api/v1/posts/{post}/related']
+    if video:
+        paths.append(f'/api/v1/videos/{video}')
+    if expert:
+        paths.append(f'/api/v1/experts/{expert}/reviews/')
+    return paths
+
+
+def fetch_bodies():
+    bodies = []
+    client = Client(HTTP_HOST='localhost', HTTP_ACCEPT_ENCODING='identity')
+    for path in django_paths():
+        response = client.get(path)
+        if response.status_code == 200:
+            bodies.append((path, response.content))
+        else:
+            print(f"  {path}: HTTP {response.status_code}, skipped", file=sys.stderr)
+    try:
+        from fastapi.testclient import TestClient
+        from services.main import app
+    except ImportError as e:
+        print(f"  services skipped: {e}", file=sys.stderr)
+        return bodies
+    client = TestClient(app, headers={'Accept-Encoding': 'identity'})
+    for path in ('/api/search?q=vitamin&limit=50', '/api/analytics/summary'):
+        response = client.get(path)
+        if response.status_code == 200:
+            bodies.append((path, response.content))
+    return bodies
+
+
+def cpu_us(fn, body, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.process_time_ns()
+        fn(body)
+        samples.append((time.process_time_ns() - started) / 1000)
+    return statistics.median(samples)
+
+
+def middleware_us(body, repeat):
+    """Configured path through core.compress: (cold, cached) CPU microseconds."""
+    encoding = 'br' if core.brotli else 'gzip'
+
+    def cold(data):
+        core.CompressedCache.clear()
+        core.compress(data, encoding, cacheable=True)
+
+    core.compress(body, encoding, cacheable=True)
+    warm = cpu_us(lambda data: core.compress(data, encoding, cacheable=True), body, repeat)
+    return cpu_us(cold, body, repeat), warm
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--per-body', action='store_true', help='Also list every body')
+    args = parser.parse_args()
+
+    bodies = fetch_bodies()
+    classes = defaultdict(list)
+    for path, body in bodies:
+        classes[core.size_class(len(body))].append((path, body))
+
+    rows = []
+    for label in ('<1k', '1k-10k', '10k-100k', '100k+'):
+        if label not in classes:
+            continue
+        raw = sum(len(body) for _, body in classes[label])
+        cells = []
+        for _, fn in CODECS:
+            wire = sum(len(fn(body)) for _, body in classes[label])
+            us = statistics.mean(cpu_us(fn, body, args.repeat) for _, body in classes[label])
+            cells.append(f"{wire / raw:>5.0%} {us:>6.0f}us")
+        cold, warm = zip(*(middleware_us(body, args.repeat) for _, body in classes[label]))
+        cells.append(f"{statistics.mean(cold):>6.0f}/{statistics.mean(warm):.0f}us")
+        rows.append((label, len(classes[label]), raw, cells))
+
+    print(f"Bytes on the wire (share of raw) and median CPU per response; "
+          f"configured: gzip-{core.GZIP_LEVEL}, br-{core.BROTLI_QUALITY}, min {core.MIN_BYTES} B\n")
+    header = [name for name, _ in CODECS] + ['mw cold/hit']
+    print(f"{'class':<9} {'n':>3} {'raw avg':>8}  " + '  '.join(f"{name:>13}" for name in header))
+    for label, n, raw, cells in rows:
+        print(f"{label:<9} {n:>3} {raw // n:>8}  " + '  '.join(f"{cell:>13}" for cell in cells))
+
+    if args.per_body:
+        print()
+        for path, body in bodies:
+            sizes = ' '.join(f"{name}={len(fn(body))}" for name, fn in CODECS)
+            print(f"{len(body):>8}  {path:<40} {sizes}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Concurrency benchmark for view counters: single stats row vs sharded counters.
+
+N writer threads each record views on the SAME post, first with
+CONTENT_COUNTER_SHARDS=0 (every writer updates the one PostStats row) and
+then with sharding enabled. On SQL Server the single-row mode flattens out
+as threads are added while the sharded mode keeps scaling.
+
+Writes go to the configured database. Added views are subtracted again at
+the end of each run, so point it at a dev/staging database.
+
+Usage:
+    python -m benchmarks.counter_contention --post-id 1 --threads 1,2,4,8,16
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.db.models import F  # noqa: E402
+
+from apps.content import targets  # noqa: E402
+from apps.content.counters import CounterService  # noqa: E402
+from apps.posts.models import PostStats  # noqa: E402
+
+
+def run_writers(post_id: int, threads: int, ops_per_thread: int) -> float:
+    """Run the writers and return total increments per second."""
+    barrier = threading.Barrier(threads + 1)
+    errors = []
+
+    def writer():
+        try:
+            barrier.wait()
+            for _ in range(ops_per_thread):
+                CounterService.increment(targets.POST, post_id, 'view_count')
+        except Exception as e:  # keep the benchmark running, report at the end
+            errors.append(e)
+        finally:
+            connection.close()
+
+    workers = [threading.Thread(target=writer) for _ in range(threads)]
+    for w in workers:
+        w.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - started
+
+    if errors:
+        print(f"  {len(errors)} writer(s) failed, first error: {errors[0]}")
+    return (threads * ops_per_thread - len(errors) * ops_per_thread) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--post-id', type=int, required=True)
+    parser.add_argument('--threads', default='1,2,4,8,16')
+    parser.add_argument('--ops-per-thread', type=int, default=200)
+    parser.add_argument('--shards', type=int, default=16)
+    args = parser.parse_args()
+
+    thread_counts = [int(t) for t in args.threads.split(',')]
+    before = PostStats.objects.get(post_id=args.post_id).view_count
+
+    print(f"{'threads':>8} {'single row ops/s':>18} {'sharded ops/s':>16} {'speedup':>8}")
+    for threads in thread_counts:
+        results = []
+        for shards in (0, args.shards):
+            settings.CONTENT_COUNTER_SHARDS = shards
+            results.append(run_writers(args.post_id, threads, args.ops_per_thread))
+            CounterService.compact(targets.POST)
+        single, sharded = results
+        print(f"{threads:>8} {single:>18.0f} {sharded:>16.0f} {sharded / single:>7.2f}x")
+
+    # Undo the benchmark's views.
+    added = PostStats.objects.get(post_id=args.post_id).view_count - before
+    PostStats.objects.filter(post_id=args.post_id).update(view_count=F('view_count') - added)
+
+
+if __name__ == '__main__':
+    main()
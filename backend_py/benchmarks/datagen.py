@@ -0,0 +1,279 @@
+"""
+Synthetic dataset for the benchmark suite (benchmarks.suite).
+
+Fills the configured database with a deterministic, realistically skewed
+dataset: experts, users, tags, categories, posts and videos with stats,
+tag/category links, likes and expert reviews. View counts are heavy-tailed
+and likes concentrate on popular items, so caches and "hot row" contention
+behave like production rather than like uniform test data. The same --seed
+always produces the same rows.
+
+Defaults are 100k posts, 100k videos, 100k likes and 100k reviews per run.
+It fills the configured database: SQL Server (tables from the production
+schema) or the SQLite stand-in (DB_ENGINE=sqlite), which is bootstrapped
+first. The posts/videos tables must be empty unless --append.
+
+Writes a manifest (published ids by popularity, user id range, search terms,
+category slugs) that the workloads in benchmarks.suite read.
+
+Usage:
+    python -m benchmarks.datagen --posts 100000 --videos 100000 --seed 42
+    python -m benchmarks.datagen --posts 2000 --videos 2000 --likes 5000 --reviews 2000
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.db import connection, transaction  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from apps.experts.models import Expert, ExpertReview  # noqa: E402
+from apps.experts.services import ExpertRatingService  # noqa: E402
+from apps.posts.models import Post, PostCategory, PostLike, PostStats, PostTag  # noqa: E402
+from apps.tags.models import ContentCategory, Tag  # noqa: E402
+from apps.users.models import User  # noqa: E402
+from apps.videos.models import Video, VideoCategory, VideoLike, VideoStats, VideoTag  # noqa: E402
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+DEFAULT_MANIFEST = os.path.join(RESULTS_DIR, 'dataset.json')
+BATCH_SIZE = 2000
+
+# Search terms and titles are built from these, so /api/search and the chat
+# context lookup hit a realistic share of rows.
+VOCABULARY = (
+    'kinh nguyet', 'chu ky', 'suc khoe', 'dinh duong', 'dau bung', 'noi tiet',
+    'rung trung', 'mang thai', 'tam ly', 'giac ngu', 'tap luyen', 'thien dinh',
+    'cang thang', 'da lieu', 'vitamin', 'sat', 'hormone', 'thuoc', 'bac si', 'lo au',
+)
+FILLER = (
+    'cach', 'nhan biet', 'dau hieu', 'phong tranh', 'huong dan', 'meo', 'hieu dung',
+    've', 'trong', 'khi', 'cho', 'nu gioi', 'tuoi day thi', 'sau sinh', 'hang ngay',
+)
+SPECIALIZATIONS = ('San phu khoa', 'Dinh duong', 'Tam ly', 'Noi tiet', 'Da lieu')
+
+
+def words(rng: random.Random, n: int) -> str:
+    parts = [rng.choice(VOCABULARY)] + [rng.choice(FILLER + VOCABULARY) for _ in range(n - 1)]
+    rng.shuffle(parts)
+    return ' '.join(parts)
+
+
+def skewed_index(rng: random.Random, n: int, skew: float = 3.0) -> int:
+    """Index in [0, n) biased towards 0 (the popular end)."""
+    return min(n - 1, int(n * rng.random() ** skew))
+
+
+def insert(model, objects, label: str) -> None:
+    started = time.perf_counter()
+    with transaction.atomic():
+        for start in range(0, len(objects), BATCH_SIZE):
+            model.objects.bulk_create(objects[start:start + BATCH_SIZE], batch_size=BATCH_SIZE)
+    print(f"  {label:<18} {len(objects):>9,} rows  {time.perf_counter() - started:7.1f} s")
+
+
+def new_ids(model, before: int):
+    return list(model.objects.filter(pk__gt=before).order_by('pk').values_list('pk', flat=True))
+
+
+def max_pk(model) -> int:
+    return model.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+
+
+def generate_content(rng, kind, count, expert_ids, tag_ids, category_ids, like_total, user_range, now):
+    """Insert posts or videos with stats, links and likes; return published ids by popularity."""
+    content_model, stats_model, like_model, tag_model, category_model = {
+        'post': (Post, PostStats, PostLike, PostTag, PostCategory),
+        'video': (Video, VideoStats, VideoLike, VideoTag, VideoCategory),
+    }[kind]
+    fk = f'{kind}_id'
+
+    before = max_pk(content_model)
+    rows = []
+    for _ in range(count):
+        published = rng.random() < 0.95
+        fields = {
+            'expert_id': expert_ids[skewed_index(rng, len(expert_ids), 2.0)],
+            'title': words(rng, rng.randint(4, 9)).capitalize(),
+            'thumbnail_url': f'https://cdn.example.com/{kind}/{rng.getrandbits(40):x}.jpg',
+            'is_premium': rng.random() < 0.1,
+            'status': 'published' if published else 'draft',
+            'published_at': now - timedelta(seconds=rng.randint(0, 730 * 86400)) if published else None,
+        }
+        if kind == 'post':
+            fields['summary'] = words(rng, 20)
+            fields['content'] = '\n\n'.join(words(rng, 60) for _ in range(rng.randint(3, 12)))
+        else:
+            fields['description'] = words(rng, 40)
+            fields['video_url'] = f'https://cdn.example.com/{kind}/{rng.getrandbits(40):x}.mp4'
+            fields['is_short'] = rng.random() < 0.3
+            fields['duration_seconds'] = rng.randint(15, 60) if fields['is_short'] else rng.randint(120, 1800)
+        rows.append(content_model(**fields))
+    insert(content_model, rows, f'{kind}s')
+    ids = new_ids(content_model, before)
+    published_ids = set(
+        content_model.objects.filter(pk__gt=before, status='published').values_list('pk', flat=True)
+    )
+
+    # Popularity order: heavy-tailed views, likes drawn towards the same items.
+    rng.shuffle(ids)
+    views = {content_id: int(rng.paretovariate(1.1) * 50) for content_id in ids}
+    ranked = sorted(ids, key=views.get, reverse=True)
+    popular = [content_id for content_id in ranked if content_id in published_ids]
+
+    likes = set()
+    first_user, last_user = user_range
+    attempts = 0
+    while len(likes) < like_total and popular and attempts < like_total * 5:
+        attempts += 1
+        likes.add((rng.randint(first_user, last_user), popular[skewed_index(rng, len(popular))]))
+    like_counts = {}
+    for _, content_id in likes:
+        like_counts[content_id] = like_counts.get(content_id, 0) + 1
+
+    insert(stats_model, [
+        stats_model(**{fk: content_id, 'view_count': views[content_id], 'like_count': like_counts.get(content_id, 0)})
+        for content_id in ids
+    ], f'{kind} stats')
+    insert(tag_model, [
+        tag_model(**{fk: content_id, 'tag_id': tag_id})
+        for content_id in ids
+        for tag_id in {tag_ids[skewed_index(rng, len(tag_ids), 2.0)] for _ in range(rng.randint(1, 4))}
+    ], f'{kind} tags')
+    insert(category_model, [
+        category_model(**{fk: content_id, 'category_id': category_id})
+        for content_id in ids
+        for category_id in {rng.choice(category_ids) for _ in range(rng.randint(1, 2))}
+    ], f'{kind} categories')
+    insert(like_model, [
+        like_model(**{'user_id': user_id, fk: content_id, 'created_at': now - timedelta(seconds=rng.randint(0, 86400 * 90))})
+        for user_id, content_id in sorted(likes)
+    ], f'{kind} likes')
+    return popular
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--posts', type=int, default=100_000)
+    parser.add_argument('--videos', type=int, default=100_000)
+    parser.add_argument('--likes', type=int, default=100_000, help='Likes per content type')
+    parser.add_argument('--reviews', type=int, default=100_000)
+    parser.add_argument('--users', type=int, default=20_000)
+    parser.add_argument('--experts', type=int, default=500)
+    parser.add_argument('--tags', type=int, default=1_000)
+    parser.add_argument('--categories', type=int, default=40)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--append', action='store_true', help='Add to a database that already has content')
+    parser.add_argument('--manifest', default=DEFAULT_MANIFEST, help='Where to write the dataset manifest')
+    args = parser.parse_args()
+
+    if connection.vendor == 'sqlite':
+        call_command('bootstrap_sqlite', verbosity=0)
+    if not args.append and (Post.objects.exists() or Video.objects.exists()):
+        parser.error('the database already has posts or videos; pass --append to add to it')
+
+    rng = random.Random(args.seed)
+    now = timezone.now()
+    started = time.perf_counter()
+    print(f"Generating dataset on {connection.vendor} (seed {args.seed})")
+
+    before = max_pk(User)
+    insert(User, [
+        User(username=f'bench_{args.seed}_{n}', email=f'bench_{args.seed}_{n}@example.com', account_verified=True)
+        for n in range(args.users)
+    ], 'users')
+    user_ids = new_ids(User, before)
+    user_range = (user_ids[0], user_ids[-1]) if user_ids else (1, 1)
+
+    before = max_pk(Expert)
+    insert(Expert, [
+        Expert(
+            full_name=f'Bac si {words(rng, 2).title()}',
+            specialization=rng.choice(SPECIALIZATIONS),
+            title='ThS. BS.',
+            bio=words(rng, 40),
+            experience_years=rng.randint(1, 30),
+            price_per_session=rng.choice((200_000, 300_000, 500_000)),
+            consultation_count=rng.randint(0, 2000),
+            is_verified=rng.random() < 0.7,
+            created_at=now,
+        )
+        for _ in range(args.experts)
+    ], 'experts')
+    expert_ids = new_ids(Expert, before)
+
+    before = max_pk(Tag)
+    insert(Tag, [
+        Tag(name=f'{rng.choice(VOCABULARY)} {n}', slug=f'bench-{args.seed}-tag-{n}')
+        for n in range(args.tags)
+    ], 'tags')
+    tag_ids = new_ids(Tag, before)
+
+    before = max_pk(ContentCategory)
+    insert(ContentCategory, [
+        ContentCategory(name=f'{VOCABULARY[n % len(VOCABULARY)].title()} {n}', slug=f'bench-{args.seed}-cat-{n}')
+        for n in range(args.categories)
+    ], 'categories')
+    category_ids = new_ids(ContentCategory, before)
+
+    popular = {
+        kind: generate_content(rng, kind, count, expert_ids, tag_ids, category_ids, args.likes, user_range, now)
+        for kind, count in (('post', args.posts), ('video', args.videos))
+    }
+
+    # Reviews: unique (expert, user) pairs, busy experts get most of them.
+    pairs = set()
+    attempts = 0
+    while len(pairs) < args.reviews and attempts < args.reviews * 5:
+        attempts += 1
+        pairs.add((expert_ids[skewed_index(rng, len(expert_ids), 2.0)], rng.randint(*user_range)))
+    insert(ExpertReview, [
+        ExpertReview(
+            expert_id=expert_id,
+            user_id=user_id,
+            rating=rng.choices((1, 2, 3, 4, 5), weights=(3, 4, 10, 30, 53))[0],
+            comment=words(rng, 12) if rng.random() < 0.6 else None,
+            created_at=now - timedelta(seconds=rng.randint(0, 365 * 86400)),
+            updated_at=now,
+        )
+        for expert_id, user_id in sorted(pairs)
+    ], 'reviews')
+    ExpertRatingService.recompute(expert_ids)
+
+    manifest = {
+        'seed': args.seed,
+        'vendor': connection.vendor,
+        'generatedAt': now.isoformat(),
+        'counts': {
+            'posts': args.posts, 'videos': args.videos, 'likesPerType': args.likes,
+            'reviews': len(pairs), 'users': len(user_ids), 'experts': len(expert_ids),
+            'tags': len(tag_ids), 'categories': len(category_ids),
+        },
+        'popularPostIds': popular['post'],
+        'popularVideoIds': popular['video'],
+        'userIdRange': list(user_range),
+        'expertIds': expert_ids,
+        'categorySlugs': list(
+            ContentCategory.objects.filter(pk__in=category_ids).values_list('slug', flat=True)
+        ),
+        'searchTerms': list(VOCABULARY),
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.manifest)), exist_ok=True)
+    with open(args.manifest, 'w') as fh:
+        json.dump(manifest, fh)
+    print(f"Done in {time.perf_counter() - started:.1f} s; manifest written to {args.manifest}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+Request latency of list_posts under each database connection mode.
+
+Requests go through Django's real WSGI handler, so the connection lifecycle
+(request_started/finished, CONN_MAX_AGE, health checks, pool return) is the
+one production uses. Modes:
+
+- per-request: CONN_MAX_AGE=0, a new connection for every request (old default)
+- persistent:  one connection per thread kept across requests
+- pooled:      a shared pool of --pool-size connections
+
+For each mode this prints p50/p99/mean latency and the connection opens,
+reuses and pool wait time recorded by config.db.pool.ConnectionStats.
+
+Usage:
+    python -m benchmarks.db_connections --requests 500 --threads 4
+"""
+
+import argparse
+import io
+import os
+import statistics
+import sys
+import threading
+import time
+from wsgiref.util import setup_testing_defaults
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.core.handlers.wsgi import WSGIHandler  # noqa: E402
+from django.db import connections  # noqa: E402
+
+from config.db.pool import ConnectionStats  # noqa: E402
+
+
+def modes(pool_size: int):
+    return {
+        'per-request': {'CONN_MAX_AGE': 0, 'POOL': None},
+        'persistent': {'CONN_MAX_AGE': 600, 'POOL': None},
+        'pooled': {'CONN_MAX_AGE': 0, 'POOL': {'SIZE': pool_size, 'TIMEOUT': 30}},
+    }
+
+
+def run_requests(handler, path, query, count, latencies, lock):
+    samples = []
+    for _ in range(count):
+        environ = {'PATH_INFO': path, 'QUERY_STRING': query, 'wsgi.input': io.BytesIO()}
+        setup_testing_defaults(environ)
+        environ['HTTP_HOST'] = settings.ALLOWED_HOSTS[0] if settings.ALLOWED_HOSTS else 'localhost'
+        started = time.perf_counter()
+        response = handler(environ, lambda status, headers: None)
+        b''.join(response)
+        response.close()
+        samples.append((time.perf_counter() - started) * 1000)
+    connections.close_all()
+    with lock:
+        latencies.extend(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--path', default='/api/v1/posts/')
+    parser.add_argument('--query', default='page=1&pageSize=10')
+    parser.add_argument('--requests', type=int, default=500, help='Requests per thread')
+    parser.add_argument('--threads', type=int, default=1)
+    parser.add_argument('--pool-size', type=int, default=4)
+    args = parser.parse_args()
+
+    handler = WSGIHandler()
+    default = settings.DATABASES['default']
+    original = {key: default.get(key) for key in ('CONN_MAX_AGE', 'POOL')}
+
+    print(f"{'mode':<12} {'p50 ms':>8} {'p99 ms':>8} {'mean ms':>8} {'opens':>6} {'reuses':>7} {'wait ms':>8}")
+    for label, overrides in modes(args.pool_size).items():
+        for alias in connections:
+            connections[alias].close()
+        for target in (default, connections['default'].settings_dict):
+            target.update(overrides)
+        run_requests(handler, args.path, args.query, 10, [], threading.Lock())
+
+        before = ConnectionStats.snapshot()
+        latencies, lock = [], threading.Lock()
+        threads = [
+            threading.Thread(target=run_requests, args=(handler, args.path, args.query, args.requests, latencies, lock))
+            for _ in range(args.threads)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        after = ConnectionStats.snapshot()
+
+        latencies.sort()
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        print(
+            f"{label:<12} {statistics.median(latencies):>8.2f} {p99:>8.2f} {statistics.mean(latencies):>8.2f} "
+            f"{after['opens'] - before['opens']:>6} {after['reuses'] - before['reuses']:>7} "
+            f"{(after['pool_wait_seconds'] - before['pool_wait_seconds']) * 1000:>8.1f}"
+        )
+
+    default.update(original)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Check and time the precompiled list/detail encoders against DRF.
+
+For one page of posts and videos (and the first item's detail) this renders
+the response once through the DRF serializer + JSONRenderer and once through
+apps.content.encoders, fails if the bytes differ, and reports the median
+time of each path. Detail rendering does not record views.
+
+Usage:
+    python -m benchmarks.fast_encoders --page-size 50 --repeat 50
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+django.setup()
+
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from apps.content import targets  # noqa: E402
+from apps.content.encoders import dumps, encode_many, encoder_for  # noqa: E402
+from apps.content.engine import ContentEngine  # noqa: E402
+from apps.posts.serializers import PostDetailSerializer, PostListItemSerializer  # noqa: E402
+from apps.videos.serializers import VideoDetailSerializer, VideoListItemSerializer  # noqa: E402
+
+SHAPES = (
+    (targets.POST, PostListItemSerializer, PostDetailSerializer, 'post_categories__category'),
+    (targets.VIDEO, VideoListItemSerializer, VideoDetailSerializer, 'video_categories__category'),
+)
+
+
+def median_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def compare(label: str, drf_render, fast_render, repeat: int) -> bool:
+    expected, actual = drf_render(), fast_render()
+    same = expected == actual
+    drf_ms, fast_ms = median_ms(drf_render, repeat), median_ms(fast_render, repeat)
+    print(f"{label:<14} {len(expected):>9} {drf_ms:>10.3f} {fast_ms:>10.3f} {drf_ms / max(fast_ms, 1e-9):>7.1f}x "
+          f"{'ok' if same else 'MISMATCH'}")
+    return same
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--page-size', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    renderer = JSONRenderer()
+    ok = True
+    print(f"{'shape':<14} {'bytes':>9} {'drf ms':>10} {'fast ms':>10} {'speedup':>8}")
+    for target, list_serializer, detail_serializer, categories in SHAPES:
+        rows = ContentEngine.get_list(target, page_size=args.page_size)['items']
+        ok &= compare(
+            f'{target.name} list',
+            lambda: renderer.render(list_serializer(rows, many=True).data),
+            lambda: dumps(encode_many(list_serializer, rows)),
+            args.repeat,
+        )
+
+        content_model, _, _ = target.models
+        item = content_model.objects.select_related('expert').prefetch_related(categories).first()
+        if item is None:
+            continue
+        ok &= compare(
+            f'{target.name} detail',
+            lambda: renderer.render(detail_serializer(item).data),
+            lambda: dumps(encoder_for(detail_serializer)(item)),
+            args.repeat,
+        )
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,719 @@
+"""
+Index advisor: capture the hot query shapes, propose indexes, measure them.
+
+1. Capture. A fixed set of representative calls runs in-process:
+   - Django views: lists, feed, detail, likes, tags, categories, experts, login.
+   - OTP service calls.
+   - The FastAPI search, analytics and chat-context queries.
+   Every statement is recorded with its parameters. Writes run inside a
+   transaction that is rolled back.
+2. Propose. Each SELECT is reduced to per-table access patterns:
+   - equality columns, range columns and ORDER BY columns;
+   - the other columns the query reads;
+   - predicates on literal constants, e.g. status = 'published' in the raw services SQL.
+   From those it builds one index per pattern, in key order equality, then
+   order/range columns. It INCLUDEs the other columns it reads, which makes
+   the index covering, unless they are large or too many. A predicate on a
+   literal becomes a filter (filtered index). A parameterized one can't:
+   SQL Server only uses a filtered index when the predicate is a literal,
+   so that column leads the key instead. Case-insensitive lookups
+   (UPPER(col) = UPPER(?) on SQL Server, LIKE on SQLite) get an expression
+   index. Proposals already served by an existing index are reported, not
+   repeated. Leading-wildcard LIKE and ORDER BY on computed expressions are
+   listed as not indexable.
+3. --compare runs the hot SELECTs, creates the proposed indexes, and runs
+   them again. It prints each query's plan and median latency before and
+   after, then drops the new indexes again unless --keep.
+
+Proposals are printed as idempotent T-SQL in the style of sql/NNN_*.sql
+(--sql) and applied as plain CREATE INDEX on the SQLite stand-in. Run it
+against a realistically sized database (benchmarks.datagen).
+
+Usage:
+    python -m benchmarks.index_advisor
+    python -m benchmarks.index_advisor --sql > /tmp/proposed.sql
+    python -m benchmarks.index_advisor --compare --repeat 20 --top 12
+"""
+
+import argparse
+import os
+import re
+import statistics
+import sys
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+django.setup()
+
+from django.apps import apps  # noqa: E402
+from django.db import connection, models, transaction  # noqa: E402
+from django.test import Client  # noqa: E402
+
+from config.profiling import QueryRecorder, fingerprint  # noqa: E402
+
+MAX_INCLUDE = 8
+KEYWORDS = {
+    'where', 'on', 'left', 'right', 'inner', 'outer', 'join', 'group', 'order', 'union',
+    'limit', 'cross', 'with', 'offset', 'having', 'as', 'and', 'or', 'set', 'values', 'fetch',
+}
+_QUOTES = re.compile(r'[\[\]"`]')
+_TABLE_REF = re.compile(r'\b(?:FROM|JOIN)\s+(?:dbo\.)?(\w+)(?:\s+(?:AS\s+)?(\w+))?', re.IGNORECASE)
+_PLACEHOLDER = re.compile(r"%s|\?|'(?:[^']|'')*'")
+_VALUE = r"(%s|\?|N?'(?:[^']|'')*'|-?\d+(?:\.\d+)?)"
+_COMPARISON = re.compile(
+    r'(?<![\w.])(?:(\w+)\.)?(\w+)\s*(=|<>|!=|>=|<=|>|<|\bIN\b|\bLIKE\b)\s*\(?\s*' + _VALUE, re.IGNORECASE
+)
+_UPPER_EQUALS = re.compile(r'UPPER\((?:(\w+)\.)?(\w+)\)\s*=\s*UPPER\(', re.IGNORECASE)
+_NOT_COLUMN = re.compile(r'\bNOT\s+(?:(\w+)\.)?(\w+)\b(?!\s*(?:IN|LIKE|NULL)\b)', re.IGNORECASE)
+_JOIN_EQUALS = re.compile(r'(\w+)\.(\w+)\s*=\s*(\w+)\.(\w+)')
+_COLUMN_REF = re.compile(r'\b(\w+)\.(\w+)\b')
+_ORDER_BY = re.compile(r'\bORDER BY\s+(.+?)(?:\bLIMIT\b|\bOFFSET\b|\bFETCH\b|\)\s*$|$)', re.IGNORECASE | re.DOTALL)
+
+
+# ============== SCHEMA ==============
+
+def model_tables():
+    """{table: {column: field}} for the app models."""
+    tables = {}
+    for model in apps.get_models():
+        if not model.__module__.startswith('apps.'):
+            continue
+        columns = tables.setdefault(model._meta.db_table, {})
+        for field in model._meta.concrete_fields:
+            columns[field.column] = field
+    return tables
+
+
+TABLES = model_tables()
+_LOWER_TABLES = {table.lower(): table for table in TABLES}
+
+
+def is_large(field) -> bool:
+    return isinstance(field, (models.TextField, models.BinaryField)) or getattr(field, 'max_length', 0) and field.max_length > 500
+
+
+def existing_indexes(table):
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, table)
+    return {
+        name: [c for c in info['columns'] if c]
+        for name, info in constraints.items()
+        if info.get('index') or info.get('primary_key') or info.get('unique')
+    }
+
+
+# ============== CAPTURE ==============
+
+class RecordingCursor:
+    """DB-API cursor proxy for the FastAPI services' raw connections."""
+
+    def __init__(self, cursor, queries):
+        self._cursor = cursor
+        self._queries = queries
+
+    def execute(self, sql, params=()):
+        started = time.perf_counter()
+        try:
+            return self._cursor.execute(sql, params)
+        finally:
+            self._queries.append({
+                'sql': sql, 'params': list(params), 'ms': (time.perf_counter() - started) * 1000, 'alias': 'services',
+            })
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class RecordingConnection:
+    def __init__(self, raw, queries):
+        self._raw = raw
+        self._queries = queries
+
+    def cursor(self):
+        return RecordingCursor(self._raw.cursor(), self._queries)
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+
+@contextmanager
+def rolled_back():
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+def sample_ids():
+    from apps.experts.models import Expert
+    from apps.posts.models import Post
+    from apps.tags.models import ContentCategory, Tag
+    from apps.users.models import User
+    from apps.videos.models import Video
+
+    def first(queryset, field='pk'):
+        return queryset.values_list(field, flat=True).first()
+
+    return {
+        'post': first(Post.objects.filter(status='published').order_by('-stats__view_count')),
+        'video': first(Video.objects.filter(status='published').order_by('-stats__view_count')),
+        'user': first(User.objects.order_by('pk')) or 1,
+        'email': first(User.objects.exclude(email=None).order_by('pk'), 'email') or 'nobody@example.com',
+        'expert': first(Expert.objects.order_by('pk')),
+        'tag': first(Tag.objects.order_by('pk'), 'name'),
+        'category': first(ContentCategory.objects.filter(is_active=True).order_by('pk'), 'slug'),
+    }
+
+
+def scenarios(ids):
+    """(label, callable) pairs exercising the hot paths."""
+    client = Client(HTTP_HOST='localhost')
+    user = {'HTTP_X_USER_ID': str(ids['user'])}
+
+    def get(path, **headers):
+        return lambda: client.get(path, **headers)
+
+    def write(fn):
+        def run():
+            with rolled_back():
+                fn()
+        return run
+
+    from apps.otp.services import OTPService
+    from apps.users.services import AuthService
+
+    items = [
+        ('posts newest', get('/api/v1/posts/?sort=NEWEST')),
+        ('posts trending', get('/api/v1/posts/?sort=TRENDING&page=3')),
+        ('videos newest', get('/api/v1/videos/?sort=NEWEST')),
+        ('feed', get('/api/v1/feed?sort=NEWEST', **user)),
+        ('feed trending', get('/api/v1/feed', **user)),
+        ('feed search', get('/api/v1/feed?q=vitamin')),
+        ('tags', get('/api/tags/')),
+        ('experts', get('/api/v1/experts/')),
+        ('login by email', lambda: AuthService.login(ids['email'].upper(), 'wrong-password')),
+        ('otp request', write(lambda: OTPService.create_otp_request(ids['user'], 'email', ids['email']))),
+        ('otp verify', write(lambda: OTPService.verify_otp(ids['user'], '000000'))),
+    ]
+    if ids['post']:
+        items += [
+            ('post detail', get(f"/api/v1/posts/{ids['post']}", **user)),
+            ('post related', get(f"/api/v1/posts/{ids['post']}/related")),
+            ('post like', write(lambda: client.post(
+                f"/api/v1/posts/{ids['post']}/like", {'liked': True}, content_type='application/json', **user))),
+        ]
+    if ids['video']:
+        items += [
+            ('video detail', get(f"/api/v1/videos/{ids['video']}", **user)),
+            ('video like', write(lambda: client.post(
+                f"/api/v1/videos/{ids['video']}/like", {'liked': True}, content_type='application/json', **user))),
+        ]
+    if ids['tag']:
+        items.append(('feed by tag', get(f"/api/v1/feed?tag={ids['tag']}")))
+    if ids['category']:
+        items.append(('category', get(f"/api/v1/categories/{ids['category']}/content")))
+    if ids['expert']:
+        items += [
+            ('expert detail', get(f"/api/v1/experts/{ids['expert']}/")),
+            ('expert reviews', get(f"/api/v1/experts/{ids['expert']}/reviews/")),
+        ]
+    return items
+
+
+def capture_services(queries):
+    """Record the raw SQL of the FastAPI search/analytics/chat-context paths."""
+    try:
+        from fastapi.testclient import TestClient
+        from services import db
+        from services.chat.db_context import get_relevant_content
+        from services.main import app
+    except ImportError as e:
+        print(f"  services skipped: {e}")
+        return
+
+    connect = db.connect
+    db.connect = lambda *args: RecordingConnection(connect(*args), queries)
+    try:
+        client = TestClient(app)
+        for path in ('/api/search?q=vitamin&limit=20', '/api/analytics/summary'):
+            response = client.get(path)
+            if response.status_code != 200:
+                print(f"  services {path}: HTTP {response.status_code} {response.text[:120]}")
+        get_relevant_content('dau bung kinh nguyet')
+    finally:
+        db.connect = connect
+
+
+def capture():
+    """Run every scenario; return the recorded statements, tagged with their scenario."""
+    ids = sample_ids()
+    queries = []
+    for label, run in scenarios(ids):
+        recorder = QueryRecorder()
+        try:
+            with recorder.record():
+                run()
+        except Exception as e:
+            print(f"  {label}: failed ({type(e).__name__}: {e})")
+        for query in recorder.queries:
+            query['scenario'] = label
+        queries += recorder.queries
+    services = []
+    capture_services(services)
+    for query in services:
+        query['scenario'] = 'services'
+    return queries + services
+
+
+def group(queries):
+    """{fingerprint: {sql, params, count, ms, scenarios}} ordered by total time."""
+    shapes = {}
+    for query in queries:
+        if not isinstance(query['params'], (list, tuple)) or query['params'] and isinstance(query['params'][0], (list, tuple)):
+            continue  # executemany
+        key = fingerprint(query['sql'])
+        shape = shapes.setdefault(key, {
+            'sql': query['sql'], 'params': list(query['params'] or ()), 'count': 0, 'ms': 0.0, 'scenarios': set(),
+        })
+        shape['count'] += 1
+        shape['ms'] += query['ms']
+        shape['scenarios'].add(query['scenario'])
+    return OrderedDict(sorted(shapes.items(), key=lambda item: -item[1]['ms']))
+
+
+# ============== ANALYSIS ==============
+
+class Access:
+    """How one statement uses one table."""
+
+    def __init__(self, table):
+        self.table = table
+        self.equality = []      # parameterized = / IN
+        self.literal = {}       # column -> literal SQL, from "= 'x'"
+        self.ranges = []
+        self.order = []         # (column, 'ASC'|'DESC')
+        self.joins = []
+        self.read = set()
+        self.case_insensitive = []
+        self.notes = []
+
+
+def parse(sql, params):
+    """Reduce a statement to {table: Access}."""
+    text = _QUOTES.sub('', sql)
+    aliases = {}
+    for table, alias in _TABLE_REF.findall(text):
+        real = _LOWER_TABLES.get(table.lower())
+        if real is None:
+            continue
+        aliases[real.lower()] = real
+        if alias and alias.lower() not in KEYWORDS:
+            aliases[alias.lower()] = real
+    if not aliases:
+        return {}
+    driving = next(iter(aliases.values()))
+    only_table = driving if len(set(aliases.values())) == 1 else None
+    accesses = {}
+
+    def resolve(alias, column):
+        table = aliases.get(alias.lower()) if alias else only_table
+        if table and column in TABLES[table]:
+            return accesses.setdefault(table, Access(table)), column
+        return None, None
+
+    placeholders = [m.start() for m in _PLACEHOLDER.finditer(text) if m.group(0) in ('%s', '?')]
+
+    def param_at(position):
+        index = sum(1 for p in placeholders if p < position)
+        return params[index] if index < len(params) else None
+
+    for alias, column in _COLUMN_REF.findall(text):
+        access, column = resolve(alias, column)
+        if access:
+            access.read.add(column)
+
+    for match in _UPPER_EQUALS.finditer(text):
+        access, column = resolve(match.group(1), match.group(2))
+        if access and column not in access.case_insensitive:
+            access.case_insensitive.append(column)
+
+    for match in _COMPARISON.finditer(text):
+        alias, column, operator, value = match.groups()
+        access, column = resolve(alias, column)
+        if not access:
+            continue
+        operator = operator.upper()
+        access.read.add(column)
+        if operator == 'LIKE':
+            pattern = param_at(match.start(4)) if value in ('%s', '?') else value.strip("N'")
+            if isinstance(pattern, str) and pattern.startswith('%'):
+                access.notes.append(f"{column} LIKE '%...': leading wildcard, not indexable")
+            elif connection.vendor == 'sqlite' and 'ESCAPE' in text[match.end():match.end() + 20].upper():
+                # Django's iexact on SQLite
+                if column not in access.case_insensitive:
+                    access.case_insensitive.append(column)
+            elif column not in access.ranges:
+                access.ranges.append(column)
+        elif operator in ('=', 'IN'):
+            if value.startswith("'") or value.startswith("N'"):
+                access.literal[column] = value
+            elif column not in access.equality:
+                access.equality.append(column)
+        elif operator in ('>=', '<=', '>', '<') and column not in access.ranges:
+            access.ranges.append(column)
+
+    for match in _NOT_COLUMN.finditer(text):
+        # A boolean filter on SQLite: WHERE NOT verified
+        access, column = resolve(*match.groups())
+        if access and column not in access.equality:
+            access.equality.append(column)
+
+    for left_alias, left_column, right_alias, right_column in _JOIN_EQUALS.findall(text):
+        for alias, column in ((left_alias, left_column), (right_alias, right_column)):
+            access, column = resolve(alias, column)
+            if access and column not in access.joins:
+                access.joins.append(column)
+
+    order = _ORDER_BY.search(text)
+    if order:
+        for term in order.group(1).split(','):
+            parts = term.strip().split()
+            if not parts:
+                continue
+            direction = 'DESC' if 'DESC' in (part.upper() for part in parts[1:]) else 'ASC'
+            alias, _, column = parts[0].rpartition('.')
+            access, column = resolve(alias, column)
+            if access:
+                access.order.append((column, direction))
+            elif driving in accesses:
+                accesses[driving].notes.append(f"ORDER BY {parts[0]}: computed or positional, not indexable")
+                break
+    return accesses
+
+
+class Proposal:
+    def __init__(self, table, key, include=(), where=None, expression=None):
+        self.table = table
+        self.key = list(key)            # [(column, direction)]
+        self.include = set(include)
+        self.where = where              # (column, literal) or None
+        self.equality = 0               # leading key columns compared with =, in any order
+        self.expression = expression    # column for a case-insensitive index
+        self.queries = []
+        self.covered_by = None
+
+    @property
+    def columns(self):
+        return [column for column, _ in self.key]
+
+    @property
+    def name(self):
+        if self.expression:
+            return f'IX_{self.table}_{self.expression}Upper'
+        name = f"IX_{self.table}_{'_'.join(self.columns)}"
+        return f'{name}_Filtered' if self.where else name
+
+    def describe(self):
+        if self.expression:
+            return f'{self.table} (UPPER({self.expression}))'
+        key = ', '.join(f'{c} DESC' if d == 'DESC' else c for c, d in self.key)
+        text = f'{self.table} ({key})'
+        if self.include:
+            text += f" INCLUDE ({', '.join(sorted(self.include))})"
+        if self.where:
+            text += f' WHERE {self.where[0]} = {self.where[1]}'
+        return text
+
+
+def propose(access, pk_columns):
+    """Proposals for one table access; [] when a plain scan is all it needs."""
+    columns = TABLES[access.table]
+    proposals = [Proposal(access.table, (), expression=c) for c in access.case_insensitive]
+    if pk_columns and pk_columns[0] in access.equality:
+        # A primary-key lookup (or IN list) needs nothing else.
+        return proposals
+
+    key = [(c, 'ASC') for c in access.equality]
+    if access.order:
+        key += [(c, d) for c, d in access.order if c not in access.equality]
+    elif access.ranges:
+        key.append((access.ranges[0], 'ASC'))
+    where = None
+    if access.literal:
+        column, literal = next(iter(access.literal.items()))
+        where = (column, literal)
+        for extra, extra_literal in list(access.literal.items())[1:]:
+            key.insert(0, (extra, 'ASC'))
+    if not key and not where:
+        # Joined on its key only: the primary key serves it.
+        return proposals
+    if not key:
+        # Only a literal filter: an index keyed on it serves as well and can be shared.
+        key, where = [(where[0], 'ASC')], None
+
+    include = {
+        c for c in access.read
+        if c not in dict(key) and (not where or c != where[0]) and not is_large(columns[c])
+    }
+    if len(include) > MAX_INCLUDE:
+        include = set()
+    proposal = Proposal(access.table, key, include, where)
+    proposal.equality = len([c for c in access.equality if c in dict(key)])
+    proposals.append(proposal)
+    return proposals
+
+
+def merge(proposals):
+    """Fold proposals whose key is a prefix of another's (same filter) into it."""
+    merged = []
+    for proposal in sorted(proposals, key=lambda p: (p.table, -len(p.key))):
+        for other in merged:
+            if other.table != proposal.table or other.expression != proposal.expression:
+                continue
+            if proposal.expression or (
+                other.columns[:len(proposal.key)] == proposal.columns and other.where == proposal.where
+            ) or (
+                # "WHERE status = 'x'" is served by a key that starts with status
+                proposal.where and not other.where and other.columns[:1] == [proposal.where[0]]
+                and other.columns[1:1 + len(proposal.key)] == proposal.columns
+            ):
+                other.include |= proposal.include
+                other.queries += proposal.queries
+                break
+        else:
+            merged.append(proposal)
+    for proposal in merged:
+        if len(proposal.include) > MAX_INCLUDE:
+            proposal.include = set()
+        proposal.include -= set(proposal.columns)
+    return merged
+
+
+def advise(shapes):
+    proposals, notes = [], {}
+    pks = {table: [f.column for f in fields.values() if f.primary_key] for table, fields in TABLES.items()}
+    for key, shape in shapes.items():
+        if not shape['sql'].lstrip().upper().startswith('SELECT'):
+            continue
+        for table, access in parse(shape['sql'], shape['params']).items():
+            for note in access.notes:
+                notes.setdefault((table, note), set()).update(shape['scenarios'])
+            for proposal in propose(access, pks[table]):
+                proposal.queries.append(key)
+                proposals.append(proposal)
+    proposals = merge(proposals)
+
+    for proposal in proposals:
+        indexes = existing_indexes(proposal.table)
+        if proposal.expression:
+            # Expression indexes don't introspect to columns; go by the name tsql() gives them.
+            proposal.covered_by = proposal.name if proposal.name in indexes else None
+            continue
+        for name, columns in indexes.items():
+            n = proposal.equality
+            if not proposal.where and set(columns[:n]) == set(proposal.columns[:n]) \
+                    and columns[n:len(proposal.key)] == proposal.columns[n:]:
+                proposal.covered_by = name
+                break
+    return proposals, notes
+
+
+# ============== DDL ==============
+
+def tsql(proposal):
+    if proposal.expression:
+        computed = f'{proposal.expression}_upper'
+        return (
+            f"-- Case-insensitive lookups compile to UPPER({proposal.expression}) = UPPER(?); the optimizer\n"
+            f"-- matches that expression to an indexed computed column.\n"
+            f"IF COL_LENGTH('dbo.{proposal.table}', '{computed}') IS NULL\n"
+            f"BEGIN\n"
+            f"    ALTER TABLE dbo.{proposal.table} ADD {computed} AS UPPER({proposal.expression});\n"
+            f"END\nGO\n\n"
+            f"IF NOT EXISTS (\n"
+            f"    SELECT 1 FROM sys.indexes\n"
+            f"    WHERE name = '{proposal.name}' AND object_id = OBJECT_ID('dbo.{proposal.table}')\n"
+            f")\nBEGIN\n"
+            f"    CREATE INDEX {proposal.name}\n"
+            f"        ON dbo.{proposal.table} ({computed});\n"
+            f"END\nGO\n"
+        )
+    key = ', '.join(f'{c} DESC' if d == 'DESC' else c for c, d in proposal.key)
+    lines = [f"    CREATE INDEX {proposal.name}", f"        ON dbo.{proposal.table} ({key})"]
+    if proposal.include:
+        lines.append(f"        INCLUDE ({', '.join(sorted(proposal.include))})")
+    if proposal.where:
+        lines.append(f"        WHERE {proposal.where[0]} = {proposal.where[1]}")
+    lines[-1] += ';'
+    return (
+        f"IF NOT EXISTS (\n"
+        f"    SELECT 1 FROM sys.indexes\n"
+        f"    WHERE name = '{proposal.name}' AND object_id = OBJECT_ID('dbo.{proposal.table}')\n"
+        f")\nBEGIN\n" + '\n'.join(lines) + "\nEND\nGO\n"
+    )
+
+
+def sqlite_ddl(proposal):
+    if proposal.expression:
+        return f'CREATE INDEX IF NOT EXISTS "{proposal.name}" ON "{proposal.table}" ("{proposal.expression}" COLLATE NOCASE)'
+    # No INCLUDE in SQLite: trailing key columns make it covering instead.
+    key = [f'"{c}" DESC' if d == 'DESC' else f'"{c}"' for c, d in proposal.key]
+    key += [f'"{c}"' for c in sorted(proposal.include)]
+    sql = f'CREATE INDEX IF NOT EXISTS "{proposal.name}" ON "{proposal.table}" ({", ".join(key)})'
+    if proposal.where:
+        sql += f' WHERE "{proposal.where[0]}" = {proposal.where[1]}'
+    return sql
+
+
+# ============== COMPARISON ==============
+
+def runnable(sql):
+    """Services SQL uses ? placeholders; Django's cursor wants %s."""
+    return sql if '%s' in sql else _PLACEHOLDER.sub(lambda m: '%s' if m.group(0) == '?' else m.group(0), sql)
+
+
+def plan(sql, params):
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            return [row[-1] for row in cursor.fetchall()]
+        if connection.vendor == 'microsoft':
+            cursor.execute('SET SHOWPLAN_TEXT ON')
+            try:
+                cursor.execute(sql, params)
+                rows = []
+                while True:
+                    rows += [row[0].strip() for row in cursor.fetchall()]
+                    if not cursor.nextset():
+                        break
+                return [row for row in rows if row.startswith('|--')]
+            finally:
+                cursor.execute('SET SHOWPLAN_TEXT OFF')
+    return []
+
+
+def timed(sql, params, repeat):
+    samples = []
+    with connection.cursor() as cursor:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            cursor.execute(sql, params)
+            cursor.fetchall()
+            samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def execute_ddl(statements):
+    with connection.cursor() as cursor:
+        for statement in statements:
+            if connection.vendor == 'microsoft':
+                for batch in re.split(r'^GO\s*$', statement, flags=re.MULTILINE):
+                    if batch.strip():
+                        cursor.execute(batch)
+            else:
+                cursor.execute(statement)
+
+
+def drop_ddl(proposal):
+    if connection.vendor == 'microsoft':
+        return f"DROP INDEX {proposal.name} ON dbo.{proposal.table}"
+    return f'DROP INDEX IF EXISTS "{proposal.name}"'
+
+
+def compare(shapes, proposals, repeat, top, keep):
+    if connection.vendor not in ('sqlite', 'microsoft'):
+        sys.exit(f"--compare supports SQLite and SQL Server, not {connection.vendor}")
+    todo = [p for p in proposals if not p.covered_by]
+    if not todo:
+        print("Nothing to compare: every proposal is already served by an existing index.")
+        return
+    tables = {p.table for p in todo}
+    hot = [
+        (key, shape) for key, shape in shapes.items()
+        if shape['sql'].lstrip().upper().startswith('SELECT') and tables & set(parse(shape['sql'], shape['params']))
+    ][:top]
+
+    present = {p.name for p in todo if p.name in existing_indexes(p.table)}
+    created = [p for p in todo if p.name not in present]
+
+    def measure():
+        results = []
+        for _, shape in hot:
+            sql = runnable(shape['sql'])
+            timed(sql, shape['params'], 1)  # warm the cache
+            results.append((timed(sql, shape['params'], repeat), plan(sql, shape['params'])))
+        return results
+
+    if present:
+        execute_ddl([drop_ddl(p) for p in todo if p.name in present])
+    before = measure()
+    started = time.perf_counter()
+    execute_ddl([sqlite_ddl(p) if connection.vendor == 'sqlite' else tsql(p) for p in todo])
+    build = time.perf_counter() - started
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE' if connection.vendor == 'sqlite' else 'SELECT 1')
+    after = measure()
+    if not keep:
+        execute_ddl([drop_ddl(p) for p in created])
+
+    print(f"\nBefore/after {len(todo)} indexes (built in {build:.1f} s), median of {repeat} runs:\n")
+    print(f"{'before ms':>10} {'after ms':>10} {'speedup':>8}  query")
+    for (key, shape), (before_ms, before_plan), (after_ms, after_plan) in zip(hot, before, after):
+        print(f"{before_ms:>10.2f} {after_ms:>10.2f} {before_ms / max(after_ms, 1e-6):>7.1f}x  "
+              f"{', '.join(sorted(shape['scenarios']))}: {key[:110]}")
+        if before_plan != after_plan:
+            for line in before_plan:
+                print(f"{'':>32}- {line}")
+            for line in after_plan:
+                print(f"{'':>32}+ {line}")
+    state = 'kept' if keep else 'dropped again (use --keep to keep them)'
+    print(f"\nNew indexes {state}.")
+
+
+# ============== REPORT ==============
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sql', action='store_true', help='Print the proposals as an idempotent T-SQL migration')
+    parser.add_argument('--compare', action='store_true', help='Measure plans and latency with and without them')
+    parser.add_argument('--repeat', type=int, default=15)
+    parser.add_argument('--top', type=int, default=15, help='Hot SELECTs to time in --compare')
+    parser.add_argument('--keep', action='store_true', help='Keep the indexes --compare created')
+    args = parser.parse_args()
+
+    print(f"Capturing query shapes on {connection.vendor}...", file=sys.stderr)
+    shapes = group(capture())
+    proposals, notes = advise(shapes)
+
+    if args.sql:
+        print("-- Proposed by benchmarks.index_advisor. Idempotent: safe to run more than once.\n")
+        for proposal in proposals:
+            if proposal.covered_by:
+                continue
+            print(f"-- Serves: {len(proposal.queries)} query shape(s)")
+            print(tsql(proposal))
+        return
+
+    print(f"\n{len(shapes)} query shapes, hottest first:")
+    for key, shape in list(shapes.items())[:args.top]:
+        print(f"  {shape['ms']:8.2f} ms {shape['count']:>4}x  {key[:120]}")
+
+    print("\nProposed indexes:")
+    for proposal in proposals:
+        status = f"already served by {proposal.covered_by}" if proposal.covered_by else 'new'
+        print(f"  {proposal.describe()}  [{status}; {len(proposal.queries)} shape(s)]")
+    if notes:
+        print("\nNot indexable:")
+        for (table, note), labels in sorted(notes.items()):
+            print(f"  {table}: {note} ({', '.join(sorted(labels))})")
+
+    if args.compare:
+        compare(shapes, proposals, args.repeat, args.top, args.keep)
+
+
+if __name__ == '__main__':
+    main()
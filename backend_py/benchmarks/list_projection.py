@@ -0,0 +1,117 @@
+"""
+List page benchmark: full model instances vs the lean list projection.
+
+For a page of posts (or videos) this compares the query list endpoints used
+to run (``select_related('expert', 'stats')`` loading every column, including
+Post.content and Video.description) with ``ContentEngine.list_rows``, which
+selects only the columns the list serializers emit. Reported per page:
+
+- bytes: total size of the column values fetched from the database
+- ms:    time to run the query and build the page objects
+
+With ``--fields`` (e.g. card) a third row shows that sparse fieldset, and
+the JSON bytes of the encoded items are reported for lean vs sparse.
+
+Read-only; run it against a database with realistic content bodies.
+
+Usage:
+    python -m benchmarks.list_projection --type post --page-size 50 --repeat 20
+    python -m benchmarks.list_projection --type video --fields card
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.db.models import F  # noqa: E402
+
+from apps.content.encoders import dumps, encode_many  # noqa: E402
+from apps.content.engine import ContentEngine, SORT_KEYS, normalize_fields  # noqa: E402
+from apps.content.targets import TARGETS  # noqa: E402
+from apps.posts.serializers import PostListItemSerializer  # noqa: E402
+from apps.videos.serializers import VideoListItemSerializer  # noqa: E402
+
+LIST_SERIALIZERS = {'post': PostListItemSerializer, 'video': VideoListItemSerializer}
+
+
+def value_size(value) -> int:
+    if value is None:
+        return 0
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    return len(str(value).encode('utf-8'))
+
+
+def fetched_bytes(queryset) -> int:
+    """Size of the raw column values the query returns."""
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return sum(value_size(v) for row in cursor.fetchall() for v in row)
+
+
+def timed(fn, repeat: int) -> float:
+    """Median milliseconds per call."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--type', choices=sorted(TARGETS), default='post')
+    parser.add_argument('--page-size', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--fields', help='Also measure this fields= value, e.g. card')
+    args = parser.parse_args()
+
+    target = TARGETS[args.type]
+    base = ContentEngine.with_sort_keys(ContentEngine.filtered_queryset(target))
+    base = base.order_by(*SORT_KEYS['NEWEST'], '-pk')[:args.page_size]
+
+    full = base.select_related('expert', 'stats')
+    lean_rows = lambda: ContentEngine.list_rows(target, base)  # noqa: E731
+    lean_sql = base.values_list(*ContentEngine.list_columns(target))
+
+    before_bytes, after_bytes = fetched_bytes(full), fetched_bytes(lean_sql)
+    before_ms, after_ms = timed(lambda: list(full.all()), args.repeat), timed(lean_rows, args.repeat)
+
+    print(f"{args.type} list page, {args.page_size} items, median of {args.repeat} runs")
+    print(f"{'':>8} {'bytes':>12} {'ms':>10}")
+    print(f"{'before':>8} {before_bytes:>12} {before_ms:>10.2f}")
+    print(f"{'after':>8} {after_bytes:>12} {after_ms:>10.2f}")
+    if after_bytes:
+        print(f"{'ratio':>8} {before_bytes / after_bytes:>11.1f}x {before_ms / max(after_ms, 1e-9):>9.1f}x")
+
+    if args.fields:
+        fields = normalize_fields(target, args.fields)
+        sparse = ContentEngine.filtered_queryset(target)
+        sparse = (
+            ContentEngine.with_sort_keys(sparse) if 'sort_views' in ContentEngine.list_columns(target, fields)
+            else sparse.annotate(sort_published=F('published_at'))
+        ).order_by(*SORT_KEYS['NEWEST'], '-pk')[:args.page_size]
+        sparse_bytes = fetched_bytes(sparse.values_list(*ContentEngine.list_columns(target, fields)))
+        sparse_ms = timed(lambda: ContentEngine.list_rows(target, sparse, fields), args.repeat)
+        print(f"{args.fields:>8} {sparse_bytes:>12} {sparse_ms:>10.2f}")
+
+        serializer = LIST_SERIALIZERS[args.type]
+        lean_json = len(dumps(encode_many(serializer, lean_rows())))
+        sparse_json = len(dumps(encode_many(serializer, ContentEngine.list_rows(target, sparse, fields), fields)))
+        print(f"\nJSON items: {lean_json} bytes full, {sparse_json} bytes {args.fields} "
+              f"({lean_json / max(sparse_json, 1):.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+"""
+Closed-loop HTTP load test: requests per second and latency percentiles.
+
+Each of --concurrency threads keeps one keep-alive connection open and
+sends GETs back to back for --duration seconds.
+
+Against a running server:
+    python -m benchmarks.load_test --url http://localhost:8000/api/v1/feed
+
+Or start the dev server and the production entrypoint (serve.sh) one after
+the other on a spare port and compare them on the same path:
+    python -m benchmarks.load_test --compare --path /api/v1/feed --concurrency 32
+"""
+
+import argparse
+import http.client
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SERVERS = {
+    'runserver': lambda port: [sys.executable, 'manage.py', 'runserver', '--noreload', f'127.0.0.1:{port}'],
+    'gunicorn': lambda port: ['./serve.sh', 'api'],
+}
+
+
+def worker(url, deadline, latencies, errors, lock):
+    parts = urlsplit(url)
+    path = parts.path + (f'?{parts.query}' if parts.query else '')
+    connection = None
+    samples, failures = [], 0
+    while time.perf_counter() < deadline:
+        reused = connection is not None
+        if connection is None:
+            connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=10)
+        started = time.perf_counter()
+        try:
+            connection.request('GET', path)
+            response = connection.getresponse()
+            response.read()
+            if response.status >= 400:
+                failures += 1
+            else:
+                samples.append(time.perf_counter() - started)
+            if response.getheader('Connection', '').lower() == 'close':
+                connection.close()
+                connection = None
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            # An idle keep-alive connection closed by the server (e.g. a
+            # recycled worker) is retried on a new one, like a browser does.
+            if not reused:
+                failures += 1
+            connection.close()
+            connection = None
+        except (OSError, http.client.HTTPException):
+            failures += 1
+            connection.close()
+            connection = None
+    if connection is not None:
+        connection.close()
+    with lock:
+        latencies.extend(samples)
+        errors.append(failures)
+
+
+def run_load(url, concurrency, duration):
+    latencies, errors, lock = [], [], threading.Lock()
+    deadline = time.perf_counter() + duration
+    threads = [
+        threading.Thread(target=worker, args=(url, deadline, latencies, errors, lock))
+        for _ in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    latencies.sort()
+
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else 0.0
+
+    return {
+        'rps': len(latencies) / duration,
+        'p50': percentile(0.50),
+        'p95': percentile(0.95),
+        'p99': percentile(0.99),
+        'mean': statistics.mean(latencies) * 1000 if latencies else 0.0,
+        'errors': sum(errors),
+    }
+
+
+def wait_for_port(port, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with socket.socket() as sock:
+            if sock.connect_ex(('127.0.0.1', port)) == 0:
+                return True
+        time.sleep(0.2)
+    return False
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def report(label, result):
+    print(f"{label:<12} {result['rps']:>9.1f} {result['p50']:>8.1f} {result['p95']:>8.1f} "
+          f"{result['p99']:>8.1f} {result['errors']:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='Target URL of an already running server')
+    parser.add_argument('--compare', action='store_true', help='Start runserver, then serve.sh api, and load both')
+    parser.add_argument('--path', default='/api/v1/feed', help='Path to load in --compare mode')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=15.0)
+    parser.add_argument('--warmup', type=float, default=2.0)
+    args = parser.parse_args()
+    if not args.url and not args.compare:
+        parser.error('pass --url or --compare')
+
+    header = f"{'server':<12} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}"
+    if args.url:
+        run_load(args.url, args.concurrency, args.warmup)
+        print(header)
+        report('target', run_load(args.url, args.concurrency, args.duration))
+        return
+
+    print(header)
+    for label, command in SERVERS.items():
+        port = free_port()
+        env = {**os.environ, 'PORT': str(port), 'GUNICORN_BIND': f'127.0.0.1:{port}', 'GUNICORN_ACCESS_LOG': ''}
+        process = subprocess.Popen(
+            command(port), cwd=BACKEND_DIR, env=env,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True,
+        )
+        try:
+            if not wait_for_port(port):
+                print(f"{label:<12} did not start")
+                continue
+            url = f'http://127.0.0.1:{port}{args.path}'
+            run_load(url, args.concurrency, args.warmup)
+            report(label, run_load(url, args.concurrency, args.duration))
+        finally:
+            os.killpg(process.pid, signal.SIGTERM)
+            process.wait(timeout=30)
+
+
+if __name__ == '__main__':
+    main()
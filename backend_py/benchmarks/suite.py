@@ -0,0 +1,381 @@
+"""
+Benchmark suite: scripted workloads against running services, with latency
+percentiles and throughput saved per commit and compared between runs.
+
+Workloads (each runs on its own for --duration seconds after a warmup,
+with --concurrency closed-loop clients on keep-alive connections):
+
+- feed:   scroll sessions, pages 1-5 of /api/v1/feed with a random sort/type
+- detail: post/video detail pages, skewed towards popular items
+- search: /api/search on the services app (8002) with dataset vocabulary
+- likes:  like/unlike storm from many users on the 20 hottest items
+- chat:   /chat/send on the services app; run it against fake-gemini below
+          unless you mean to benchmark (and pay for) the real API
+
+Ids, users and search terms come from the manifest benchmarks.datagen
+writes, so fill the database with it first. Reports record the git commit,
+the dataset and the run settings next to the numbers.
+
+Usage:
+    python -m benchmarks.datagen --seed 42
+    python -m benchmarks.suite run --api http://127.0.0.1:8000 --services http://127.0.0.1:8002
+    python -m benchmarks.suite compare results/base.json results/head.json --threshold 10
+
+    # chat without calling Google: start the stand-in, then the services
+    # app with GEMINI_BASE_URL=http://127.0.0.1:8099 GEMINI_API_KEY=bench
+    python -m benchmarks.suite fake-gemini --port 8099 --latency 0.8
+"""
+
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import quote, urlsplit
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+DEFAULT_MANIFEST = os.path.join(RESULTS_DIR, 'dataset.json')
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# ============== WORKLOADS ==============
+# Each workload is an endless generator of (service, method, path, body, headers)
+# for one client; the rng is per client, so runs are repeatable.
+
+def skewed_index(rng: random.Random, n: int, skew: float = 3.0) -> int:
+    """Index in [0, n) biased towards 0 (the popular end)."""
+    return min(n - 1, int(n * rng.random() ** skew))
+
+
+def random_user(rng, data) -> str:
+    return str(rng.randint(*data['userIdRange']))
+
+
+def feed_scroll(rng, data):
+    while True:
+        sort = rng.choice(('TRENDING', 'NEWEST', 'MOST_VIEWED'))
+        types = rng.choice(('', '&types=post', '&types=video'))
+        for page in range(1, rng.randint(2, 6)):
+            yield 'api', 'GET', f'/api/v1/feed?sort={sort}&page={page}&pageSize=10{types}', None, {}
+
+
+def detail_views(rng, data):
+    while True:
+        kind = rng.choice(('post', 'video'))
+        ids = data['popularPostIds'] if kind == 'post' else data['popularVideoIds']
+        content_id = ids[skewed_index(rng, len(ids))]
+        yield 'api', 'GET', f'/api/v1/{kind}s/{content_id}', None, {'X-User-Id': random_user(rng, data)}
+
+
+def search(rng, data):
+    while True:
+        term = rng.choice(data['searchTerms'])
+        yield 'services', 'GET', f'/api/search?q={quote(term)}&limit=20', None, {}
+
+
+def like_storm(rng, data):
+    hot = {
+        'post': data['popularPostIds'][:20],
+        'video': data['popularVideoIds'][:20],
+    }
+    while True:
+        kind = rng.choice(('post', 'video'))
+        content_id = rng.choice(hot[kind])
+        body = {'liked': rng.random() < 0.7}
+        yield 'api', 'POST', f'/api/v1/{kind}s/{content_id}/like', body, {'X-User-Id': random_user(rng, data)}
+
+
+def chat(rng, data):
+    while True:
+        term = rng.choice(data['searchTerms'])
+        yield 'services', 'POST', '/chat/send', {'message': f'{term} co anh huong gi den chu ky?'}, {}
+
+
+WORKLOADS = {
+    'feed': feed_scroll,
+    'detail': detail_views,
+    'search': search,
+    'likes': like_storm,
+    'chat': chat,
+}
+DEFAULT_WORKLOADS = ('feed', 'detail', 'search', 'likes')
+SERVICES = {'feed': 'api', 'detail': 'api', 'search': 'services', 'likes': 'api', 'chat': 'services'}
+
+
+# ============== LOAD GENERATOR ==============
+
+def client(requests, targets, deadline, results, lock):
+    """Closed loop: send the next request as soon as the previous one returns."""
+    connections = {}
+    samples, statuses = [], {}
+    while time.perf_counter() < deadline:
+        service, method, path, body, headers = next(requests)
+        host, port = targets[service]
+        reused = service in connections
+        if not reused:
+            connections[service] = http.client.HTTPConnection(host, port, timeout=30)
+        connection = connections[service]
+        payload = json.dumps(body).encode() if body is not None else None
+        if payload is not None:
+            headers = {**headers, 'Content-Type': 'application/json'}
+        started = time.perf_counter()
+        try:
+            connection.request(method, path, body=payload, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            elapsed = time.perf_counter() - started
+            status = str(response.status)
+            if response.status < 400:
+                samples.append(elapsed)
+            if response.getheader('Connection', '').lower() == 'close':
+                connections.pop(service).close()
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            # An idle keep-alive connection closed by the server (e.g. a
+            # recycled worker) is retried on a new one, like a browser does.
+            connections.pop(service).close()
+            if reused:
+                continue
+            status = 'disconnected'
+        except (OSError, http.client.HTTPException) as e:
+            connections.pop(service).close()
+            status = type(e).__name__
+        statuses[status] = statuses.get(status, 0) + 1
+    for connection in connections.values():
+        connection.close()
+    with lock:
+        results['latencies'].extend(samples)
+        for status, n in statuses.items():
+            results['statuses'][status] = results['statuses'].get(status, 0) + n
+
+
+def percentile(ordered, p: float) -> float:
+    """Nearest-rank percentile of an ascending list, in milliseconds."""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))] * 1000
+
+
+def run_workload(name, data, targets, concurrency, duration, seed):
+    results = {'latencies': [], 'statuses': {}}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+    threads = [
+        threading.Thread(
+            target=client,
+            args=(WORKLOADS[name](random.Random(f'{seed}:{name}:{n}'), data), targets, deadline, results, lock),
+        )
+        for n in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    latencies = sorted(results['latencies'])
+    total = sum(results['statuses'].values())
+    return {
+        'requests': total,
+        'errors': total - len(latencies),
+        'rps': round(len(latencies) / duration, 2),
+        'p50': round(percentile(latencies, 0.50), 3),
+        'p90': round(percentile(latencies, 0.90), 3),
+        'p95': round(percentile(latencies, 0.95), 3),
+        'p99': round(percentile(latencies, 0.99), 3),
+        'max': round(latencies[-1] * 1000, 3) if latencies else 0.0,
+        'mean': round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+        'statuses': dict(sorted(results['statuses'].items())),
+    }
+
+
+def reachable(host, port) -> bool:
+    with socket.socket() as sock:
+        sock.settimeout(2)
+        return sock.connect_ex((host, port)) == 0
+
+
+def git_revision():
+    def git(*args):
+        return subprocess.run(
+            ['git', *args], cwd=BACKEND_DIR, capture_output=True, text=True
+        ).stdout.strip()
+    return git('rev-parse', 'HEAD') or 'unknown', bool(git('status', '--porcelain', '--untracked-files=no'))
+
+
+HEADER = f"{'workload':<10} {'req/s':>9} {'p50 ms':>8} {'p90 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>9} {'errors':>7}"
+
+
+def print_row(name, result):
+    print(f"{name:<10} {result['rps']:>9.1f} {result['p50']:>8.1f} {result['p90']:>8.1f} "
+          f"{result['p95']:>8.1f} {result['p99']:>8.1f} {result['max']:>9.1f} {result['errors']:>7}")
+
+
+def run(args):
+    with open(args.manifest) as fh:
+        data = json.load(fh)
+    targets = {}
+    for service, url in (('api', args.api), ('services', args.services)):
+        parts = urlsplit(url)
+        targets[service] = (parts.hostname, parts.port or 80)
+    names = [name.strip() for name in args.workloads.split(',') if name.strip()]
+    unknown = sorted(set(names) - set(WORKLOADS))
+    if unknown:
+        sys.exit(f"Unknown workloads: {', '.join(unknown)} (choose from {', '.join(WORKLOADS)})")
+
+    commit, dirty = git_revision()
+    report = {
+        'commit': commit,
+        'dirty': dirty,
+        'createdAt': datetime.now(timezone.utc).isoformat(),
+        'host': platform.node(),
+        'python': platform.python_version(),
+        'dataset': {'seed': data.get('seed'), 'vendor': data.get('vendor'), **data.get('counts', {})},
+        'config': {
+            'api': args.api, 'services': args.services, 'concurrency': args.concurrency,
+            'duration': args.duration, 'warmup': args.warmup, 'seed': args.seed,
+        },
+        'workloads': {},
+    }
+
+    print(f"commit {commit[:10]}{' (dirty)' if dirty else ''}, {args.concurrency} clients, {args.duration:g} s per workload")
+    print(HEADER)
+    for name in names:
+        if not reachable(*targets[SERVICES[name]]):
+            print(f"{name:<10} skipped: {SERVICES[name]} is not listening on {':'.join(map(str, targets[SERVICES[name]]))}")
+            continue
+        if args.warmup:
+            run_workload(name, data, targets, args.concurrency, args.warmup, f'warmup:{args.seed}')
+        result = run_workload(name, data, targets, args.concurrency, args.duration, args.seed)
+        report['workloads'][name] = result
+        print_row(name, result)
+
+    out = args.out or os.path.join(
+        RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{commit[:10]}{'-dirty' if dirty else ''}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, 'w') as fh:
+        json.dump(report, fh, indent=2)
+    print(f"Report written to {out}")
+
+
+# ============== COMPARISON ==============
+
+def change(base: float, head: float) -> float:
+    return (head - base) / base * 100 if base else 0.0
+
+
+def compare(args):
+    with open(args.base) as fh:
+        base = json.load(fh)
+    with open(args.head) as fh:
+        head = json.load(fh)
+
+    print(f"base {base['commit'][:10]}{' (dirty)' if base.get('dirty') else ''}  ->  "
+          f"head {head['commit'][:10]}{' (dirty)' if head.get('dirty') else ''}")
+    if base.get('dataset') != head.get('dataset') or base.get('config', {}).get('concurrency') != head.get('config', {}).get('concurrency'):
+        print("warning: the runs used different datasets or concurrency; numbers are not directly comparable")
+    print(f"{'workload':<10} " + ' '.join(f"{label:>24}" for label in ('req/s', 'p50 ms', 'p95 ms', 'p99 ms')))
+
+    regressions = []
+    for name in [n for n in head['workloads'] if n in base['workloads']]:
+        b, h = base['workloads'][name], head['workloads'][name]
+        cells = []
+        for metric in ('rps', 'p50', 'p95', 'p99'):
+            delta = change(b[metric], h[metric])
+            cells.append(f"{b[metric]:.1f} -> {h[metric]:.1f} ({delta:+.0f}%)")
+        # Throughput should not drop and tail latency should not rise.
+        if change(b['rps'], h['rps']) < -args.threshold:
+            regressions.append(f"{name}: req/s {change(b['rps'], h['rps']):+.1f}%")
+        if change(b['p95'], h['p95']) > args.threshold:
+            regressions.append(f"{name}: p95 {change(b['p95'], h['p95']):+.1f}%")
+        if h['errors'] > b['errors']:
+            regressions.append(f"{name}: errors {b['errors']} -> {h['errors']}")
+        print(f"{name:<10} " + ' '.join(f"{cell:>24}" for cell in cells))
+
+    if regressions:
+        print(f"\nRegressions beyond {args.threshold:g}%:")
+        for line in regressions:
+            print(f"  {line}")
+        if args.fail_on_regression:
+            sys.exit(1)
+    else:
+        print(f"\nNo regressions beyond {args.threshold:g}%.")
+
+
+# ============== GEMINI STAND-IN ==============
+
+class FakeGeminiHandler(BaseHTTPRequestHandler):
+    """Answers generateContent after a fixed delay, with plausible token usage."""
+
+    latency = 0.8
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        time.sleep(self.latency * random.uniform(0.8, 1.2))
+        payload = json.dumps({
+            'candidates': [{'content': {'role': 'model', 'parts': [{'text': 'Cam on ban da hoi. ' * 20}]}}],
+            'usageMetadata': {'promptTokenCount': len(body) // 4, 'candidatesTokenCount': 120},
+        }).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def fake_gemini(args):
+    FakeGeminiHandler.latency = args.latency
+    server = ThreadingHTTPServer(('127.0.0.1', args.port), FakeGeminiHandler)
+    print(f"Fake Gemini on http://127.0.0.1:{args.port} ({args.latency:g} s per reply); Ctrl+C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='Run workloads and save a report')
+    run_parser.add_argument('--api', default='http://127.0.0.1:8000', help='Django API base URL')
+    run_parser.add_argument('--services', default='http://127.0.0.1:8002', help='Search/chat service base URL')
+    run_parser.add_argument('--workloads', default=','.join(DEFAULT_WORKLOADS),
+                            help=f"Comma-separated, from {', '.join(WORKLOADS)}")
+    run_parser.add_argument('--concurrency', type=int, default=16)
+    run_parser.add_argument('--duration', type=float, default=20.0, help='Seconds per workload')
+    run_parser.add_argument('--warmup', type=float, default=3.0, help='Unrecorded seconds before each workload')
+    run_parser.add_argument('--seed', type=int, default=1)
+    run_parser.add_argument('--manifest', default=DEFAULT_MANIFEST)
+    run_parser.add_argument('--out', help='Report path (default results/<time>-<commit>.json)')
+    run_parser.set_defaults(handler=run)
+
+    compare_parser = commands.add_parser('compare', help='Compare two reports')
+    compare_parser.add_argument('base')
+    compare_parser.add_argument('head')
+    compare_parser.add_argument('--threshold', type=float, default=10.0, help='Percent change flagged as a regression')
+    compare_parser.add_argument('--fail-on-regression', action='store_true', help='Exit 1 on regressions (for CI)')
+    compare_parser.set_defaults(handler=compare)
+
+    gemini_parser = commands.add_parser('fake-gemini', help='Serve a local Gemini stand-in for the chat workload')
+    gemini_parser.add_argument('--port', type=int, default=8099)
+    gemini_parser.add_argument('--latency', type=float, default=0.8, help='Seconds per reply')
+    gemini_parser.set_defaults(handler=fake_gemini)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == '__main__':
+    main()
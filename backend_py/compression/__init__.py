@@ -0,0 +1,12 @@
+"""
+Response compression shared by the Django API and the FastAPI services.
+
+JSON bodies are already minified: DRF's JSONRenderer and the orjson path in
+apps.content.encoders emit compact separators, and FastAPI's JSONResponse
+does the same. On top of that, compression.django and compression.fastapi
+encode eligible bodies with brotli or gzip. See core.py for the thresholds,
+the compressed-body cache and the per-size-class bytes/CPU metrics, and
+benchmarks.compression to measure them.
+"""
+
+from .core import choose_encoding, compress  # noqa: F401
@@ -0,0 +1,167 @@
+"""
+Encoding negotiation, compression and the compressed-payload cache.
+
+Configured from the environment, so the Django API and the FastAPI services
+share one policy:
+
+- COMPRESSION_ENABLED (1): 0 passes every response through untouched.
+- COMPRESSION_MIN_BYTES (1024): smaller bodies aren't worth the CPU and,
+  below about one TCP segment, save no round trip.
+- COMPRESSION_GZIP_LEVEL (6) and COMPRESSION_BROTLI_QUALITY (5): the
+  bytes/CPU trade-off. Measure alternatives with benchmarks.compression.
+- COMPRESSION_CACHE_BYTES (8 MB): per-process LRU of compressed bodies of
+  cacheable responses, i.e. those with an ETag or a public max-age, such
+  as the tag catalog and FAQ lists. Repeats of the same body cost a hash
+  instead of a compression.
+
+Brotli is used when the ``brotli`` package is installed and the client
+accepts it; otherwise gzip.
+"""
+
+import gzip
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from metrics import counter, histogram
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional, gzip only without it
+    brotli = None
+
+ENABLED = os.getenv('COMPRESSION_ENABLED', '1') == '1'
+MIN_BYTES = int(os.getenv('COMPRESSION_MIN_BYTES', 1024))
+GZIP_LEVEL = int(os.getenv('COMPRESSION_GZIP_LEVEL', 6))
+BROTLI_QUALITY = int(os.getenv('COMPRESSION_BROTLI_QUALITY', 5))
+CACHE_BYTES = int(os.getenv('COMPRESSION_CACHE_BYTES', 8 * 1024 * 1024))
+
+COMPRESSIBLE_TYPES = frozenset({
+    'application/json',
+    'application/javascript',
+    'application/vnd.oai.openapi',
+    'application/vnd.oai.openapi+json',
+    'application/xml',
+    'image/svg+xml',
+    'text/css',
+    'text/html',
+    'text/javascript',
+    'text/plain',
+})
+
+SIZE_CLASSES = ((1024, '<1k'), (10 * 1024, '1k-10k'), (100 * 1024, '10k-100k'))
+
+BYTES = counter(
+    'http_compression_bytes_total', 'Response body bytes before (raw) and after (wire) compression',
+    ('encoding', 'size_class', 'stage'),
+)
+SECONDS = histogram(
+    'http_compression_seconds', 'CPU time compressing one response body', ('encoding', 'size_class'),
+    buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1),
+)
+CACHE = counter('http_compression_cache_total', 'Compressed-body cache lookups', ('result',))
+
+
+def size_class(size: int) -> str:
+    for limit, label in SIZE_CLASSES:
+        if size < limit:
+            return label
+    return '100k+'
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """'br', 'gzip' or None for an Accept-Encoding header, honouring q=0."""
+    accepted = {}
+    for part in accept_encoding.lower().split(','):
+        coding, _, params = part.strip().partition(';')
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding:
+            accepted[coding] = q
+    wildcard = accepted.get('*', 0.0)
+    for coding in (('br', 'gzip') if brotli else ('gzip',)):
+        if accepted.get(coding, wildcard) > 0:
+            return coding
+    return None
+
+
+def is_compressible(content_type: str, length: int) -> bool:
+    return ENABLED and length >= MIN_BYTES and content_type.split(';')[0].strip().lower() in COMPRESSIBLE_TYPES
+
+
+def is_cacheable(etag: Optional[str], cache_control: str) -> bool:
+    cache_control = cache_control.lower()
+    if 'no-store' in cache_control or 'private' in cache_control:
+        return False
+    return bool(etag) or ('public' in cache_control and 'max-age' in cache_control)
+
+
+def _encode(body: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    # mtime=0: identical bodies give identical bytes.
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+class CompressedCache:
+    """Byte-bounded LRU of (body digest, encoding) -> compressed body."""
+
+    _lock = threading.Lock()
+    _entries: 'OrderedDict[Tuple[bytes, str], bytes]' = OrderedDict()
+    _size = 0
+
+    @classmethod
+    def get(cls, key) -> Optional[bytes]:
+        with cls._lock:
+            value = cls._entries.get(key)
+            if value is not None:
+                cls._entries.move_to_end(key)
+            return value
+
+    @classmethod
+    def put(cls, key, value: bytes) -> None:
+        if len(value) > CACHE_BYTES // 4:
+            return
+        with cls._lock:
+            if key in cls._entries:
+                return
+            cls._entries[key] = value
+            cls._size += len(value)
+            while cls._size > CACHE_BYTES:
+                _, evicted = cls._entries.popitem(last=False)
+                cls._size -= len(evicted)
+
+    @classmethod
+    def clear(cls) -> None:
+        with cls._lock:
+            cls._entries.clear()
+            cls._size = 0
+
+
+def compress(body: bytes, encoding: str, cacheable: bool = False) -> bytes:
+    """``body`` in ``encoding``, recording sizes and CPU time per size class."""
+    label = size_class(len(body))
+    key = None
+    compressed = None
+    if cacheable and CACHE_BYTES:
+        key = (hashlib.blake2b(body, digest_size=16).digest(), encoding)
+        compressed = CompressedCache.get(key)
+        CACHE.inc(result='hit' if compressed is not None else 'miss')
+    if compressed is None:
+        started = time.process_time()
+        compressed = _encode(body, encoding)
+        SECONDS.observe(time.process_time() - started, encoding=encoding, size_class=label)
+        if key is not None:
+            CompressedCache.put(key, compressed)
+    BYTES.inc(len(body), encoding=encoding, size_class=label, stage='raw')
+    BYTES.inc(len(compressed), encoding=encoding, size_class=label, stage='wire')
+    return compressed
@@ -0,0 +1,46 @@
+"""
+Django integration: replaces django.middleware.gzip.GZipMiddleware with
+brotli support, the shared size/content-type thresholds and the
+compressed-body cache.
+
+Enable with 'compression.django.CompressionMiddleware' near the top of
+MIDDLEWARE, above anything that reads or rewrites the response body.
+"""
+
+from django.utils.cache import patch_vary_headers
+
+from .core import choose_encoding, compress, is_cacheable, is_compressible
+
+
+class CompressionMiddleware:
+    """Compress eligible responses in the best encoding the client accepts."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if response.streaming or response.has_header('Content-Encoding') or response.status_code in (204, 206, 304):
+            return response
+        if not is_compressible(response.get('Content-Type', ''), len(response.content)):
+            return response
+
+        # Caches must key on Accept-Encoding even when this client gets identity.
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if 'no-transform' in response.get('Cache-Control', '').lower():
+            return response
+        encoding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        etag = response.get('ETag')
+        body = compress(response.content, encoding, is_cacheable(etag, response.get('Cache-Control', '')))
+        if len(body) >= len(response.content):
+            return response
+        response.content = body
+        response['Content-Length'] = str(len(body))
+        response['Content-Encoding'] = encoding
+        if etag and not etag.startswith('W/'):
+            # The compressed bytes are a different representation (RFC 9110 8.8.3).
+            response['ETag'] = 'W/' + etag
+        return response
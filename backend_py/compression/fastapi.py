@@ -0,0 +1,69 @@
+"""
+FastAPI integration: response compression for the auth and search services.
+
+    from compression.fastapi import compress_responses
+    compress_responses(app)
+
+Replaces starlette's GZipMiddleware with brotli support, the shared
+thresholds and the compressed-body cache. Single-message bodies (every
+JSONResponse) are compressed. Streaming responses pass through unchanged.
+"""
+
+from fastapi import FastAPI
+from starlette.datastructures import Headers, MutableHeaders
+
+from .core import choose_encoding, compress, is_cacheable, is_compressible
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware; holds back the response start until the body is known."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get('accept-encoding', ''))
+        start = {}
+
+        async def send_compressed(message):
+            if message['type'] == 'http.response.start':
+                start.update(message)
+                return
+            if not start:
+                await send(message)
+                return
+            headers = MutableHeaders(raw=start['headers'])
+            body = message.get('body', b'')
+            eligible = (
+                not message.get('more_body', False)
+                and 'content-encoding' not in headers
+                and start['status'] not in (204, 206, 304)
+                and is_compressible(headers.get('content-type', ''), len(body))
+            )
+            if eligible:
+                headers.add_vary_header('Accept-Encoding')
+                if encoding and 'no-transform' not in headers.get('cache-control', '').lower():
+                    compressed = compress(
+                        body, encoding, is_cacheable(headers.get('etag'), headers.get('cache-control', ''))
+                    )
+                    if len(compressed) < len(body):
+                        body = compressed
+                        headers['Content-Encoding'] = encoding
+                        headers['Content-Length'] = str(len(body))
+                        etag = headers.get('etag')
+                        if etag and not etag.startswith('W/'):
+                            headers['ETag'] = 'W/' + etag
+                message = {**message, 'body': body}
+            await send(start)
+            start.clear()
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
+
+
+def compress_responses(app: FastAPI) -> None:
+    """Compress ``app``'s eligible responses."""
+    app.add_middleware(CompressionMiddleware)
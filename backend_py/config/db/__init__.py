@@ -0,0 +1,7 @@
+"""
+Database connection lifecycle for the Django API.
+
+``config.db.mssql`` is the mssql-django backend plus connection metrics and
+an optional bounded pool (see pool.py). settings.DATABASES selects it, or
+``config.db.sqlite`` for the local SQLite stand-in (DB_ENGINE=sqlite).
+"""
@@ -0,0 +1,9 @@
+"""mssql-django with connection metrics and the optional shared pool."""
+
+from mssql.base import DatabaseWrapper as MSSQLDatabaseWrapper
+
+from ..pool import PooledConnectionMixin
+
+
+class DatabaseWrapper(PooledConnectionMixin, MSSQLDatabaseWrapper):
+    pass
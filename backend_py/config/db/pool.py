@@ -0,0 +1,261 @@
+"""
+Connection pool and connection metrics shared by the config.db backends.
+
+Without a pool, Django keeps one persistent connection per thread
+(CONN_MAX_AGE) and health-checks it at the start of each request
+(CONN_HEALTH_CHECKS). That suits WSGI workers, whose threads live for the
+whole process. Under ASGI every request runs its sync code on a fresh
+thread, so per-thread connections are never reused: set
+``DATABASES[alias]['POOL']`` (DB_POOL_SIZE in settings) to share a bounded
+set of connections between all threads of the process instead. Django then
+"closes" its connection at the end of each request, which hands it back to
+the pool.
+
+Pooled connections are handed out warmest first, checked with SELECT 1 when
+they sat idle longer than CHECK_IDLE seconds, and replaced once older than
+MAX_LIFETIME. When all SIZE connections are busy, callers wait up to TIMEOUT
+seconds and then get an OperationalError.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from django.core.signals import request_started
+from django.db import OperationalError, connections
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionStats:
+    """Process-wide connection counters (opens, reuses, pool waits...)."""
+
+    _lock = threading.Lock()
+    _counters = {
+        'opens': 0,
+        'open_seconds': 0.0,
+        'reuses': 0,
+        'closes': 0,
+        'health_check_failures': 0,
+        'pool_waits': 0,
+        'pool_wait_seconds': 0.0,
+        'pool_wait_max_seconds': 0.0,
+        'pool_timeouts': 0,
+    }
+
+    @classmethod
+    def incr(cls, name: str, amount=1) -> None:
+        with cls._lock:
+            cls._counters[name] += amount
+
+    @classmethod
+    def record_open(cls, seconds: float) -> None:
+        with cls._lock:
+            cls._counters['opens'] += 1
+            cls._counters['open_seconds'] += seconds
+
+    @classmethod
+    def record_wait(cls, seconds: float) -> None:
+        with cls._lock:
+            cls._counters['pool_waits'] += 1
+            cls._counters['pool_wait_seconds'] += seconds
+            cls._counters['pool_wait_max_seconds'] = max(cls._counters['pool_wait_max_seconds'], seconds)
+
+    @classmethod
+    def snapshot(cls) -> Dict[str, Any]:
+        with cls._lock:
+            data = dict(cls._counters)
+        data['pools'] = {alias: pool.status() for alias, pool in list(_pools.items())}
+        return data
+
+
+class _Entry:
+    __slots__ = ('raw', 'created_at', 'last_used')
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.created_at = self.last_used = time.monotonic()
+
+
+class ConnectionPool:
+    """Bounded LIFO pool of raw DB-API connections for one database alias."""
+
+    def __init__(self, size: int, timeout: float = 10.0, max_lifetime: float = 1800.0, check_idle: float = 30.0):
+        self.size = size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.check_idle = check_idle
+        self.pid = os.getpid()
+        self._cond = threading.Condition()
+        self._idle: List[_Entry] = []
+        self._in_use: Dict[int, _Entry] = {}
+        self._opening = 0
+
+    def status(self) -> Dict[str, int]:
+        with self._cond:
+            return {'size': self.size, 'idle': len(self._idle), 'inUse': len(self._in_use)}
+
+    def _total(self) -> int:
+        return len(self._idle) + len(self._in_use) + self._opening
+
+    def acquire(self, connect: Callable[[], Any], is_usable: Callable[[Any], bool]):
+        deadline = time.monotonic() + self.timeout
+        waited_from = None
+        while True:
+            entry = None
+            with self._cond:
+                while True:
+                    if self._idle:
+                        entry = self._idle.pop()
+                        self._in_use[id(entry.raw)] = entry
+                        break
+                    if self._total() < self.size:
+                        self._opening += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        ConnectionStats.incr('pool_timeouts')
+                        raise OperationalError(
+                            f"Database connection pool exhausted ({self.size} in use for {self.timeout:g}s)"
+                        )
+                    if waited_from is None:
+                        waited_from = time.monotonic()
+                    self._cond.wait(remaining)
+            if waited_from is not None:
+                ConnectionStats.record_wait(time.monotonic() - waited_from)
+                waited_from = None
+
+            if entry is None:
+                try:
+                    raw = connect()
+                except Exception:
+                    with self._cond:
+                        self._opening -= 1
+                        self._cond.notify()
+                    raise
+                entry = _Entry(raw)
+                with self._cond:
+                    self._opening -= 1
+                    self._in_use[id(raw)] = entry
+                return raw
+
+            now = time.monotonic()
+            if now - entry.created_at >= self.max_lifetime:
+                self._discard(entry)
+                continue
+            if now - entry.last_used >= self.check_idle and not is_usable(entry.raw):
+                ConnectionStats.incr('health_check_failures')
+                self._discard(entry)
+                continue
+            ConnectionStats.incr('reuses')
+            return entry.raw
+
+    def release(self, raw, discard: bool = False) -> bool:
+        """Return ``raw`` to the pool; False if it does not belong here."""
+        with self._cond:
+            entry = self._in_use.get(id(raw))
+        if entry is None or entry.raw is not raw:
+            return False
+        if discard or time.monotonic() - entry.created_at >= self.max_lifetime:
+            self._discard(entry)
+            return True
+        try:
+            raw.rollback()
+        except Exception:
+            self._discard(entry)
+            return True
+        entry.last_used = time.monotonic()
+        with self._cond:
+            del self._in_use[id(raw)]
+            self._idle.append(entry)
+            self._cond.notify()
+        return True
+
+    def _discard(self, entry: _Entry) -> None:
+        with self._cond:
+            self._in_use.pop(id(entry.raw), None)
+            self._cond.notify()
+        ConnectionStats.incr('closes')
+        try:
+            entry.raw.close()
+        except Exception:
+            logger.debug("Error closing pooled connection", exc_info=True)
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias: str, settings_dict: Dict[str, Any]) -> Optional[ConnectionPool]:
+    """The pool for ``alias``, or None when pooling is off for it."""
+    options = settings_dict.get('POOL')
+    if not options:
+        return None
+    pool = _pools.get(alias)
+    # A pool inherited across fork (gunicorn preload) holds the parent's
+    # sockets; start a fresh one in each worker.
+    if pool is None or pool.pid != os.getpid():
+        with _pools_lock:
+            pool = _pools.get(alias)
+            if pool is None or pool.pid != os.getpid():
+                pool = _pools[alias] = ConnectionPool(
+                    size=int(options.get('SIZE', 10)),
+                    timeout=float(options.get('TIMEOUT', 10)),
+                    max_lifetime=float(options.get('MAX_LIFETIME', 1800)),
+                    check_idle=float(options.get('CHECK_IDLE', 30)),
+                )
+    return pool
+
+
+class PooledConnectionMixin:
+    """
+    DatabaseWrapper mixin: counts connection opens/reuses and, when the
+    database has a POOL, takes raw connections from it instead of opening
+    one per connect() and gives them back on close().
+    """
+
+    def get_new_connection(self, conn_params):
+        pool = get_pool(self.alias, self.settings_dict)
+        if pool is None:
+            return self._open_connection(conn_params)
+        return pool.acquire(lambda: self._open_connection(conn_params), self._raw_is_usable)
+
+    def _open_connection(self, conn_params):
+        started = time.perf_counter()
+        raw = super().get_new_connection(conn_params)
+        ConnectionStats.record_open(time.perf_counter() - started)
+        return raw
+
+    @staticmethod
+    def _raw_is_usable(raw) -> bool:
+        try:
+            cursor = raw.cursor()
+            try:
+                cursor.execute('SELECT 1')
+                cursor.fetchall()
+            finally:
+                cursor.close()
+        except Exception:
+            return False
+        return True
+
+    def _close(self):
+        pool = get_pool(self.alias, self.settings_dict)
+        if pool is not None and self.connection is not None:
+            discard = self.errors_occurred and not self._raw_is_usable(self.connection)
+            if pool.release(self.connection, discard=discard):
+                return
+        ConnectionStats.incr('closes')
+        return super()._close()
+
+
+def count_reused_connections(**kwargs):
+    """At request start, a still-open persistent connection is a reuse."""
+    for connection in connections.all(initialized_only=True):
+        if isinstance(connection, PooledConnectionMixin) and connection.connection is not None:
+            ConnectionStats.incr('reuses')
+
+
+request_started.connect(count_reused_connections, dispatch_uid='config-db-count-reuses')
@@ -0,0 +1,204 @@
+"""
+Read replicas for the Django API.
+
+DB_REPLICAS adds one ``replica_N`` database per entry. Entries are SQL
+Server hosts, or file paths with DB_ENGINE=sqlite. ReplicaRouter sends
+reads to a replica only where that is known to be safe:
+
+- The request is a GET/HEAD to an endpoint listed in
+  settings.DB_REPLICA_ENDPOINTS, i.e. URL name -> the most lag, in seconds,
+  the endpoint tolerates. Outside requests, code can opt in with
+  ``with use_replica(max_lag): ...``.
+- The replica is no further behind than that. Lag is measured with the
+  ReplicaHeartbeat row (apps.content). Each process stamps time.time()
+  on the primary at most every DB_REPLICA_CHECK_SECONDS. It then reads the
+  row back from each replica, and now minus the replica's stamp is the
+  replica's lag, to within one check interval. A replica that errors or
+  falls behind gets no reads until a later check finds it healthy again;
+  those reads go to the primary.
+- The client hasn't written recently (read-your-writes). A successful
+  POST/PUT/PATCH/DELETE (a like, a signup...) pins the client to the
+  primary for DB_REPLICA_PIN_SECONDS. The pin is held by a cookie and, for
+  X-User-Id callers, in the shared cache (CACHES['shared']), so it holds
+  whichever worker serves the next request. Within a request, reads after
+  a write or inside a transaction also stay on the primary.
+
+Writes and migrations always use the primary. To try it locally, give
+DB_REPLICAS a second SQLite file and copy the primary into it with
+``python manage.py sync_sqlite_replica``.
+"""
+
+import logging
+import random
+import threading
+import time
+from contextlib import ContextDecorator
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+from config.invalidation import shared_cache
+from metrics import counter, gauge
+
+logger = logging.getLogger(__name__)
+
+READS = counter('db_reads_routed_total', 'ORM read routing decisions by target database and reason', ('database', 'reason'))
+LAG = gauge('db_replica_lag_seconds', 'Replica lag at the last heartbeat check (-1 when unreachable)', ('database',))
+
+PIN_COOKIE = 'db_pin'
+# The database cache ('shared' without Redis) always uses the primary and never pins.
+CACHE_APP_LABEL = 'django_cache'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Max lag the current context accepts from a replica; None keeps reads on the primary.
+_max_lag: ContextVar[Optional[float]] = ContextVar('replica_max_lag', default=None)
+_pinned: ContextVar[bool] = ContextVar('replica_pinned', default=False)
+
+
+def replica_aliases() -> List[str]:
+    return [alias for alias in settings.DATABASES if alias.startswith('replica_')]
+
+
+class use_replica(ContextDecorator):
+    """Let reads in this block go to a replica at most ``max_lag`` seconds behind."""
+
+    def __init__(self, max_lag: Optional[float] = None):
+        self.max_lag = settings.DB_REPLICA_MAX_LAG if max_lag is None else max_lag
+        self._tokens = []
+
+    def __enter__(self):
+        self._tokens.append(_max_lag.set(self.max_lag))
+        return self
+
+    def __exit__(self, *exc):
+        _max_lag.reset(self._tokens.pop())
+        return False
+
+
+def pin_primary() -> None:
+    """Keep the rest of the current context's reads on the primary."""
+    _pinned.set(True)
+
+
+class ReplicaHealth:
+    """Per-process heartbeat checks, at most one per DB_REPLICA_CHECK_SECONDS."""
+
+    _lock = threading.Lock()
+    _checked_at = 0.0
+    _lag: Dict[str, float] = {}
+
+    @classmethod
+    def lag(cls) -> Dict[str, float]:
+        """{alias: seconds behind}; unreachable replicas are left out."""
+        if time.monotonic() - cls._checked_at < settings.DB_REPLICA_CHECK_SECONDS:
+            return cls._lag
+        with cls._lock:
+            if time.monotonic() - cls._checked_at >= settings.DB_REPLICA_CHECK_SECONDS:
+                cls._lag = cls._check()
+                cls._checked_at = time.monotonic()
+        return cls._lag
+
+    @classmethod
+    def _check(cls) -> Dict[str, float]:
+        from apps.content.models import ReplicaHeartbeat
+
+        now = time.time()
+        try:
+            # Migration content.0002 creates the row.
+            ReplicaHeartbeat.objects.using(DEFAULT_DB_ALIAS).filter(pk=1).update(beat=now)
+        except DatabaseError as e:
+            logger.warning("Replica heartbeat: cannot stamp the primary (%s)", e)
+        lag = {}
+        for alias in replica_aliases():
+            try:
+                beat = ReplicaHeartbeat.objects.using(alias).filter(pk=1).values_list('beat', flat=True).first()
+            except DatabaseError as e:
+                logger.warning("Replica %s unreachable: %s", alias, e)
+                connections[alias].close()
+                LAG.set(-1, database=alias)
+                continue
+            lag[alias] = max(0.0, now - beat) if beat is not None else float('inf')
+            LAG.set(lag[alias] if beat is not None else -1, database=alias)
+        return lag
+
+
+class ReplicaRouter:
+    """Primary for writes and migrations; replicas for reads the context allows."""
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label == CACHE_APP_LABEL:
+            return DEFAULT_DB_ALIAS
+        max_lag = _max_lag.get()
+        if max_lag is None:
+            return None
+        if _pinned.get() or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            READS.inc(database=DEFAULT_DB_ALIAS, reason='pinned')
+            return DEFAULT_DB_ALIAS
+        fresh = [alias for alias, lag in ReplicaHealth.lag().items() if lag <= max_lag]
+        if not fresh:
+            READS.inc(database=DEFAULT_DB_ALIAS, reason='lagging')
+            return DEFAULT_DB_ALIAS
+        alias = random.choice(fresh)
+        READS.inc(database=alias, reason='replica')
+        return alias
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label == CACHE_APP_LABEL:
+            return DEFAULT_DB_ALIAS
+        pin_primary()
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaMiddleware:
+    """Opts the endpoints in settings.DB_REPLICA_ENDPOINTS into replica reads."""
+
+    def __init__(self, get_response):
+        if not replica_aliases():
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        max_lag = _max_lag.set(None)
+        pinned = _pinned.set(self._is_pinned(request))
+        try:
+            response = self.get_response(request)
+            if request.method not in SAFE_METHODS and response.status_code < 400:
+                self._pin(request, response)
+            return response
+        finally:
+            _max_lag.reset(max_lag)
+            _pinned.reset(pinned)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        name = request.resolver_match.url_name if request.resolver_match else None
+        if request.method in SAFE_METHODS and name in settings.DB_REPLICA_ENDPOINTS:
+            _max_lag.set(settings.DB_REPLICA_ENDPOINTS[name])
+        return None
+
+    @staticmethod
+    def _user_key(request) -> Optional[str]:
+        user_id = request.headers.get('X-User-Id')
+        return f'db-pin:{user_id}' if user_id else None
+
+    def _is_pinned(self, request) -> bool:
+        if request.COOKIES.get(PIN_COOKIE):
+            return True
+        key = self._user_key(request)
+        return bool(key and shared_cache().get(key))
+
+    def _pin(self, request, response) -> None:
+        seconds = settings.DB_REPLICA_PIN_SECONDS
+        response.set_cookie(PIN_COOKIE, '1', max_age=seconds, httponly=True, samesite='Lax')
+        key = self._user_key(request)
+        if key:
+            shared_cache().set(key, True, seconds)
@@ -0,0 +1,9 @@
+"""SQLite stand-in backend (DB_ENGINE=sqlite) with the same connection metrics as SQL Server."""
+
+from django.db.backends.sqlite3.base import DatabaseWrapper as SQLiteDatabaseWrapper
+
+from ..pool import PooledConnectionMixin
+
+
+class DatabaseWrapper(PooledConnectionMixin, SQLiteDatabaseWrapper):
+    pass
@@ -0,0 +1,75 @@
+"""
+Tables for the SQLite stand-in.
+
+Posts, Videos, Users and the other SQL Server tables are unmanaged models,
+so ``migrate`` never creates them. ``create_schema()`` builds each missing
+one from its model. The exceptions are the like, tag and category junction
+tables: their SQL Server primary key spans both columns, which a model
+can't express (it marks one column as the pk), so they are written by hand.
+
+``INDEXES`` mirrors the indexes in sql/*.sql. SQLite has no INCLUDE, so the
+covered columns trail the key. Email and Username get a NOCASE index, which
+SQLite uses for iexact (LIKE).
+"""
+
+from typing import List
+
+from django.apps import apps
+from django.db import connection
+
+SCHEMA_APPS = ('users', 'experts', 'tags', 'posts', 'videos', 'otp', 'faq', 'content')
+
+# table -> (first key column, second key column, extra column definitions)
+COMPOSITE_KEYS = {
+    'PostLikes': ('user_id', 'post_id', 'created_at datetime'),
+    'VideoLikes': ('user_id', 'video_id', 'created_at datetime'),
+    'PostTags': ('post_id', 'tag_id', None),
+    'VideoTags': ('video_id', 'tag_id', None),
+    'PostCategories': ('post_id', 'category_id', None),
+    'VideoCategories': ('video_id', 'category_id', None),
+}
+
+INDEXES = {
+    'IX_Experts_Ranking': (
+        'Experts', 'rating DESC, consultation_count DESC, expert_id DESC'
+    ),
+    'IX_ExpertReviews_Keyset': (
+        'ExpertReviews', 'expert_id, created_at DESC, review_id DESC, user_id, rating'
+    ),
+    'IX_Posts_Status_Published': (
+        'Posts', 'status, published_at DESC, post_id DESC, expert_id, title, thumbnail_url, is_premium'
+    ),
+    'IX_Videos_Status_Published': (
+        'Videos', 'status, published_at DESC, video_id DESC, expert_id, title, thumbnail_url, is_premium'
+    ),
+    'IX_Users_EmailUpper': ('Users', 'Email COLLATE NOCASE'),
+    'IX_Users_UsernameUpper': ('Users', 'Username COLLATE NOCASE'),
+}
+
+
+def create_schema() -> List[str]:
+    """Create the app tables and indexes missing from the SQLite database; return the new tables."""
+    if connection.vendor != 'sqlite':
+        raise RuntimeError(f"create_schema() is for the SQLite stand-in, not {connection.vendor}")
+
+    existing = set(connection.introspection.table_names())
+    created = []
+    with connection.schema_editor() as editor:
+        for model in apps.get_models():
+            table = model._meta.db_table
+            if model._meta.app_label not in SCHEMA_APPS or table in existing:
+                continue
+            if table in COMPOSITE_KEYS:
+                first, second, extra = COMPOSITE_KEYS[table]
+                columns = f'{first} INTEGER NOT NULL, {second} INTEGER NOT NULL'
+                if extra:
+                    columns += f', {extra}'
+                editor.execute(f'CREATE TABLE "{table}" ({columns}, PRIMARY KEY ({first}, {second}))')
+                # Lookups by content id (like counts, tag/category pages)
+                editor.execute(f'CREATE INDEX "IX_{table}_{second}" ON "{table}" ({second})')
+            else:
+                editor.create_model(model)
+            created.append(table)
+        for name, (table, columns) in INDEXES.items():
+            editor.execute(f'CREATE INDEX IF NOT EXISTS "{name}" ON "{table}" ({columns})')
+    return created
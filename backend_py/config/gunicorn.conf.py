@@ -0,0 +1,63 @@
+"""
+Gunicorn settings shared by the Django API and the two FastAPI services.
+
+Used by serve.sh; every value can be overridden from the environment:
+
+- GUNICORN_WORKERS (or WEB_CONCURRENCY): processes, default 2 * CPUs + 1.
+  Workers share invalidations and read-your-writes pins through
+  CACHES['shared'] (Redis, or the database cache table), never through the
+  per-process default cache.
+- GUNICORN_THREADS: threads per Django worker (gthread), default 4.
+- GUNICORN_MAX_REQUESTS / GUNICORN_MAX_REQUESTS_JITTER: recycle a worker
+  after about this many requests to cap memory growth, default 1000 / 100.
+- GUNICORN_KEEPALIVE: seconds to hold idle keep-alive connections, default 5
+  (keep it above the load balancer's idle timeout when one sits in front).
+- GUNICORN_TIMEOUT / GUNICORN_GRACEFUL_TIMEOUT: default 30 / 30 seconds.
+- GUNICORN_PRELOAD: import the app once in the master before forking
+  (shared memory, faster worker boot), default true.
+
+Graceful reload: ``kill -HUP <master>`` replaces workers one by one after
+they finish in-flight requests. With preload the master keeps the code it
+loaded, so deploy new code with ``kill -USR2`` (new master) then ``-WINCH``
+and ``-TERM`` on the old one, or set GUNICORN_PRELOAD=false to pick it up on
+HUP.
+"""
+
+import multiprocessing
+import os
+
+
+def _env_int(name, default):
+    return int(os.getenv(name, default))
+
+
+bind = os.getenv('GUNICORN_BIND', f"0.0.0.0:{os.getenv('PORT', '8000')}")
+workers = _env_int('GUNICORN_WORKERS', os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+threads = _env_int('GUNICORN_THREADS', 4)
+
+max_requests = _env_int('GUNICORN_MAX_REQUESTS', 1000)
+max_requests_jitter = _env_int('GUNICORN_MAX_REQUESTS_JITTER', 100)
+keepalive = _env_int('GUNICORN_KEEPALIVE', 5)
+timeout = _env_int('GUNICORN_TIMEOUT', 30)
+graceful_timeout = _env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+preload_app = os.getenv('GUNICORN_PRELOAD', 'True').lower() in ('true', '1', 'yes')
+
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-') or None  # empty disables it
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+# Workers heartbeat through this directory; /dev/shm avoids stalls on slow
+# container filesystems.
+worker_tmp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+
+def post_fork(server, worker):
+    """Drop any database connection the master opened while preloading."""
+    try:
+        from django.conf import settings
+        from django.db import connections
+    except ImportError:
+        return
+    # The FastAPI search service never sets Django up.
+    if settings.configured:
+        connections.close_all()
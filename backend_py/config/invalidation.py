@@ -0,0 +1,116 @@
+"""
+Cross-worker invalidation for per-process caches and in-memory indexes.
+
+The default cache is local to each gunicorn worker, so a version bumped
+there reaches only the worker that handled the write. Versions live in
+CACHES['shared'] instead (Redis or the database cache table), and each
+worker polls them at most every CHECK_INTERVAL seconds: a change reaches
+every worker within about a second, and the shared store sees one read per
+worker per interval rather than one per request.
+
+- ``SharedVersion``: a version key that writers bump and readers poll.
+- ``VersionedIndex``: base class for an in-memory structure that is
+  rebuilt when ``invalidate()`` is called in any worker, or once it is
+  older than its max age, which also picks up edits made outside Django.
+"""
+
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+# How often a worker re-reads a shared version, in seconds.
+CHECK_INTERVAL = 1.0
+
+
+def shared_cache():
+    return caches['shared']
+
+
+class SharedVersion:
+    """A version number in the shared cache, polled at most every CHECK_INTERVAL."""
+
+    def __init__(self, key: str):
+        self.key = key
+        self._value = None
+        self._checked_at = 0.0
+
+    def get(self) -> int:
+        now = time.monotonic()
+        if self._value is None or now - self._checked_at >= CHECK_INTERVAL:
+            # Seeded from the clock so an evicted version never reuses old keys.
+            self._value = shared_cache().get_or_set(self.key, time.time_ns, None)
+            self._checked_at = now
+        return self._value
+
+    def bump(self) -> int:
+        """New version for every worker; this one sees it immediately."""
+        self._value = time.time_ns()
+        shared_cache().set(self.key, self._value, None)
+        self._checked_at = time.monotonic()
+        return self._value
+
+
+class VersionedIndex:
+    """
+    Per-process index kept in step with a shared invalidation version.
+
+    Subclasses set VERSION_KEY and MAX_AGE_SETTING (DEFAULT_MAX_AGE when the
+    setting is absent), implement ``build()`` and call ``ensure_fresh()``
+    before reading. ``refresh(version)`` may be overridden to apply a change
+    more cheaply than a full rebuild.
+    """
+
+    VERSION_KEY = ''
+    MAX_AGE_SETTING = ''
+    DEFAULT_MAX_AGE = 300
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._lock = threading.RLock()
+        cls._version = None
+        cls._built_at = 0.0
+        cls._checked_at = 0.0
+
+    @classmethod
+    def max_age(cls) -> int:
+        return int(getattr(settings, cls.MAX_AGE_SETTING, cls.DEFAULT_MAX_AGE))
+
+    @classmethod
+    def current_version(cls):
+        return shared_cache().get_or_set(cls.VERSION_KEY, time.time_ns, None)
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Rebuild in every worker; this one on its next read."""
+        shared_cache().set(cls.VERSION_KEY, time.time_ns(), None)
+        cls._checked_at = 0.0
+
+    @classmethod
+    def ensure_fresh(cls) -> None:
+        now = time.monotonic()
+        if cls._built_at and now - cls._checked_at < CHECK_INTERVAL:
+            return
+        version = cls.current_version()
+        cls._checked_at = now
+        with cls._lock:
+            if not cls._built_at or now - cls._built_at >= cls.max_age():
+                cls.rebuild(version)
+            elif version != cls._version:
+                cls.refresh(version)
+
+    @classmethod
+    def refresh(cls, version) -> None:
+        cls.rebuild(version)
+
+    @classmethod
+    def rebuild(cls, version=None) -> None:
+        """Build now and record ``version`` as the one it reflects."""
+        with cls._lock:
+            cls.build()
+            cls._version, cls._built_at = version, time.monotonic()
+
+    @classmethod
+    def build(cls) -> None:
+        raise NotImplementedError
@@ -0,0 +1,180 @@
+"""
+Per-request SQL profiling and query budgets (opt-in).
+
+With QUERY_PROFILER_ENABLED, QueryProfilerMiddleware records every query a
+request runs on any database connection and adds a Server-Timing header:
+
+    Server-Timing: db;dur=12.4;desc="9 queries, 4 duplicate", app;dur=31.0
+
+Queries are grouped by fingerprint (the SQL with literals and IN-list
+lengths folded), so a statement repeated once per row, the classic N+1,
+shows up as one fingerprint with a high count. A QUERY_PROFILER_SAMPLE_RATE
+fraction of requests is kept in a per-process ring buffer served at
+/debug/queries, most recent first, each with its slowest statements and
+duplicate fingerprints.
+
+Views can declare how many queries they may run with ``@query_budget(n)``.
+Requests over budget are logged; with QUERY_BUDGET_STRICT (meant for the
+test settings) they raise QueryBudgetExceeded instead, failing the test.
+"""
+
+import logging
+import random
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextlib import ExitStack, contextmanager
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.db import connections
+from django.http import Http404, JsonResponse
+
+logger = logging.getLogger(__name__)
+
+_STRING_LITERAL = re.compile(r"N?'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER_LIST = re.compile(r'%s(?:\s*,\s*%s)+')
+_WHITESPACE = re.compile(r'\s+')
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A view ran more queries than its declared budget (strict mode)."""
+
+
+def query_budget(max_queries: int):
+    """Declare the most queries a view may run per request."""
+    def decorator(view):
+        view.query_budget = max_queries
+        return view
+    return decorator
+
+
+def fingerprint(sql: str) -> str:
+    """Normalize SQL so queries differing only in literals group together."""
+    sql = _STRING_LITERAL.sub('?', sql)
+    sql = _NUMBER_LITERAL.sub('?', sql)
+    sql = _PLACEHOLDER_LIST.sub('%s, ...', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+class QueryRecorder:
+    """execute_wrapper that times each statement on one or more connections."""
+
+    SLOWEST = 5
+
+    def __init__(self):
+        self.queries: List[Dict[str, Any]] = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append({
+                'sql': sql,
+                'params': params,
+                'ms': (time.perf_counter() - started) * 1000,
+                'alias': context['connection'].alias,
+            })
+
+    @contextmanager
+    def record(self):
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(self))
+            yield self
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    @property
+    def db_ms(self) -> float:
+        return sum(q['ms'] for q in self.queries)
+
+    def duplicates(self) -> Dict[str, int]:
+        """{fingerprint: count} for statements run more than once."""
+        counts = Counter(fingerprint(q['sql']) for q in self.queries)
+        return {sql: n for sql, n in counts.most_common() if n > 1}
+
+    def summary(self) -> Dict[str, Any]:
+        slowest = sorted(self.queries, key=lambda q: q['ms'], reverse=True)[:self.SLOWEST]
+        return {
+            'queryCount': self.count,
+            'dbMs': round(self.db_ms, 3),
+            'duplicates': [{'sql': sql, 'count': n} for sql, n in self.duplicates().items()],
+            'slowest': [{'sql': q['sql'], 'ms': round(q['ms'], 3), 'alias': q['alias']} for q in slowest],
+        }
+
+
+class QueryProfilerMiddleware:
+    """Record per-request queries; see the module docstring."""
+
+    _samples = deque(maxlen=200)
+    _samples_lock = threading.Lock()
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'QUERY_PROFILER_ENABLED', False)
+        self.sample_rate = float(getattr(settings, 'QUERY_PROFILER_SAMPLE_RATE', 0.1))
+        self.strict = getattr(settings, 'QUERY_BUDGET_STRICT', False)
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        with recorder.record():
+            response = self.get_response(request)
+        total_ms = (time.perf_counter() - started) * 1000
+
+        duplicates = sum(n - 1 for n in recorder.duplicates().values())
+        response['Server-Timing'] = (
+            f'db;dur={recorder.db_ms:.1f};desc="{recorder.count} queries, {duplicates} duplicate", '
+            f'app;dur={total_ms:.1f}'
+        )
+
+        budget = getattr(request, '_query_budget', None)
+        if budget is not None and recorder.count > budget:
+            message = f"{request.method} {request.path} ran {recorder.count} queries (budget {budget})"
+            if self.strict:
+                raise QueryBudgetExceeded(f"{message}; duplicates: {recorder.duplicates()}")
+            logger.warning(message)
+
+        if request.path != '/debug/queries' and random.random() < self.sample_rate:
+            sample = {
+                'method': request.method,
+                'path': request.get_full_path(),
+                'status': response.status_code,
+                'totalMs': round(total_ms, 3),
+                'budget': budget,
+                **recorder.summary(),
+            }
+            with self._samples_lock:
+                self._samples.appendleft(sample)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._query_budget = getattr(view_func, 'query_budget', None)
+
+    @classmethod
+    def samples(cls, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        with cls._samples_lock:
+            return list(cls._samples)[:limit]
+
+
+def debug_queries(request):
+    """Recent sampled request profiles; 404 unless the profiler is enabled."""
+    if not getattr(settings, 'QUERY_PROFILER_ENABLED', False):
+        raise Http404
+    try:
+        limit = max(1, int(request.GET.get('limit', 50)))
+    except ValueError:
+        limit = 50
+    samples = QueryProfilerMiddleware.samples(limit)
+    if request.GET.get('path'):
+        samples = [s for s in samples if s['path'].startswith(request.GET['path'])]
+    return JsonResponse({'items': samples})
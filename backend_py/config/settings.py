@@ -40,11 +40,17 @@ INSTALLED_APPS = [
     'apps.videos',
     'apps.otp',
     'apps.faq',
+    'apps.content',
 ]
 
 MIDDLEWARE = [
+    'metrics.django.MetricsMiddleware',
+    'compression.django.CompressionMiddleware',
+    'config.profiling.QueryProfilerMiddleware',
+    'config.db.replicas.ReplicaMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -74,9 +80,19 @@ TEMPLATES = [
 WSGI_APPLICATION = 'config.wsgi.application'
 
 # Database - SQL Server (same as .NET backend)
+# config.db.mssql is mssql-django plus connection metrics and an optional pool.
+# By default each worker thread keeps its connection for DB_CONN_MAX_AGE
+# seconds, checked before reuse. Set DB_POOL_SIZE (e.g. under ASGI, where
+# threads are per request) to share that many connections per process instead.
+#
+# DB_ENGINE=sqlite runs everything (API, auth and services) on a local SQLite
+# file instead, for development, CI and benchmarks without SQL Server. Create
+# its tables with `python manage.py bootstrap_sqlite`.
+DB_ENGINE = os.getenv('DB_ENGINE', 'mssql').lower()
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 0))
 DATABASES = {
     'default': {
-        'ENGINE': 'mssql',
+        'ENGINE': 'config.db.mssql',
         'NAME': os.getenv('DB_NAME', 'Floria_2'),
         'USER': os.getenv('DB_USER', 'sa'),
         'PASSWORD': os.getenv('DB_PASSWORD', ''),
@@ -86,8 +102,64 @@ DATABASES = {
             'driver': 'ODBC Driver 17 for SQL Server',
             'extra_params': 'TrustServerCertificate=yes',
         },
+        'CONN_MAX_AGE': 0 if DB_POOL_SIZE else int(os.getenv('DB_CONN_MAX_AGE', 600)),
+        'CONN_HEALTH_CHECKS': True,
+        'POOL': {
+            'SIZE': DB_POOL_SIZE,
+            'TIMEOUT': float(os.getenv('DB_POOL_TIMEOUT', 10)),
+            'MAX_LIFETIME': int(os.getenv('DB_POOL_MAX_LIFETIME', 1800)),
+            'CHECK_IDLE': int(os.getenv('DB_POOL_CHECK_IDLE_SECONDS', 30)),
+        } if DB_POOL_SIZE else None,
     }
 }
+if DB_ENGINE == 'sqlite':
+    DATABASES['default'] = {
+        'ENGINE': 'config.db.sqlite',
+        'NAME': os.getenv('DB_SQLITE_PATH', str(BASE_DIR / 'floria.sqlite3')),
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 600)),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            # Several gunicorn workers share the file: WAL lets reads run next
+            # to a write, and writers take the lock up front and wait up to
+            # `timeout` seconds for it instead of failing with "database is locked".
+            'timeout': 20,
+            'transaction_mode': 'IMMEDIATE',
+            'init_command': 'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL',
+        },
+    }
+
+# Read replicas (config/db/replicas.py): DB_REPLICAS lists replica hosts, or
+# SQLite files with DB_ENGINE=sqlite, each added as replica_1, replica_2...
+# Only GET/HEAD requests to the endpoints below read from them, and only
+# while the replica is at most that many seconds behind. A client that just
+# wrote (like, signup...) reads from the primary for DB_REPLICA_PIN_SECONDS.
+# DB_REPLICA_ENDPOINTS overrides the list as "url-name[=max_lag],...". The
+# FastAPI services read the same variables (services/db.py); their endpoint
+# names are search, analytics and chat-context.
+DB_REPLICAS = [replica.strip() for replica in os.getenv('DB_REPLICAS', '').split(',') if replica.strip()]
+DB_REPLICA_MAX_LAG = float(os.getenv('DB_REPLICA_MAX_LAG', 5))
+DB_REPLICA_CHECK_SECONDS = float(os.getenv('DB_REPLICA_CHECK_SECONDS', 1))
+DB_REPLICA_PIN_SECONDS = int(os.getenv('DB_REPLICA_PIN_SECONDS', 15))
+DB_REPLICA_ENDPOINTS = {}
+for entry in os.getenv('DB_REPLICA_ENDPOINTS', (
+    'content-feed,category-content,posts-list,posts-detail,posts-stats,posts-related,'
+    'videos-list,videos-detail,videos-stats,videos-related,tags-list,tags-cloud,faqs-list,'
+    'experts-list,experts-suggest,experts-detail,experts-reviews'
+)).split(','):
+    name, _, lag = entry.strip().partition('=')
+    if name:
+        DB_REPLICA_ENDPOINTS[name] = float(lag) if lag else DB_REPLICA_MAX_LAG
+for index, replica in enumerate(DB_REPLICAS, 1):
+    DATABASES[f'replica_{index}'] = {
+        **DATABASES['default'],
+        **({'NAME': replica} if DB_ENGINE == 'sqlite' else {'HOST': replica}),
+        'OPTIONS': dict(DATABASES['default']['OPTIONS']),
+        'TEST': {'MIRROR': 'default'},
+    }
+    if DB_ENGINE != 'sqlite':
+        # Availability-group listeners route read-intent connections to a secondary.
+        DATABASES[f'replica_{index}']['OPTIONS']['extra_params'] += ';ApplicationIntent=ReadOnly'
+DATABASE_ROUTERS = ['config.db.replicas.ReplicaRouter'] if DB_REPLICAS else []
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -103,8 +175,34 @@ TIME_ZONE = 'Asia/Ho_Chi_Minh'
 USE_I18N = True
 USE_TZ = True
 
-# Static files
+# Caches that count hits/misses per key prefix (metrics.cache).
+#
+# 'default' is local memory, per process: for data each worker may cache on
+# its own (feed pages, list totals, review pages). 'shared' holds what every
+# gunicorn worker must agree on: invalidation versions of the in-memory
+# indexes and caches (config.invalidation), the category change log and
+# read-your-writes pins. It is Redis when CACHE_REDIS_URL is set, otherwise
+# the database cache table, which serve.sh creates with createcachetable.
+CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL', '')
+CACHES = {
+    'default': {
+        'BACKEND': 'metrics.cache.LocMemCache',
+    },
+    'shared': {
+        'BACKEND': 'metrics.cache.RedisCache',
+        'LOCATION': CACHE_REDIS_URL,
+    } if CACHE_REDIS_URL else {
+        'BACKEND': 'metrics.cache.DatabaseCache',
+        'LOCATION': 'django_cache',
+        # Pins and change-log entries expire on their own; don't cull versions.
+        'OPTIONS': {'MAX_ENTRIES': 100000},
+    },
+}
+
+# Static files (admin, browsable API, Swagger UI), served by WhiteNoise from
+# STATIC_ROOT after `collectstatic` (serve.sh runs it).
 STATIC_URL = 'static/'
+STATIC_ROOT = BASE_DIR / 'staticfiles'
 
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
@@ -152,6 +250,45 @@ SPECTACULAR_SETTINGS = {
     'SERVE_INCLUDE_SCHEMA': False,
 }
 
+# Sharded view/like counters (apps.content.counters). 0 disables sharding and
+# updates PostStats/VideoStats rows directly.
+CONTENT_COUNTER_SHARDS = int(os.getenv('CONTENT_COUNTER_SHARDS', 8))
+
+# Anonymous /api/v1/feed pages are cached this many seconds (0 disables).
+CONTENT_FEED_CACHE_SECONDS = int(os.getenv('CONTENT_FEED_CACHE_SECONDS', 30))
+
+# List totals (apps.content.totals) are recounted in the background once older
+# than this many seconds (0 counts on every request). With estimates enabled,
+# unfiltered lists on a cold cache return SQL Server's partition row count
+# with totalIsEstimate: true instead of running COUNT(*).
+CONTENT_COUNT_CACHE_SECONDS = int(os.getenv('CONTENT_COUNT_CACHE_SECONDS', 300))
+CONTENT_COUNT_ESTIMATES = os.getenv('CONTENT_COUNT_ESTIMATES', 'False').lower() in ('true', '1', 'yes')
+
+# The expert typeahead index (apps.experts.search) is rebuilt on expert/review
+# changes, and at least this often to pick up edits made outside Django.
+EXPERT_SUGGEST_REBUILD_SECONDS = int(os.getenv('EXPERT_SUGGEST_REBUILD_SECONDS', 600))
+
+# First page of an expert's reviews plus rating summary; also dropped on review writes.
+EXPERT_REVIEWS_CACHE_SECONDS = int(os.getenv('EXPERT_REVIEWS_CACHE_SECONDS', 300))
+
+# The in-memory tag catalog (apps.tags.services) is rebuilt on tag/content
+# changes, and at least this often to pick up edits made outside Django.
+TAG_CATALOG_REFRESH_SECONDS = int(os.getenv('TAG_CATALOG_REFRESH_SECONDS', 300))
+
+# Same for the tag -> content bitmap index behind multi-tag filters (apps.content.tagindex).
+CONTENT_TAG_INDEX_REFRESH_SECONDS = int(os.getenv('CONTENT_TAG_INDEX_REFRESH_SECONDS', 300))
+
+# The category membership index (apps.content.categories) applies content changes
+# incrementally; this full rebuild interval also refreshes its engagement order.
+CONTENT_CATEGORY_INDEX_REFRESH_SECONDS = int(os.getenv('CONTENT_CATEGORY_INDEX_REFRESH_SECONDS', 300))
+
+# Per-request SQL profiling (config.profiling): Server-Timing headers, sampled
+# profiles at /debug/queries and @query_budget checks. Off by default;
+# QUERY_BUDGET_STRICT makes over-budget requests raise (for test runs).
+QUERY_PROFILER_ENABLED = os.getenv('QUERY_PROFILER_ENABLED', 'False').lower() in ('true', '1', 'yes')
+QUERY_PROFILER_SAMPLE_RATE = float(os.getenv('QUERY_PROFILER_SAMPLE_RATE', 0.1))
+QUERY_BUDGET_STRICT = os.getenv('QUERY_BUDGET_STRICT', 'False').lower() in ('true', '1', 'yes')
+
 # Media files (uploads)
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'uploads'
@@ -0,0 +1,20 @@
+"""
+Minimal Django settings for the FastAPI auth service (services/auth).
+
+The auth service only needs the User and OTPRequest models, so only their
+apps are installed: django.setup() then skips admin, sessions, DRF,
+drf_spectacular and the content apps, which keeps cold start short.
+Database, secrets and everything else come from config.settings.
+"""
+
+from .settings import *  # noqa: F401,F403
+
+INSTALLED_APPS = [
+    'apps.users',
+    'apps.otp',
+]
+
+# Django never serves HTTP in this process.
+MIDDLEWARE = []
+TEMPLATES = []
+AUTH_PASSWORD_VALIDATORS = []
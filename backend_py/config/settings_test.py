@@ -0,0 +1,18 @@
+"""
+Django settings for the pytest suite (pytest.ini).
+
+Runs on the SQLite stand-in so the tests need no SQL Server; tests/conftest.py
+adds the unmanaged tables to the test database. Everything else comes from
+config.settings.
+"""
+
+import os
+
+os.environ['DB_ENGINE'] = 'sqlite'
+os.environ['DB_REPLICAS'] = ''
+
+from .settings import *  # noqa: F401,F403,E402
+
+# One process: the shared cache needs no cross-worker store, and keeping it
+# off the database keeps cache reads out of the query budgets.
+CACHES['shared'] = {'BACKEND': 'metrics.cache.LocMemCache', 'LOCATION': 'shared'}  # noqa: F405
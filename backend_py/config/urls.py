@@ -8,9 +8,18 @@ from django.conf import settings
 from django.conf.urls.static import static
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 
+from metrics.django import metrics_view
+
+from . import profiling, views
+
 urlpatterns = [
     # Admin
     path('admin/', admin.site.urls),
+
+    # Container health check (also reports DB connection metrics)
+    path('health/', views.health, name='health'),
+    path('metrics', metrics_view, name='metrics'),
+    path('debug/queries', profiling.debug_queries, name='debug-queries'),
     
     # API Documentation
     path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
@@ -23,6 +32,7 @@ urlpatterns = [
     path('api/tags/', include('apps.tags.urls')),
     path('api/v1/faqs/', include('apps.faq.urls')),
     path('api/v1/experts/', include('apps.experts.urls')),
+    path('api/v1/', include('apps.content.urls')),
 ]
 
 # Serve media files in development
@@ -0,0 +1,22 @@
+"""
+Project-level endpoints that do not belong to an app.
+"""
+
+from django.db import DatabaseError, connection
+from django.http import JsonResponse
+
+from config.db.pool import ConnectionStats
+
+
+def health(request):
+    """Liveness + database check for the container HEALTHCHECK, with connection metrics."""
+    try:
+        connection.ensure_connection()
+        database = 'ok'
+    except DatabaseError:
+        database = 'unavailable'
+    return JsonResponse(
+        {'status': 'ok' if database == 'ok' else 'degraded', 'database': database,
+         'connections': ConnectionStats.snapshot()},
+        status=200 if database == 'ok' else 503,
+    )
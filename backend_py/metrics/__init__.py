@@ -0,0 +1,29 @@
+"""
+Shared instrumentation for the Django API and the FastAPI services.
+
+Metrics are declared once at module level and updated in place:
+
+    from metrics import counter, histogram
+
+    OTP_SEND_SECONDS = histogram('otp_send_seconds', 'OTP delivery latency', ('channel', 'result'))
+    OTP_SEND_SECONDS.observe(0.42, channel='email', result='ok')
+
+Updates are in-process dict operations under a per-metric lock. Under a
+multi-process server (gunicorn), set METRICS_MULTIPROC_DIR to a directory
+shared by the workers: each process writes its values there at most once
+per second and /metrics merges every worker of the same service. See
+registry.py for the merge rules, metrics.django and metrics.fastapi for the
+request middleware and /metrics endpoints.
+"""
+
+from .registry import (  # noqa: F401
+    DEFAULT_BUCKETS,
+    configure,
+    counter,
+    gauge,
+    histogram,
+    register_collector,
+    render,
+    track,
+)
+
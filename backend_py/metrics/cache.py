@@ -0,0 +1,54 @@
+"""
+Cache backends that count hits and misses per key prefix.
+
+The prefix is the first two ``:``-separated parts of the key
+('content:feed', 'experts:reviews', ...), so the hit ratio of each cache
+user can be graphed as hits / (hits + misses).
+"""
+
+from django.core.cache.backends.db import DatabaseCache as DjangoDatabaseCache
+from django.core.cache.backends.locmem import LocMemCache as DjangoLocMemCache
+from django.core.cache.backends.redis import RedisCache as DjangoRedisCache
+
+from .registry import counter
+
+CACHE_REQUESTS = counter('cache_requests_total', 'Cache lookups by key prefix and result', ('prefix', 'result'))
+
+_MISSING = object()
+
+
+def key_prefix(key) -> str:
+    parts = str(key).split(':', 2)
+    return ':'.join(parts[:2]) if len(parts) > 1 else 'other'
+
+
+class CacheMetricsMixin:
+    """Count get()/get_many() hits and misses; works with any BaseCache."""
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version)
+        CACHE_REQUESTS.inc(prefix=key_prefix(key), result='miss' if value is _MISSING else 'hit')
+        return default if value is _MISSING else value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        found = super().get_many(keys, version)
+        if keys:
+            prefix = key_prefix(keys[0])
+            if found:
+                CACHE_REQUESTS.inc(len(found), prefix=prefix, result='hit')
+            if len(found) < len(keys):
+                CACHE_REQUESTS.inc(len(keys) - len(found), prefix=prefix, result='miss')
+        return found
+
+
+class LocMemCache(CacheMetricsMixin, DjangoLocMemCache):
+    pass
+
+
+class DatabaseCache(CacheMetricsMixin, DjangoDatabaseCache):
+    pass
+
+
+class RedisCache(CacheMetricsMixin, DjangoRedisCache):
+    pass
@@ -0,0 +1,64 @@
+"""
+Django integration: per-route request latency, the /metrics view, and
+collectors for database connection and pool statistics.
+
+Enable with 'metrics.django.MetricsMiddleware' in MIDDLEWARE and
+``path('metrics', metrics_view)`` in the URLconf.
+"""
+
+from time import perf_counter
+
+from django.http import HttpResponse
+
+from .registry import configure, histogram, register_collector, render
+
+REQUEST_SECONDS = histogram(
+    'http_request_duration_seconds', 'Request latency by route', ('method', 'route', 'status')
+)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def database_samples():
+    """Connection counters and pool occupancy from config.db.pool."""
+    from config.db.pool import ConnectionStats
+
+    stats = ConnectionStats.snapshot()
+    for field, name, help_text in (
+        ('opens', 'db_connection_opens_total', 'Database connections opened'),
+        ('open_seconds', 'db_connection_open_seconds_total', 'Time spent opening database connections'),
+        ('reuses', 'db_connection_reuses_total', 'Requests served on an already open or pooled connection'),
+        ('health_check_failures', 'db_connection_health_check_failures_total', 'Pooled connections found dead'),
+        ('pool_waits', 'db_pool_waits_total', 'Connection requests that waited for a free pooled connection'),
+        ('pool_wait_seconds', 'db_pool_wait_seconds_total', 'Time spent waiting for a pooled connection'),
+        ('pool_timeouts', 'db_pool_timeouts_total', 'Connection requests that gave up waiting for the pool'),
+    ):
+        yield name, 'counter', help_text, {}, stats[field]
+    for alias, pool in stats['pools'].items():
+        for state, key in (('idle', 'idle'), ('in_use', 'inUse')):
+            yield 'db_pool_connections', 'gauge', 'Pooled connections by state', {'alias': alias, 'state': state}, pool[key]
+
+
+class MetricsMiddleware:
+    """Observe every request's latency, labelled with its URL pattern."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        configure('api')
+        register_collector(database_samples)
+
+    def __call__(self, request):
+        started = perf_counter()
+        response = self.get_response(request)
+        match = getattr(request, 'resolver_match', None)
+        REQUEST_SECONDS.observe(
+            perf_counter() - started,
+            method=request.method,
+            route=match.route if match else 'unmatched',
+            status=response.status_code,
+        )
+        return response
+
+
+def metrics_view(request):
+    return HttpResponse(render(), content_type=CONTENT_TYPE)
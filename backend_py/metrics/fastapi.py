@@ -0,0 +1,59 @@
+"""
+FastAPI integration: per-route request latency and a /metrics endpoint.
+
+    from metrics.fastapi import instrument
+    instrument(app, 'auth')
+"""
+
+from time import perf_counter
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+
+from .registry import configure, histogram, render
+
+REQUEST_SECONDS = histogram(
+    'http_request_duration_seconds', 'Request latency by route', ('method', 'route', 'status')
+)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware (no per-request task or body copy)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        started = perf_counter()
+        status = {'code': 500}
+
+        async def send_with_status(message):
+            if message['type'] == 'http.response.start':
+                status['code'] = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # FastAPI's router stores the matched route in the scope.
+            route = scope.get('route')
+            REQUEST_SECONDS.observe(
+                perf_counter() - started,
+                method=scope['method'],
+                route=getattr(route, 'path', 'unmatched'),
+                status=status['code'],
+            )
+
+
+def instrument(app: FastAPI, service: str) -> None:
+    """Add request metrics and GET /metrics to ``app``."""
+    configure(service)
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get('/metrics', include_in_schema=False)
+    def metrics():
+        return PlainTextResponse(render(), media_type='text/plain; version=0.0.4; charset=utf-8')
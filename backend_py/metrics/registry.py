@@ -0,0 +1,342 @@
+"""
+Metric registry and Prometheus text exposition.
+
+Single process: values live in memory and render() reads them directly.
+
+Multi-process (METRICS_MULTIPROC_DIR set): each process periodically writes
+its values to ``<dir>/<service>.<pid>.json`` (atomically, at most every
+FLUSH_INTERVAL seconds after an update, on scrape, and at exit). render() merges
+the files of its service:
+
+- counters and histograms are summed over all processes, including exited
+  ones, so totals survive worker recycling; exited workers' files are folded
+  into ``<service>.archive.json`` on scrape so the directory stays small;
+- gauges and collector samples (live values such as pool occupancy) are
+  summed over running processes only.
+
+Clear the directory when the server starts (serve.sh does).
+"""
+
+import atexit
+import bisect
+import fcntl
+import glob
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+FLUSH_INTERVAL = 1.0
+
+# A collector returns (name, kind, help, labels, value) samples when called.
+Sample = Tuple[str, str, str, Dict[str, str], float]
+
+_metrics: Dict[str, 'Metric'] = {}
+_collectors: List[Callable[[], Iterable[Sample]]] = []
+_registry_lock = threading.Lock()
+_flush_lock = threading.Lock()
+_state = {
+    'service': os.getenv('METRICS_SERVICE', 'app'),
+    'directory': os.getenv('METRICS_MULTIPROC_DIR') or None,
+    'last_flush': 0.0,
+    'pending': None,
+}
+
+
+class Metric:
+    """A counter, gauge or histogram with a fixed set of label names."""
+
+    def __init__(self, name: str, kind: str, help_text: str, labelnames: Tuple[str, ...] = (), buckets=None):
+        self.name = name
+        self.kind = kind
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets or DEFAULT_BUCKETS) if kind == 'histogram' else ()
+        self._values: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, object]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+        _maybe_flush()
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+        _maybe_flush()
+
+    def observe(self, value: float, **labels) -> None:
+        """Histogram: count ``value`` in its bucket and add it to the sum."""
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # per-bucket counts (last one is +Inf), then sum
+                state = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            state[index] += 1
+            state[-1] += value
+        _maybe_flush()
+
+    def time(self, **labels) -> '_Timer':
+        """``with HISTOGRAM.time(route='x'):`` observes the block's duration."""
+        return _Timer(self, labels)
+
+    def snapshot(self) -> Dict[Tuple[str, ...], object]:
+        with self._lock:
+            return {key: list(value) if isinstance(value, list) else value for key, value in self._values.items()}
+
+
+class _Timer:
+    def __init__(self, metric: Metric, labels: Dict[str, object]):
+        self.metric = metric
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metric.observe(time.perf_counter() - self.started, **self.labels)
+        return False
+
+
+@contextmanager
+def track(in_flight: Metric, duration: Metric, **labels):
+    """Count the block in ``in_flight`` while it runs and observe its duration."""
+    in_flight.inc(**labels)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        in_flight.dec(**labels)
+        duration.observe(time.perf_counter() - started, **labels)
+
+
+def _register(name: str, kind: str, help_text: str, labelnames=(), buckets=None) -> Metric:
+    with _registry_lock:
+        metric = _metrics.get(name)
+        if metric is None:
+            metric = _metrics[name] = Metric(name, kind, help_text, labelnames, buckets)
+        elif metric.kind != kind or metric.labelnames != tuple(labelnames):
+            raise ValueError(f"Metric {name} already registered as {metric.kind}{metric.labelnames}")
+        return metric
+
+
+def counter(name: str, help_text: str, labelnames: Tuple[str, ...] = ()) -> Metric:
+    return _register(name, 'counter', help_text, labelnames)
+
+
+def gauge(name: str, help_text: str, labelnames: Tuple[str, ...] = ()) -> Metric:
+    return _register(name, 'gauge', help_text, labelnames)
+
+
+def histogram(name: str, help_text: str, labelnames: Tuple[str, ...] = (), buckets=None) -> Metric:
+    return _register(name, 'histogram', help_text, labelnames, buckets)
+
+
+def register_collector(collector: Callable[[], Iterable[Sample]]) -> None:
+    """Add a callable sampled on every flush/scrape (for values owned elsewhere)."""
+    with _registry_lock:
+        if collector not in _collectors:
+            _collectors.append(collector)
+
+
+def configure(service: str, multiproc_dir: Optional[str] = None) -> None:
+    """
+    Name this process's service (it prefixes the multi-process files) and
+    optionally override METRICS_MULTIPROC_DIR.
+    """
+    _state['service'] = service
+    if multiproc_dir is not None:
+        _state['directory'] = multiproc_dir or None
+
+
+# ============== PROCESS STATE ==============
+
+def _local_state() -> Dict[str, dict]:
+    """This process's metrics as {name: {kind, help, labelnames, buckets, values}}."""
+    data = {}
+    for metric in list(_metrics.values()):
+        data[metric.name] = {
+            'kind': metric.kind,
+            'help': metric.help,
+            'labelnames': list(metric.labelnames),
+            'buckets': list(metric.buckets),
+            'values': [[list(key), value] for key, value in metric.snapshot().items()],
+        }
+    for collector in list(_collectors):
+        for name, kind, help_text, labels, value in collector():
+            entry = data.setdefault(name, {
+                'kind': kind, 'help': help_text, 'labelnames': sorted(labels), 'buckets': [],
+                'values': [], 'live': True,
+            })
+            entry['values'].append([[str(labels[n]) for n in entry['labelnames']], value])
+    return data
+
+
+def _multiproc_dir() -> Optional[str]:
+    return _state['directory']
+
+
+def _maybe_flush() -> None:
+    if not _multiproc_dir():
+        return
+    if time.monotonic() - _state['last_flush'] >= FLUSH_INTERVAL:
+        flush(wait=False)
+    elif _state['pending'] != os.getpid():
+        # Updates inside the interval are written by one trailing flush, so an
+        # idle worker's file still ends up current. Keyed by pid: a forked
+        # worker inherits the flag but not the timer thread.
+        _state['pending'] = os.getpid()
+        timer = threading.Timer(FLUSH_INTERVAL, _flush_pending)
+        timer.daemon = True
+        timer.start()
+
+
+def _flush_pending() -> None:
+    _state['pending'] = None
+    flush()
+
+
+def flush(wait: bool = True) -> None:
+    """Write this process's values to the multi-process directory."""
+    directory = _multiproc_dir()
+    if not directory or not _flush_lock.acquire(blocking=wait):
+        return
+    try:
+        _state['last_flush'] = time.monotonic()
+        path = os.path.join(directory, f"{_state['service']}.{os.getpid()}.json")
+        temp = f'{path}.tmp'
+        with open(temp, 'w') as fh:
+            json.dump(_local_state(), fh, separators=(',', ':'))
+        os.replace(temp, path)
+    finally:
+        _flush_lock.release()
+
+
+atexit.register(flush)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _merge(target: Dict[str, dict], source: Dict[str, dict], live: bool) -> None:
+    for name, entry in source.items():
+        is_live_metric = entry.get('live') or entry['kind'] == 'gauge'
+        if is_live_metric and not live:
+            continue
+        merged = target.setdefault(name, {**entry, 'values': {}})
+        for key, value in entry['values']:
+            key = tuple(key)
+            current = merged['values'].get(key)
+            if isinstance(value, list):
+                merged['values'][key] = [a + b for a, b in zip(current, value)] if current else list(value)
+            else:
+                merged['values'][key] = (current or 0) + value
+
+
+def _read(path: str) -> Dict[str, dict]:
+    try:
+        with open(path) as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def _collect() -> Dict[str, dict]:
+    directory = _multiproc_dir()
+    if not directory:
+        merged = {}
+        _merge(merged, _local_state(), live=True)
+        return merged
+
+    flush()
+    service = _state['service']
+    archive_path = os.path.join(directory, f'{service}.archive.json')
+    merged = {}
+    with open(os.path.join(directory, f'{service}.lock'), 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        archive = {}
+        _merge(archive, _read(archive_path), live=False)
+        dead = []
+        for path in glob.glob(os.path.join(directory, f'{service}.*.json')):
+            pid = os.path.basename(path)[len(service) + 1:-len('.json')]
+            if not pid.isdigit():
+                continue
+            data = _read(path)
+            if _pid_alive(int(pid)):
+                _merge(merged, data, live=True)
+            else:
+                _merge(archive, data, live=False)
+                dead.append(path)
+        if dead:
+            temp = f'{archive_path}.tmp'
+            with open(temp, 'w') as fh:
+                json.dump({
+                    name: {**entry, 'values': [[list(k), v] for k, v in entry['values'].items()]}
+                    for name, entry in archive.items()
+                }, fh, separators=(',', ':'))
+            os.replace(temp, archive_path)
+            for path in dead:
+                os.remove(path)
+    for name, entry in archive.items():
+        _merge(merged, {name: {**entry, 'values': [[list(k), v] for k, v in entry['values'].items()]}}, live=False)
+    return merged
+
+
+# ============== EXPOSITION ==============
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, key, extra: str = '') -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, key)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def _number(value: float) -> str:
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+def render() -> str:
+    """All metrics of this service in Prometheus text format 0.0.4."""
+    lines = []
+    for name, entry in sorted(_collect().items()):
+        lines.append(f"# HELP {name} {entry['help']}")
+        lines.append(f"# TYPE {name} {entry['kind']}")
+        names = entry['labelnames']
+        for key, value in sorted(entry['values'].items()):
+            if entry['kind'] == 'histogram':
+                cumulative = 0
+                for bound, count in zip(list(entry['buckets']) + ['+Inf'], value[:-1]):
+                    cumulative += count
+                    le = 'le="+Inf"' if bound == '+Inf' else f'le="{_number(float(bound))}"'
+                    lines.append(f"{name}_bucket{_labels(names, key, le)} {cumulative}")
+                lines.append(f"{name}_sum{_labels(names, key)} {_number(value[-1])}")
+                lines.append(f"{name}_count{_labels(names, key)} {cumulative}")
+            else:
+                lines.append(f"{name}{_labels(names, key)} {_number(value)}")
+    return '\n'.join(lines) + '\n'
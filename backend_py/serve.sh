@@ -0,0 +1,54 @@
+#!/bin/sh
+# Production entrypoint for the backend image.
+#
+#   serve.sh api        Django API (config.wsgi) on $PORT, default 8000
+#   serve.sh auth       FastAPI auth service on $PORT, default 8001
+#   serve.sh services   FastAPI search/analytics service on $PORT, default 8002
+#   serve.sh dev        manage.py runserver with auto-reload
+#   serve.sh <cmd...>   run any other command as-is
+#
+# Worker model, recycling and keep-alive are set in config/gunicorn.conf.py.
+# Before starting the API, the database cache table (the workers' shared
+# cache when CACHE_REDIS_URL is unset) is created and static files are
+# collected into STATIC_ROOT, which WhiteNoise serves.
+# With METRICS_MULTIPROC_DIR set, workers share /metrics through files there;
+# the service's stale files from a previous run are cleared on start.
+set -e
+cd "$(dirname "$0")"
+
+clear_metrics() {
+    if [ -n "$METRICS_MULTIPROC_DIR" ]; then
+        mkdir -p "$METRICS_MULTIPROC_DIR"
+        rm -f "$METRICS_MULTIPROC_DIR/$1".*
+    fi
+}
+
+case "$1" in
+    api)
+        export PORT="${PORT:-8000}"
+        clear_metrics api
+        if [ -z "$CACHE_REDIS_URL" ]; then
+            python manage.py createcachetable
+        fi
+        python manage.py collectstatic --noinput -v 0
+        exec gunicorn config.wsgi:application -c config/gunicorn.conf.py
+        ;;
+    auth)
+        export PORT="${PORT:-8001}"
+        clear_metrics auth
+        exec gunicorn services.auth.main:app -c config/gunicorn.conf.py \
+            --worker-class "${GUNICORN_WORKER_CLASS:-uvicorn.workers.UvicornWorker}"
+        ;;
+    services)
+        export PORT="${PORT:-8002}"
+        clear_metrics search
+        exec gunicorn services.main:app -c config/gunicorn.conf.py \
+            --worker-class "${GUNICORN_WORKER_CLASS:-uvicorn.workers.UvicornWorker}"
+        ;;
+    dev)
+        exec python manage.py runserver "0.0.0.0:${PORT:-8000}"
+        ;;
+    *)
+        exec "$@"
+        ;;
+esac
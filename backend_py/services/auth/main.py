@@ -19,8 +19,12 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspa
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 from contextlib import asynccontextmanager
 
+from compression.fastapi import compress_responses
+from metrics.fastapi import instrument
 from .routers import signup, login, google, facebook, otp
 
 
@@ -71,6 +75,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request latency per route and GET /metrics
+instrument(app, 'auth')
+compress_responses(app)
+
 # Include routers
 app.include_router(signup.router, prefix="/auth", tags=["Authentication"])
 app.include_router(login.router, prefix="/auth", tags=["Authentication"])
@@ -89,14 +97,32 @@ async def root():
     }
 
 
+def _check_database() -> str:
+    """Run SELECT 1 on the Django connection; closes it again afterwards."""
+    from django.db import connection
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        connection.close()
+        return "connected"
+    except Exception as e:
+        return f"error: {e}"
+
+
 @app.get("/health", tags=["Health"])
 async def health_check():
     """Detailed health check."""
-    return {
-        "status": "healthy",
-        "database": "connected",
-        "services": {
-            "auth": "ok",
-            "otp": "ok"
-        }
-    }
+    database = await run_in_threadpool(_check_database)
+    healthy = database == "connected"
+    return JSONResponse(
+        status_code=200 if healthy else 503,
+        content={
+            "status": "healthy" if healthy else "unhealthy",
+            "database": database,
+            "services": {
+                "auth": "ok",
+                "otp": "ok"
+            }
+        },
+    )
@@ -17,17 +17,27 @@ from dotenv import load_dotenv
 # Load environment variables from .env
 load_dotenv()
 
-# Setup Django
+# Setup Django with the auth-only settings profile (config/settings_auth.py).
+# It is chosen explicitly because the backend image exports
+# DJANGO_SETTINGS_MODULE=config.settings for the main API.
 import django
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
-django.setup()
+from django.apps import apps as django_apps
+if not django_apps.ready:
+    os.environ['DJANGO_SETTINGS_MODULE'] = os.getenv('AUTH_DJANGO_SETTINGS_MODULE', 'config.settings_auth')
+    django.setup()
 
 from apps.users.models import User
 from apps.otp.services import OTPService, EmailOTPSender, SMSOTPSender
+from metrics import gauge, histogram, track
 from .jwt_utils import create_tokens_for_user
 
 logger = logging.getLogger(__name__)
 
+# bcrypt at 12 rounds is the slowest step of signup/login; the in-flight
+# gauge shows how many calls are queued on the worker's threads.
+BCRYPT_IN_FLIGHT = gauge('auth_bcrypt_in_flight', 'bcrypt hash/check calls running', ('op',))
+BCRYPT_SECONDS = histogram('auth_bcrypt_seconds', 'bcrypt hash/check duration', ('op',))
+
 
 class AuthService:
     """Authentication service for signup, login, and social auth."""
@@ -38,13 +48,15 @@ class AuthService:
     def hash_password(password: str) -> bytes:
         """Hash password using BCrypt, return as bytes for VARBINARY storage."""
         salt = bcrypt.gensalt(rounds=12)
-        return bcrypt.hashpw(password.encode('utf-8'), salt)
+        with track(BCRYPT_IN_FLIGHT, BCRYPT_SECONDS, op='hash'):
+            return bcrypt.hashpw(password.encode('utf-8'), salt)
     
     @staticmethod
     def verify_password(password: str, hashed: bytes) -> bool:
         """Verify password against BCrypt hash."""
         try:
-            return bcrypt.checkpw(password.encode('utf-8'), bytes(hashed))
+            with track(BCRYPT_IN_FLIGHT, BCRYPT_SECONDS, op='check'):
+                return bcrypt.checkpw(password.encode('utf-8'), bytes(hashed))
         except Exception as e:
             logger.error(f"Password verification error: {e}")
             return False
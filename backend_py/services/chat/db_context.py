@@ -3,22 +3,7 @@ Database context retrieval for RAG.
 Searches Posts and Videos tables for content relevant to the user's question.
 """
 
-import os
-import pyodbc
-from dotenv import load_dotenv
-
-load_dotenv()
-
-
-def get_connection_string() -> str:
-    return (
-        f"DRIVER={{ODBC Driver 17 for SQL Server}};"
-        f"SERVER={os.getenv('DB_HOST', 'localhost')};"
-        f"DATABASE={os.getenv('DB_NAME', 'Floria_2')};"
-        f"UID={os.getenv('DB_USER', 'sa')};"
-        f"PWD={os.getenv('DB_PASSWORD', '')};"
-        f"TrustServerCertificate=yes;"
-    )
+from services import db
 
 
 def get_relevant_content(query: str, max_results: int = 5) -> str:
@@ -33,7 +18,7 @@ def get_relevant_content(query: str, max_results: int = 5) -> str:
     context_parts = []
 
     try:
-        conn = pyodbc.connect(get_connection_string())
+        conn = db.connect("chat-context")
         cursor = conn.cursor()
 
         # Build LIKE conditions for each keyword
@@ -46,13 +31,13 @@ def get_relevant_content(query: str, max_results: int = 5) -> str:
             params.extend([term, term, term])
 
         # Search Posts
-        cursor.execute(f"""
-            SELECT TOP (?) p.title, p.summary, 
-                   LEFT(p.content, 500) as content_preview
+        cursor.execute(*db.limit(f"""
+            SELECT p.title, p.summary,
+                   {db.left('p.content', 500)} as content_preview
             FROM Posts p
             WHERE p.status = 'published' AND ({like_conditions})
             ORDER BY p.published_at DESC
-        """, [max_results] + params)
+        """, params, max_results))
 
         posts = cursor.fetchall()
         if posts:
@@ -76,12 +61,12 @@ def get_relevant_content(query: str, max_results: int = 5) -> str:
             term = f"%{kw}%"
             params_v.extend([term, term])
 
-        cursor.execute(f"""
-            SELECT TOP (?) v.title, v.description
+        cursor.execute(*db.limit(f"""
+            SELECT v.title, v.description
             FROM Videos v
             WHERE v.status = 'published' AND ({like_conditions_v})
             ORDER BY v.published_at DESC
-        """, [max_results] + params_v)
+        """, params_v, max_results))
 
         videos = cursor.fetchall()
         if videos:
@@ -3,14 +3,24 @@ Gemini API client - wraps REST API calls to Google Generative AI.
 """
 
 import os
+import time
 import requests
 from dotenv import load_dotenv
 
+from metrics import counter, histogram
+
 load_dotenv()
 
-GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1beta"
+# Overridable so benchmarks can point chat at a local stand-in (benchmarks.suite fake-gemini)
+GEMINI_BASE_URL = os.getenv("GEMINI_BASE_URL", "https://generativelanguage.googleapis.com/v1beta")
 GEMINI_MODEL = "gemini-flash-latest"
 
+GEMINI_SECONDS = histogram(
+    'gemini_request_seconds', 'Gemini generateContent latency', ('result',),
+    buckets=(0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0),
+)
+GEMINI_TOKENS = counter('gemini_tokens_total', 'Gemini tokens used, from usageMetadata', ('kind',))
+
 SYSTEM_INSTRUCTION = """Bạn là một trợ lý sức khỏe thân thiện và chuyên nghiệp, chuyên về chu kỳ kinh nguyệt và sức khỏe sinh sản nữ giới. 
 
 Nguyên tắc của bạn:
@@ -82,11 +92,20 @@ class GeminiClient:
             }
         }
 
-        response = requests.post(
-            url,
-            json=payload,
-            headers={"Content-Type": "application/json"},
-            timeout=30,
+        started = time.perf_counter()
+        try:
+            response = requests.post(
+                url,
+                json=payload,
+                headers={"Content-Type": "application/json"},
+                timeout=30,
+            )
+        except requests.RequestException:
+            GEMINI_SECONDS.observe(time.perf_counter() - started, result="network_error")
+            raise
+        GEMINI_SECONDS.observe(
+            time.perf_counter() - started,
+            result="ok" if response.status_code == 200 else f"http_{response.status_code}",
         )
 
         if response.status_code != 200:
@@ -95,6 +114,10 @@ class GeminiClient:
 
         data = response.json()
 
+        usage = data.get("usageMetadata") or {}
+        GEMINI_TOKENS.inc(usage.get("promptTokenCount", 0), kind="prompt")
+        GEMINI_TOKENS.inc(usage.get("candidatesTokenCount", 0), kind="completion")
+
         # Extract text from response
         try:
             return data["candidates"][0]["content"]["parts"][0]["text"]
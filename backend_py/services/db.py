@@ -0,0 +1,146 @@
+"""
+Database access for the FastAPI services (search, analytics, chat context).
+
+DB_ENGINE picks the backend, the same variable the Django settings read:
+
+- mssql (default): SQL Server through pyodbc, configured by DB_HOST, DB_NAME,
+  DB_USER and DB_PASSWORD.
+- sqlite: the local stand-in file at DB_SQLITE_PATH, created with
+  ``python manage.py bootstrap_sqlite``.
+
+Both drivers use ``?`` placeholders. Write queries without TOP/LIMIT and
+let ``limit()`` add the row limit in the dialect's syntax.
+
+Read replicas work the way they do for the Django API (config/db/replicas.py),
+configured by the same variables. ``connect(endpoint)`` opens a replica from
+DB_REPLICAS if ``endpoint`` is listed in DB_REPLICA_ENDPOINTS and a replica is
+no more than its max lag behind, going by the ReplicaHeartbeat row. Otherwise
+it connects to the primary. These services never write user data, so nothing
+here needs read-your-writes pinning.
+"""
+
+import logging
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Sequence, Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENGINE = os.getenv('DB_ENGINE', 'mssql').lower()
+SQLITE_PATH = os.getenv('DB_SQLITE_PATH', os.path.join(BACKEND_DIR, 'floria.sqlite3'))
+
+REPLICAS = [replica.strip() for replica in os.getenv('DB_REPLICAS', '').split(',') if replica.strip()]
+REPLICA_MAX_LAG = float(os.getenv('DB_REPLICA_MAX_LAG', 5))
+REPLICA_CHECK_SECONDS = float(os.getenv('DB_REPLICA_CHECK_SECONDS', 1))
+REPLICA_ENDPOINTS: Dict[str, float] = {}
+for _entry in os.getenv('DB_REPLICA_ENDPOINTS', 'search,analytics,chat-context').split(','):
+    _name, _, _lag = _entry.strip().partition('=')
+    if _name:
+        REPLICA_ENDPOINTS[_name] = float(_lag) if _lag else REPLICA_MAX_LAG
+
+_FIRST_SELECT = re.compile(r'^\s*SELECT\b', re.IGNORECASE)
+
+
+def get_connection_string(host: Optional[str] = None) -> str:
+    return (
+        f"DRIVER={{ODBC Driver 17 for SQL Server}};"
+        f"SERVER={host or os.getenv('DB_HOST', 'localhost')};"
+        f"DATABASE={os.getenv('DB_NAME', 'Floria_2')};"
+        f"UID={os.getenv('DB_USER', 'sa')};"
+        f"PWD={os.getenv('DB_PASSWORD', '')};"
+        f"TrustServerCertificate=yes;"
+    )
+
+
+def _open(replica: Optional[str] = None):
+    if ENGINE == 'sqlite':
+        return sqlite3.connect(replica or SQLITE_PATH, timeout=20)
+    import pyodbc
+    if replica:
+        # Availability-group listeners route read-intent connections to a secondary.
+        return pyodbc.connect(get_connection_string(replica) + 'ApplicationIntent=ReadOnly;')
+    return pyodbc.connect(get_connection_string())
+
+
+class _ReplicaHealth:
+    """Per-process heartbeat checks, at most one per DB_REPLICA_CHECK_SECONDS."""
+
+    lock = threading.Lock()
+    checked_at = 0.0
+    lag: Dict[str, float] = {}
+
+    @classmethod
+    def get(cls) -> Dict[str, float]:
+        """{replica: seconds behind}; unreachable replicas are left out."""
+        with cls.lock:
+            if time.monotonic() - cls.checked_at >= REPLICA_CHECK_SECONDS:
+                cls.lag = cls._check()
+                cls.checked_at = time.monotonic()
+            return cls.lag
+
+    @staticmethod
+    def _check() -> Dict[str, float]:
+        now = time.time()
+        try:
+            conn = _open()
+            try:
+                conn.cursor().execute('UPDATE ReplicaHeartbeat SET beat = ? WHERE id = 1', (now,))
+                conn.commit()
+            finally:
+                conn.close()
+        except Exception as e:
+            logger.warning("Replica heartbeat: cannot stamp the primary (%s)", e)
+        lag = {}
+        for replica in REPLICAS:
+            try:
+                conn = _open(replica)
+                try:
+                    cursor = conn.cursor()
+                    cursor.execute('SELECT beat FROM ReplicaHeartbeat WHERE id = 1')
+                    row = cursor.fetchone()
+                finally:
+                    conn.close()
+            except Exception as e:
+                logger.warning("Replica %s unreachable: %s", replica, e)
+                continue
+            lag[replica] = max(0.0, now - row[0]) if row else float('inf')
+        return lag
+
+
+def connect(endpoint: Optional[str] = None):
+    """
+    Open a DB-API connection: to a fresh enough replica for an ``endpoint``
+    listed in DB_REPLICA_ENDPOINTS, to the primary otherwise.
+    """
+    if endpoint in REPLICA_ENDPOINTS and REPLICAS:
+        max_lag = REPLICA_ENDPOINTS[endpoint]
+        fresh = [replica for replica, lag in _ReplicaHealth.get().items() if lag <= max_lag]
+        if fresh:
+            return _open(random.choice(fresh))
+    return _open()
+
+
+def limit(sql: str, params: Sequence, n: int) -> Tuple[str, list]:
+    """Return ``sql``/``params`` limited to ``n`` rows: TOP (?) on SQL Server, LIMIT ? on SQLite."""
+    if ENGINE == 'sqlite':
+        return f'{sql.rstrip()}\nLIMIT ?', [*params, n]
+    sql, found = _FIRST_SELECT.subn('SELECT TOP (?)', sql, count=1)
+    if not found:
+        raise ValueError('limit() needs a query that starts with SELECT')
+    return sql, [n, *params]
+
+
+def left(expression: str, length: int) -> str:
+    """SQL for the first ``length`` characters of ``expression``."""
+    if ENGINE == 'sqlite':
+        return f'substr({expression}, 1, {int(length)})'
+    return f'LEFT({expression}, {int(length)})'
@@ -1,16 +1,15 @@
 """
 FastAPI Service Layer - High-performance APIs for search and analytics.
-Communicates with the same SQL Server database as Django.
+Communicates with the same database as Django (SQL Server, or the SQLite
+stand-in with DB_ENGINE=sqlite; see services/db.py).
 
 Run with: uvicorn services.main:app --port 8002 --reload
 """
 
-import os
 from contextlib import asynccontextmanager
 from typing import Optional, List
 from datetime import datetime
 
-import pyodbc
 from fastapi import FastAPI, Query, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
@@ -19,18 +18,6 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
-# Database connection string
-def get_connection_string():
-    return (
-        f"DRIVER={{ODBC Driver 17 for SQL Server}};"
-        f"SERVER={os.getenv('DB_HOST', 'localhost')};"
-        f"DATABASE={os.getenv('DB_NAME', 'Floria_2')};"
-        f"UID={os.getenv('DB_USER', 'sa')};"
-        f"PWD={os.getenv('DB_PASSWORD', '')};"
-        f"TrustServerCertificate=yes;"
-    )
-
-
 # Pydantic models
 class SearchResultItem(BaseModel):
     id: int
@@ -83,8 +70,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+from compression.fastapi import compress_responses
+from metrics.fastapi import instrument
+from services import db
 from services.chat.router import router as chat_router
 
+# Request latency per route and GET /metrics
+instrument(app, 'search')
+compress_responses(app)
+
 
 @app.get("/")
 async def root():
@@ -111,12 +105,12 @@ async def search(
     items = []
     
     try:
-        conn = pyodbc.connect(get_connection_string())
+        conn = db.connect("search")
         cursor = conn.cursor()
         
         # Search posts
-        cursor.execute("""
-            SELECT TOP (?) 
+        cursor.execute(*db.limit("""
+            SELECT
                 p.post_id, p.title, p.thumbnail_url,
                 COALESCE(ps.view_count, 0) as view_count,
                 COALESCE(ps.like_count, 0) as like_count,
@@ -127,7 +121,7 @@ async def search(
             WHERE p.status = 'published' 
               AND (p.title LIKE ? OR p.summary LIKE ?)
             ORDER BY COALESCE(ps.view_count, 0) + COALESCE(ps.like_count, 0) DESC
-        """, (limit // 2, search_term, search_term))
+        """, (search_term, search_term), limit // 2))
         
         for row in cursor.fetchall():
             items.append(SearchResultItem(
@@ -141,8 +135,8 @@ async def search(
             ))
         
         # Search videos
-        cursor.execute("""
-            SELECT TOP (?) 
+        cursor.execute(*db.limit("""
+            SELECT
                 v.video_id, v.title, v.thumbnail_url,
                 COALESCE(vs.view_count, 0) as view_count,
                 COALESCE(vs.like_count, 0) as like_count,
@@ -153,7 +147,7 @@ async def search(
             WHERE v.status = 'published' 
               AND (v.title LIKE ? OR v.description LIKE ?)
             ORDER BY COALESCE(vs.view_count, 0) + COALESCE(vs.like_count, 0) DESC
-        """, (limit // 2, search_term, search_term))
+        """, (search_term, search_term), limit // 2))
         
         for row in cursor.fetchall():
             items.append(SearchResultItem(
@@ -190,7 +184,7 @@ async def analytics_summary():
     Aggregates views and likes across all content.
     """
     try:
-        conn = pyodbc.connect(get_connection_string())
+        conn = db.connect("analytics")
         cursor = conn.cursor()
         
         # Total counts
@@ -216,8 +210,8 @@ async def analytics_summary():
         total_likes = row[1]
         
         # Top posts
-        cursor.execute("""
-            SELECT TOP 5 
+        cursor.execute(*db.limit("""
+            SELECT
                 p.post_id, p.title,
                 COALESCE(ps.view_count, 0) as views,
                 COALESCE(ps.like_count, 0) as likes
@@ -225,15 +219,15 @@ async def analytics_summary():
             LEFT JOIN PostStats ps ON p.post_id = ps.post_id
             WHERE p.status = 'published'
             ORDER BY COALESCE(ps.view_count, 0) + COALESCE(ps.like_count, 0) DESC
-        """)
+        """, (), 5))
         top_posts = [
             {"id": row[0], "title": row[1], "views": row[2], "likes": row[3]}
             for row in cursor.fetchall()
         ]
         
         # Top videos
-        cursor.execute("""
-            SELECT TOP 5 
+        cursor.execute(*db.limit("""
+            SELECT
                 v.video_id, v.title,
                 COALESCE(vs.view_count, 0) as views,
                 COALESCE(vs.like_count, 0) as likes
@@ -241,7 +235,7 @@ async def analytics_summary():
             LEFT JOIN VideoStats vs ON v.video_id = vs.video_id
             WHERE v.status = 'published'
             ORDER BY COALESCE(vs.view_count, 0) + COALESCE(vs.like_count, 0) DESC
-        """)
+        """, (), 5))
         top_videos = [
             {"id": row[0], "title": row[1], "views": row[2], "likes": row[3]}
             for row in cursor.fetchall()
@@ -267,7 +261,7 @@ async def analytics_summary():
 async def health_check():
     """Health check endpoint."""
     try:
-        conn = pyodbc.connect(get_connection_string())
+        conn = db.connect()
         cursor = conn.cursor()
         cursor.execute("SELECT 1")
         cursor.close()
@@ -0,0 +1,46 @@
+-- Expert rating aggregates (apps.experts ExpertRatingStats / ExpertRatingService).
+-- Idempotent: safe to run more than once.
+-- After creating the table, backfill with: python manage.py recompute_expert_ratings
+
+-- Star histogram per expert; Experts.rating / rating_count are derived from it.
+IF OBJECT_ID('dbo.ExpertRatingStats', 'U') IS NULL
+BEGIN
+    CREATE TABLE dbo.ExpertRatingStats (
+        expert_id INT NOT NULL PRIMARY KEY,
+        stars_1 INT NOT NULL DEFAULT 0,
+        stars_2 INT NOT NULL DEFAULT 0,
+        stars_3 INT NOT NULL DEFAULT 0,
+        stars_4 INT NOT NULL DEFAULT 0,
+        stars_5 INT NOT NULL DEFAULT 0,
+        updated_at DATETIME2(0) NULL,
+        CONSTRAINT FK_ExpertRatingStats_Experts
+            FOREIGN KEY (expert_id) REFERENCES dbo.Experts(expert_id) ON DELETE CASCADE
+    );
+END
+GO
+
+-- Expert directory ranking (ExpertService.get_experts): one ordered seek that
+-- covers every column the list serializer reads.
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = 'IX_Experts_Ranking' AND object_id = OBJECT_ID('dbo.Experts')
+)
+BEGIN
+    CREATE INDEX IX_Experts_Ranking
+        ON dbo.Experts (rating DESC, consultation_count DESC, expert_id DESC)
+        INCLUDE (full_name, title, avatar_url, is_verified, rating_count,
+                 experience_years, price_per_session, currency);
+END
+GO
+
+-- Per-expert review lookups (aggregate rebuilds, review pages).
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = 'IX_ExpertReviews_Expert' AND object_id = OBJECT_ID('dbo.ExpertReviews')
+)
+BEGIN
+    CREATE INDEX IX_ExpertReviews_Expert
+        ON dbo.ExpertReviews (expert_id, created_at DESC)
+        INCLUDE (rating);
+END
+GO
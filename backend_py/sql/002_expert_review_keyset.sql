@@ -0,0 +1,24 @@
+-- Keyset paging for expert reviews (ExpertService.get_expert_reviews).
+-- Idempotent: safe to run more than once.
+
+-- Seek on (expert_id, created_at, review_id) in the order the cursor walks.
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = 'IX_ExpertReviews_Keyset' AND object_id = OBJECT_ID('dbo.ExpertReviews')
+)
+BEGIN
+    CREATE INDEX IX_ExpertReviews_Keyset
+        ON dbo.ExpertReviews (expert_id, created_at DESC, review_id DESC)
+        INCLUDE (user_id, rating);
+END
+GO
+
+-- Superseded by IX_ExpertReviews_Keyset (same leading columns).
+IF EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = 'IX_ExpertReviews_Expert' AND object_id = OBJECT_ID('dbo.ExpertReviews')
+)
+BEGIN
+    DROP INDEX IX_ExpertReviews_Expert ON dbo.ExpertReviews;
+END
+GO
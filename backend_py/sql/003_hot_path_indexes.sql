@@ -0,0 +1,63 @@
+-- Hot-path indexes proposed by benchmarks.index_advisor (feed, lists, search,
+-- analytics, login). Idempotent: safe to run more than once.
+-- Measure with: python -m benchmarks.index_advisor --compare
+
+-- Published content, newest first (feed, /posts, /videos, search and analytics
+-- top lists). Django sends status as a parameter, so it leads the key instead of
+-- being a filtered-index predicate, which SQL Server only matches for literals.
+-- The INCLUDE list covers the list serializers.
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = 'IX_Posts_Status_Published' AND object_id = OBJECT_ID('dbo.Posts')
+)
+BEGIN
+    CREATE INDEX IX_Posts_Status_Published
+        ON dbo.Posts (status, published_at DESC, post_id DESC)
+        INCLUDE (expert_id, title, summary, thumbnail_url, is_premium);
+END
+GO
+
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = 'IX_Videos_Status_Published' AND object_id = OBJECT_ID('dbo.Videos')
+)
+BEGIN
+    CREATE INDEX IX_Videos_Status_Published
+        ON dbo.Videos (status, published_at DESC, video_id DESC)
+        INCLUDE (expert_id, title, thumbnail_url, duration_seconds, is_short, is_premium);
+END
+GO
+
+-- email__iexact / username__iexact compile to UPPER(col) = UPPER(?), which can't
+-- seek a plain index on the column. The optimizer matches that expression to an
+-- indexed computed column. Indexing a computed column needs ANSI_NULLS and
+-- QUOTED_IDENTIFIER ON, which are the defaults for sqlcmd and ODBC.
+IF COL_LENGTH('dbo.Users', 'Email_upper') IS NULL
+BEGIN
+    ALTER TABLE dbo.Users ADD Email_upper AS UPPER(Email);
+END
+GO
+
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = 'IX_Users_EmailUpper' AND object_id = OBJECT_ID('dbo.Users')
+)
+BEGIN
+    CREATE INDEX IX_Users_EmailUpper ON dbo.Users (Email_upper);
+END
+GO
+
+IF COL_LENGTH('dbo.Users', 'Username_upper') IS NULL
+BEGIN
+    ALTER TABLE dbo.Users ADD Username_upper AS UPPER(Username);
+END
+GO
+
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = 'IX_Users_UsernameUpper' AND object_id = OBJECT_ID('dbo.Users')
+)
+BEGIN
+    CREATE INDEX IX_Users_UsernameUpper ON dbo.Users (Username_upper);
+END
+GO
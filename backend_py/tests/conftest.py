@@ -0,0 +1,10 @@
+import pytest
+
+from config.db.sqlite.schema import create_schema
+
+
+@pytest.fixture(scope='session')
+def django_db_setup(django_db_setup, django_db_blocker):
+    """Migrated test database plus the tables of the unmanaged SQL Server models."""
+    with django_db_blocker.unblock():
+        create_schema()
@@ -0,0 +1,120 @@
+"""
+apps.content.encoders must render the exact bytes DRF would: each shape is
+rendered through json_response and through Serializer(...).data +
+JSONRenderer, and the two are compared.
+"""
+
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from rest_framework.decorators import api_view
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from apps.content import targets
+from apps.content.encoders import encode_many, encoder_for, json_response
+from apps.content.engine import ContentEngine
+from apps.experts.models import Expert
+from apps.posts.models import Post, PostCategory, PostStats
+from apps.posts.serializers import PostDetailSerializer, PostListItemSerializer
+from apps.tags.models import ContentCategory
+from apps.videos.models import Video, VideoCategory, VideoStats
+from apps.videos.serializers import VideoDetailSerializer, VideoListItemSerializer
+
+pytestmark = pytest.mark.django_db
+
+PUBLISHED = datetime(2025, 3, 8, 7, 30, 15, 123456, tzinfo=timezone.utc)
+
+
+def render_fast(data):
+    """Bytes of json_response(data) for a plain JSON request."""
+    @api_view(['GET'])
+    def view(request):
+        return json_response(request, data)
+
+    response = view(APIRequestFactory().get('/'))
+    if hasattr(response, 'render'):
+        response.render()
+    return response.content
+
+
+def render_drf(data):
+    return JSONRenderer().render(data)
+
+
+@pytest.fixture
+def content():
+    expert = Expert.objects.create(
+        full_name='BS. Nguyễn Thị Hương', specialization='Sản phụ khoa',
+        price_per_session=Decimal('350000.00'), rating=Decimal('4.8'),
+    )
+    category = ContentCategory.objects.create(name='Sức khỏe kinh nguyệt', slug='suc-khoe-kinh-nguyet')
+    post = Post.objects.create(
+        expert=expert, title='Chu kỳ kinh nguyệt: điều cần biết', summary=None,
+        content='Nội dung “đặc biệt” với ký tự   và emoji 🌸', thumbnail_url=None,
+        is_premium=True, status='published', published_at=PUBLISHED,
+    )
+    bare_post = Post.objects.create(
+        expert=None, title='Không có chuyên gia', content='', status='published', published_at=PUBLISHED,
+    )
+    video = Video.objects.create(
+        expert=expert, title='Yoga giảm đau bụng', description=None, thumbnail_url='https://cdn/x.jpg',
+        video_url='https://cdn/x.mp4', duration_seconds=615, is_short=False,
+        status='published', published_at=PUBLISHED.replace(microsecond=0),
+    )
+    PostCategory.objects.create(post=post, category=category)
+    VideoCategory.objects.create(video=video, category=category)
+    PostStats.objects.create(post=post, view_count=12, like_count=3)
+    PostStats.objects.create(post=bare_post, view_count=0, like_count=0)
+    VideoStats.objects.create(video=video, view_count=7, like_count=1)
+    return post, video
+
+
+@pytest.mark.parametrize('target, serializer', [
+    (targets.POST, PostListItemSerializer),
+    (targets.VIDEO, VideoListItemSerializer),
+])
+def test_list_page_matches_drf(content, target, serializer):
+    items = ContentEngine.get_list(target, sort='NEWEST', page_size=10)['items']
+    assert items
+    page = {'page': 1, 'pageSize': 10, 'total': len(items)}
+    fast = render_fast({**page, 'items': encode_many(serializer, items)})
+    drf = render_drf({**page, 'items': serializer(items, many=True).data})
+    assert fast == drf
+
+
+@pytest.mark.parametrize('target, serializer', [
+    (targets.POST, PostDetailSerializer),
+    (targets.VIDEO, VideoDetailSerializer),
+])
+def test_detail_matches_drf(content, target, serializer):
+    content_model, _, _ = target.models
+    for content_id in content_model.objects.values_list('pk', flat=True):
+        item = ContentEngine.get_body(target, content_id)
+        item._view_count, item._like_count = 5, 2
+        item._viewer_liked = True
+        assert render_fast(encoder_for(serializer)(item)) == render_drf(serializer(item).data)
+
+
+def test_sparse_fields_are_a_subset(content):
+    result = ContentEngine.get_list(targets.POST, sort='NEWEST', fields='card')
+    items, fields = result['items'], result['fields']
+    full = PostListItemSerializer(ContentEngine.get_list(targets.POST, sort='NEWEST')['items'], many=True).data
+    expected = [{name: value for name, value in row.items() if name in fields} for row in full]
+    assert render_fast(encode_many(PostListItemSerializer, items, fields)) == render_drf(expected)
+
+
+def test_raw_values_match_drf():
+    data = {
+        'price': Decimal('350000.50'),
+        'at': PUBLISHED,
+        'naive': datetime(2025, 1, 2, 3, 4, 5),
+        'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+        'name': 'Tiếng Việt có dấu',
+        'missing': None,
+        'separators': 'a b c',
+        7: 'int key',
+    }
+    assert render_fast(data) == render_drf(data)
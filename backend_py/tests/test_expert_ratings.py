@@ -0,0 +1,42 @@
+"""
+ExpertRatingService when two writers create an expert's missing
+ExpertRatingStats row at once: the loser must end up with the exact
+histogram whether or not the winner's rebuild already counted its review.
+"""
+
+from decimal import Decimal
+
+import pytest
+
+from apps.experts.models import Expert, ExpertRatingStats, ExpertReview
+from apps.experts.services import ExpertRatingService
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.mark.parametrize('winner_counted_ours', [True, False])
+def test_racing_stats_create(monkeypatch, winner_counted_ours):
+    expert = Expert.objects.create(full_name='BS. Lê Thu', price_per_session=Decimal('300000.00'))
+    ExpertReview.objects.create(expert=expert, user_id=1, rating=5)
+    ExpertRatingStats.objects.filter(expert=expert).delete()
+
+    histograms = ExpertRatingService._histograms
+    calls = []
+
+    def racing_histograms(expert_ids=None):
+        result = histograms(expert_ids)
+        if not calls:
+            # The other writer inserts the row between our check and our create.
+            seen = result.get(expert.pk, {}) if winner_counted_ours else {5: 1}
+            ExpertRatingStats.objects.create(
+                expert_id=expert.pk, updated_at=None, **{f'stars_{star}': n for star, n in seen.items()}
+            )
+        calls.append(expert_ids)
+        return result
+
+    monkeypatch.setattr(ExpertRatingService, '_histograms', staticmethod(racing_histograms))
+    ExpertReview.objects.create(expert=expert, user_id=2, rating=4)
+
+    assert ExpertRatingService.get_histogram(expert.pk) == {1: 0, 2: 0, 3: 0, 4: 1, 5: 1}
+    expert.refresh_from_db()
+    assert (expert.rating, expert.rating_count) == (Decimal('4.5'), 2)
@@ -0,0 +1,117 @@
+"""
+Every view declaring @query_budget is called with QUERY_BUDGET_STRICT on, so
+a change that adds queries (an N+1 in a serializer, a lost select_related)
+fails here with the offending statements instead of showing up in
+production logs.
+
+Each URL is requested twice and only the second request is checked: the
+budgets are for steady state, after the in-memory indexes
+(config.invalidation) are built and list totals cached.
+"""
+
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from django.test import Client
+from django.urls import get_resolver
+
+from apps.experts.models import Expert, ExpertReview
+from apps.faq.models import FAQ, FAQTag
+from apps.posts.models import Post, PostCategory, PostStats, PostTag
+from apps.tags.models import ContentCategory, Tag
+from apps.videos.models import Video, VideoCategory, VideoStats, VideoTag
+
+pytestmark = pytest.mark.django_db
+
+PUBLISHED = datetime(2025, 3, 8, 7, 30, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def seeded():
+    experts = [
+        Expert.objects.create(
+            full_name=f'BS. Nguyễn Văn {n}', specialization='Sản phụ khoa',
+            price_per_session=Decimal('350000.00'), rating=Decimal('4.5'),
+        )
+        for n in range(3)
+    ]
+    category = ContentCategory.objects.create(name='Kinh nguyệt', slug='kinh-nguyet')
+    tags = [Tag.objects.create(name=f'Chủ đề {n}', slug=f'chu-de-{n}') for n in range(3)]
+    for n in range(6):
+        expert, tag = experts[n % 3], tags[n % 3]
+        post = Post.objects.create(
+            expert=expert, title=f'Bài viết {n}', content='Nội dung', status='published', published_at=PUBLISHED,
+        )
+        video = Video.objects.create(
+            expert=expert, title=f'Video {n}', video_url='https://cdn/v.mp4', duration_seconds=60,
+            status='published', published_at=PUBLISHED,
+        )
+        PostStats.objects.create(post=post, view_count=n, like_count=1)
+        VideoStats.objects.create(video=video, view_count=n, like_count=1)
+        PostCategory.objects.create(post=post, category=category)
+        VideoCategory.objects.create(video=video, category=category)
+        PostTag.objects.create(post=post, tag=tag)
+        VideoTag.objects.create(video=video, tag=tag)
+        ExpertReview.objects.create(expert=expert, user_id=n + 1, rating=5, comment='Tốt')
+    for n, tag in enumerate(tags):
+        faq = FAQ.objects.create(category='sinh-hoc', question=f'Câu hỏi {n}', answer='Trả lời', expert=experts[n])
+        FAQTag.objects.create(faq=faq, tag=tag)
+    return {
+        'post': Post.objects.order_by('pk').first().pk,
+        'video': Video.objects.order_by('pk').first().pk,
+        'expert': experts[0].pk,
+        'tag': tags[0].name,
+    }
+
+
+def budget_cases(ids):
+    """(url name, path) for every budgeted view."""
+    return [
+        ('posts-list', f"/api/v1/posts/?tag={ids['tag']}"),
+        ('posts-detail', f"/api/v1/posts/{ids['post']}"),
+        ('posts-stats', f"/api/v1/posts/{ids['post']}/stats"),
+        ('posts-related', f"/api/v1/posts/{ids['post']}/related"),
+        ('videos-list', '/api/v1/videos/?sort=MOST_VIEWED'),
+        ('videos-detail', f"/api/v1/videos/{ids['video']}"),
+        ('videos-stats', f"/api/v1/videos/{ids['video']}/stats"),
+        ('videos-related', f"/api/v1/videos/{ids['video']}/related"),
+        ('content-feed', '/api/v1/feed'),
+        ('category-content', '/api/v1/categories/kinh-nguyet/content'),
+        ('experts-list', '/api/v1/experts/'),
+        ('experts-suggest', '/api/v1/experts/suggest?q=nguyen'),
+        ('experts-detail', f"/api/v1/experts/{ids['expert']}/"),
+        ('experts-reviews', f"/api/v1/experts/{ids['expert']}/reviews/"),
+        ('tags-list', '/api/tags/'),
+        ('tags-cloud', '/api/tags/cloud'),
+        ('faqs-list', '/api/v1/faqs/'),
+    ]
+
+
+def budgeted_url_names():
+    names = set()
+
+    def walk(patterns):
+        for pattern in patterns:
+            if hasattr(pattern, 'url_patterns'):
+                walk(pattern.url_patterns)
+            elif getattr(pattern.callback, 'query_budget', None) is not None:
+                names.add(pattern.name)
+
+    walk(get_resolver().url_patterns)
+    return names
+
+
+def test_every_budgeted_view_is_covered(seeded):
+    assert {name for name, _ in budget_cases(seeded)} == budgeted_url_names()
+
+
+def test_views_stay_within_budget(seeded, settings):
+    settings.QUERY_PROFILER_ENABLED = True
+    settings.QUERY_BUDGET_STRICT = True
+    client = Client()
+    for name, path in budget_cases(seeded):
+        client.get(path)
+        response = client.get(path)
+        assert response.status_code == 200, (name, response.status_code)
+        assert 'Server-Timing' in response, name
@@ -0,0 +1,116 @@
+"""
+Invalidation signals run on commit: other workers re-read the rows as soon
+as they see a change log entry or a version bump, so none may be issued
+while the write is still uncommitted.
+"""
+
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from django.db import transaction
+
+from apps.content.categories import CategoryIndex
+from apps.content.tagindex import TagBitmapIndex
+from apps.content.totals import CountCache
+from apps.experts.models import Expert, ExpertReview
+from apps.experts.search import ExpertSearchIndex
+from apps.experts.services import ExpertService
+from apps.posts.models import Post, PostCategory
+from apps.tags.models import ContentCategory, Tag
+from apps.tags.services import TagCatalogService
+from config.invalidation import shared_cache
+
+pytestmark = pytest.mark.django_db
+
+PUBLISHED = datetime(2025, 3, 8, 7, 30, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def post():
+    return Post.objects.create(title='Bài viết', content='', status='published', published_at=PUBLISHED)
+
+
+def test_category_changes_are_logged_on_commit(post, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        category = ContentCategory.objects.create(name='Kinh nguyệt', slug='kinh-nguyet')
+        seq = shared_cache().get(CategoryIndex.SEQ_KEY) or 0
+        reset = shared_cache().get(CategoryIndex.VERSION_KEY)
+        PostCategory.objects.create(post=post, category=category)
+        assert (shared_cache().get(CategoryIndex.SEQ_KEY) or 0) == seq
+        assert shared_cache().get(CategoryIndex.VERSION_KEY) == reset
+    assert callbacks
+    assert shared_cache().get(CategoryIndex.SEQ_KEY) > seq
+    assert shared_cache().get(CategoryIndex.VERSION_KEY) != reset
+
+
+def test_totals_are_invalidated_on_commit(django_capture_on_commit_callbacks):
+    version = CountCache._version('post').bump()
+    with django_capture_on_commit_callbacks(execute=True):
+        Post.objects.create(title='Bài viết', content='', status='published', published_at=PUBLISHED)
+        assert shared_cache().get('count:post:version') == version
+    assert shared_cache().get('count:post:version') != version
+
+
+def test_tag_index_is_invalidated_on_commit(django_capture_on_commit_callbacks):
+    version = TagBitmapIndex.current_version()
+    with django_capture_on_commit_callbacks(execute=True):
+        Tag.objects.create(name='Chủ đề', slug='chu-de')
+        assert TagBitmapIndex.current_version() == version
+    assert TagBitmapIndex.current_version() != version
+
+
+def test_tag_catalog_is_invalidated_on_commit(django_capture_on_commit_callbacks):
+    version = TagCatalogService.current_version()
+    with django_capture_on_commit_callbacks(execute=True):
+        Tag.objects.create(name='Chủ đề', slug='chu-de')
+        assert TagCatalogService.current_version() == version
+    assert TagCatalogService.current_version() != version
+
+
+def test_expert_search_is_invalidated_on_commit(django_capture_on_commit_callbacks):
+    version = ExpertSearchIndex.current_version()
+    with django_capture_on_commit_callbacks(execute=True):
+        Expert.objects.create(full_name='BS. Trần Thị Mai', price_per_session=Decimal('300000.00'))
+        assert ExpertSearchIndex.current_version() == version
+    assert ExpertSearchIndex.current_version() != version
+
+
+def test_review_pages_are_invalidated_on_commit(django_capture_on_commit_callbacks):
+    expert = Expert.objects.create(full_name='BS. Trần Thị Mai', price_per_session=Decimal('300000.00'))
+    version = ExpertService._reviews_version(expert.pk).bump()
+    with django_capture_on_commit_callbacks(execute=True):
+        ExpertReview.objects.create(expert=expert, user_id=1, rating=5)
+        assert shared_cache().get(f'experts:reviews:{expert.pk}:version') == version
+    assert shared_cache().get(f'experts:reviews:{expert.pk}:version') != version
+
+
+def test_body_versions_are_touched_on_commit(post, django_capture_on_commit_callbacks):
+    category = ContentCategory.objects.create(name='Kinh nguyệt', slug='kinh-nguyet')
+    PostCategory.objects.create(post=post, category=category)
+    Post.objects.filter(pk=post.pk).update(updated_at=PUBLISHED)
+    with django_capture_on_commit_callbacks(execute=True):
+        category.name = 'Chu kỳ kinh nguyệt'
+        category.save()
+        assert Post.objects.get(pk=post.pk).updated_at == PUBLISHED
+    assert Post.objects.get(pk=post.pk).updated_at > PUBLISHED
+
+
+def test_rolled_back_category_delete_touches_nothing(post):
+    category = ContentCategory.objects.create(name='Kinh nguyệt', slug='kinh-nguyet')
+    PostCategory.objects.create(post=post, category=category)
+    Post.objects.filter(pk=post.pk).update(updated_at=PUBLISHED)
+    with pytest.raises(RuntimeError):
+        with transaction.atomic():
+            category.delete()
+            raise RuntimeError
+    assert Post.objects.get(pk=post.pk).updated_at == PUBLISHED
+
+
+def test_category_delete_touches_linked_items(post, django_capture_on_commit_callbacks):
+    category = ContentCategory.objects.create(name='Kinh nguyệt', slug='kinh-nguyet')
+    PostCategory.objects.create(post=post, category=category)
+    Post.objects.filter(pk=post.pk).update(updated_at=PUBLISHED)
+    with django_capture_on_commit_callbacks(execute=True):
+        category.delete()
+    assert Post.objects.get(pk=post.pk).updated_at > PUBLISHED
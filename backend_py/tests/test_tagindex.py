@@ -0,0 +1,72 @@
+"""TagBitmap set operations against plain Python sets."""
+
+import random
+from array import array
+from datetime import datetime, timezone
+
+import pytest
+
+from apps.content import targets
+from apps.content.tagindex import ARRAY_MAX, TagBitmap, TagBitmapIndex
+from apps.posts.models import Post, PostTag
+from apps.tags.models import Tag
+
+
+def sample(rng, count, spread):
+    return {rng.randrange(spread) for _ in range(count)}
+
+
+def cases():
+    rng = random.Random(7)
+    yield set(), {1, 2, 3}
+    yield {0, 65535, 65536, 2 ** 31 - 1}, {65535, 65536, 5}
+    # Sparse chunks, dense chunks, and a mix that crosses ARRAY_MAX either way.
+    yield sample(rng, 300, 1 << 20), sample(rng, 300, 1 << 20)
+    yield sample(rng, 40000, 1 << 17), sample(rng, 40000, 1 << 17)
+    yield sample(rng, 30000, 1 << 16), sample(rng, 2000, 1 << 16)
+    yield set(range(0, 20000, 2)), set(range(1, 20000, 2))
+
+
+def test_containers_by_density():
+    sparse = TagBitmap.from_ids(range(ARRAY_MAX))
+    dense = TagBitmap.from_ids(range(ARRAY_MAX + 1))
+    assert isinstance(sparse.chunks[0], array)
+    assert isinstance(dense.chunks[0], int)
+    assert list(TagBitmap.from_ids([70000, 3, 3])) == [3, 70000]
+
+
+def test_and_or_match_sets():
+    for a, b in cases():
+        left, right = TagBitmap.from_ids(a), TagBitmap.from_ids(b)
+        for result, expected in ((left & right, a & b), (left | right, a | b)):
+            assert list(result) == sorted(expected)
+            assert len(result) == len(expected)
+            assert bool(result) == bool(expected)
+            assert result.csv() == ','.join(map(str, sorted(expected)))
+
+
+def test_and_shrinks_dense_chunks():
+    evens = TagBitmap.from_ids(range(0, 20000, 2))
+    small = evens & TagBitmap.from_ids(range(0, 200))
+    assert isinstance(small.chunks[0], array)
+    assert not (evens & TagBitmap.from_ids(range(1, 20000, 2)))
+
+
+@pytest.mark.django_db
+def test_names_differing_in_case_match_every_tag():
+    published = datetime(2025, 3, 8, tzinfo=timezone.utc)
+    posts = [
+        Post.objects.create(title=f'Bài {n}', content='', status='published', published_at=published)
+        for n in range(3)
+    ]
+    upper = Tag.objects.create(name='Foo', slug='foo')
+    lower = Tag.objects.create(name=' foo', slug='foo-2')
+    other = Tag.objects.create(name='bar', slug='bar')
+    PostTag.objects.create(post=posts[0], tag=upper)
+    PostTag.objects.create(post=posts[1], tag=lower)
+    PostTag.objects.create(post=posts[1], tag=other)
+    PostTag.objects.create(post=posts[2], tag=other)
+    TagBitmapIndex.invalidate()
+
+    assert list(TagBitmapIndex.match(targets.POST, ['foo'])) == [posts[0].pk, posts[1].pk]
+    assert list(TagBitmapIndex.match(targets.POST, ['foo', 'bar'], 'all')) == [posts[1].pk]